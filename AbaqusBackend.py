@@ -0,0 +1,8 @@
+#=============================================================================
+# backend of the CAE kernel, the objects of the Abaqus modules used by
+# the project; imported by Backend.load on the first use
+#=============================================================================
+
+from abaqus import *                # from the main library
+from caeModules import *            # import the modules
+from abaqusConstants import *       # constants we need
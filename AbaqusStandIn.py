@@ -0,0 +1,351 @@
+#=============================================================================
+# stand-in backend for the post-processing without Abaqus
+# provides the parts of mdb, session and the odb API the project touches
+# after the model is built: synthetic parts (nodes, elements) and
+# synthetic odbs (U, RF, S as bulk data blocks) of the Combined profile
+# with any number of nodes; the viewport calls are only recorded
+#
+# select it before the first use of the backend:
+#   import Backend
+#   Backend.select("AbaqusStandIn")
+# the modelling API (sketches, parts, loads) is not available
+#=============================================================================
+
+import math
+
+import numpy as np
+
+import BeamTheory
+from InpWriter import InpWriter
+
+# symbolic constants, compared and printed by their names
+class SymbolicConstant(str):
+    pass
+
+for _name in ("ON", "OFF", "S4R", "S3", "NODAL", "INTEGRATION_POINT", "ELEMENT_NODAL",
+              "COMPONENT", "INVARIANT", "CONTOURS_ON_DEF", "PNG", "DEFAULT", "THREADS",
+              "MPI", "PERCENTAGE", "MEGA_BYTES", "GIGA_BYTES", "SUBMITTED", "RUNNING",
+              "COMPLETED", "ABORTED", "TERMINATED", "SET", "UNSET", "LANCZOS", "SUBSPACE",
+              "PRESELECT"):
+    globals()[_name] = SymbolicConstant(_name)
+
+#-----------------------------------------------------------------------------
+# mesh objects
+#-----------------------------------------------------------------------------
+
+class MeshNode(object):
+    __slots__ = ("label", "coordinates")
+
+    def __init__(self, label, coordinates):
+        self.label       = label
+        self.coordinates = coordinates
+
+class MeshElement(object):
+    __slots__ = ("label", "connectivity", "type")
+
+    def __init__(self, label, connectivity, type = S4R):
+        self.label        = label
+        self.connectivity = connectivity
+        self.type         = type
+
+# node or element array, the objects are created on access only, so
+# millions of nodes cost only their NumPy arrays; like an Abaqus array it
+# offers its length, items and iteration only, so the node objects are
+# read one by one as with Abaqus
+class MeshArray(object):
+    def __init__(self, labels, values, create):
+        self._labels = labels
+        self._values = values
+        self._create = create
+
+    def __len__(self):
+        return len(self._labels)
+
+    def __getitem__(self, i):
+        if i < 0: i += len(self._labels)
+        if i < 0 or i >= len(self._labels): raise IndexError(i)
+        return self._create(int(self._labels[i]), tuple(self._values[i].tolist()))
+
+    def __iter__(self):
+        for label, value in zip(self._labels.tolist(), self._values.tolist()):
+            yield self._create(label, tuple(value))
+
+# part with a synthetic mesh
+#   mesh    : ShellMesh of the part
+#   nodeSets: set name -> node labels, e.g. SUPPORTS, FIBER
+class Part(object):
+    def __init__(self, name, mesh, nodeSets):
+        self.name     = name
+        self.mesh     = mesh
+        self.nodeSets = nodeSets
+
+        labels = np.arange(1, len(mesh.nodes) + 1, dtype=np.int64)
+        self.nodes    = MeshArray(labels, mesh.nodes, MeshNode)
+        labels = np.arange(1, len(mesh.elements) + 1, dtype=np.int64)
+        self.elements = MeshArray(labels, mesh.elements, MeshElement)
+
+#-----------------------------------------------------------------------------
+# odb objects
+#-----------------------------------------------------------------------------
+
+class SectionPoint(object):
+    def __init__(self, number, description = ""):
+        self.number      = number
+        self.description = description
+
+# bulk data block of a field output
+class FieldBulkData(object):
+    def __init__(self, data, nodeLabels = None, elementLabels = None,
+                 integrationPoints = None, sectionPoint = None, mises = None):
+        self.data              = data
+        self.nodeLabels        = nodeLabels
+        self.elementLabels     = elementLabels
+        self.integrationPoints = integrationPoints
+        self.sectionPoint      = sectionPoint
+        self.mises             = mises
+
+class FieldOutput(object):
+    def __init__(self, name, blocks):
+        self.name           = name
+        self.bulkDataBlocks = blocks
+
+    # values of the nodes of a node set
+    def getSubset(self, region):
+        blocks = []
+        for block in self.bulkDataBlocks:
+            rows = np.isin(block.nodeLabels, region.labels)
+            blocks.append(FieldBulkData(block.data[rows], nodeLabels=block.nodeLabels[rows]))
+        return FieldOutput(self.name, blocks)
+
+class OdbLoadCase(object):
+    def __init__(self, name):
+        self.name = name
+
+class Frame(object):
+    def __init__(self, fieldOutputs, frameValue = 0., description = "", loadCase = None):
+        self.fieldOutputs = fieldOutputs
+        self.frameValue   = frameValue
+        self.description  = description
+        self.loadCase     = loadCase
+        self.frameId      = 0
+
+class Step(object):
+    def __init__(self, name, number, frames):
+        self.name   = name
+        self.number = number
+        self.frames = frames
+
+# node set of an odb instance
+class OdbSet(object):
+    def __init__(self, name, labels, nodes):
+        self.name   = name
+        self.labels = np.asarray(labels, dtype=np.int64)
+        self.nodes  = MeshArray(self.labels, nodes._values[self.labels - 1], nodes._create)
+
+class OdbInstance(object):
+    def __init__(self, name, nodes, nodeSets = None):
+        self.name     = name
+        self.nodes    = nodes
+        self.nodeSets = dict((setName, OdbSet(setName, labels, nodes))
+                             for setName, labels in (nodeSets or {}).items())
+
+class OdbAssembly(object):
+    def __init__(self, instances):
+        self.instances = instances
+
+class Odb(object):
+    def __init__(self, name, steps, instances):
+        self.name         = name
+        self.steps        = steps
+        self.rootAssembly = OdbAssembly(instances)
+
+    def close(self):
+        if session.odbs.get(self.name) is self: del session.odbs[self.name]
+
+#-----------------------------------------------------------------------------
+# session, viewports and mdb
+#-----------------------------------------------------------------------------
+
+# records the calls on a viewport and its sub objects
+class Recorder(object):
+    def __init__(self, name, calls):
+        self._name  = name
+        self._calls = calls
+
+    def __getattr__(self, name):
+        if name.startswith("_"): raise AttributeError(name)
+        child = Recorder(self._name + "." + name, self._calls)
+        setattr(self, name, child)
+        return child
+
+    def __call__(self, *args, **kwargs):
+        self._calls.append(self._name)
+
+    def setValues(self, *args, **kwargs):
+        self._calls.append(self._name + ".setValues")
+        for name in kwargs: setattr(self, name, kwargs[name])
+
+class Session(object):
+    def __init__(self):
+        self.calls        = []      # recorded viewport calls
+        self.printed      = []      # names of the printed figures
+        self.odbs         = {}
+        self.viewports    = {'Viewport: 1': Recorder("viewport", self.calls)}
+        self.views        = dict((name, name) for name in ("Front", "Back", "Top", "Bottom",
+                                                           "Left", "Right", "Iso"))
+        self.printOptions = Recorder("printOptions", self.calls)
+
+    # the synthetic odbs have to be created with createOdb first
+    def openOdb(self, name, readOnly = False):
+        if name not in self.odbs:
+            raise Exception("error: no synthetic odb with this name", name)
+        return self.odbs[name]
+
+    def printToFile(self, fileName, format = PNG, canvasObjects = ()):
+        self.printed.append(fileName)
+
+class Job(object):
+    def __init__(self, name, model, **options):
+        self.name    = name
+        self.model   = model
+        self.options = options
+        self.status  = None
+
+    def submit(self):
+        self.status = COMPLETED
+
+    def waitForCompletion(self):
+        pass
+
+class Mdb(object):
+    def __init__(self):
+        self.models = {}
+        self.jobs   = {}
+
+    def Model(self, name, **options):
+        raise Exception("error: the stand-in backend has no modelling API", name)
+
+    def Job(self, name, model, **options):
+        self.jobs[name] = Job(name, model, **options)
+        return self.jobs[name]
+
+session = Session()
+mdb     = Mdb()
+
+#-----------------------------------------------------------------------------
+# synthetic models
+#-----------------------------------------------------------------------------
+
+# synthetic part of the profile, the mesh of the input file writer
+#   data    : InputData (or CombinedProfile) with the parameters
+#   numNodes: about this number of nodes, None: the mesh seeds of data
+def createPart(data, numNodes = None):
+    writer    = InpWriter(data)
+    divisions = None
+    if numNodes is not None:
+        points    = len(writer.createMesh(1).points)
+        divisions = max(1, int(round(float(numNodes) / points)) - 1)
+    mesh = writer.createMesh(divisions)
+    return Part(data.prjName, mesh, writer.nodeSets())
+
+# synthetic odb of the linear step of a part, registered in the session
+# under the name the profile opens: U is a sine shaped deflection with
+# the maximum of the beam theory, the vertical reaction of the beam theory
+# is spread over the supported nodes, S is a bending stress at the bottom
+# and top section points; with load cases there is one frame per case,
+# the fields are scaled by the case's mean pressure; like the trimmed output
+# requests RF is only written for the supports and S only on request,
+# unless data.fullOutput is set
+#   blockSize: maximum number of values per bulk data block
+def createOdb(data, part, odbName = None, blockSize = 100000):
+    if odbName is None: odbName = data.prjName + "-" + data.stepName[data.LINEAR] + ".odb"
+
+    estimate = BeamTheory.estimate(data)
+    mesh     = part.mesh
+    labels   = np.arange(1, len(mesh.nodes) + 1, dtype=np.int64)
+    n        = len(labels)
+    shape    = np.sin(math.pi * mesh.nodes[:,2] / data.l)
+
+    # displacements
+    u = np.zeros((n, 3))
+    u[:,1] = -float(estimate["maxU2Disp"]) * shape
+    u[:,0] = 1.e-3 * u[:,1] * mesh.nodes[:,0] / max(data.x1_I, 1.)
+
+    # reaction forces of the model, a symmetric model carries a part only
+    rf       = np.zeros((n, 3))
+    supports = np.asarray(part.nodeSets["SUPPORTS"]) - 1
+    factor   = data.symmetryFactor()[1]
+    if len(supports) > 0:
+        rf[supports, 1] = float(estimate["sumRFy"]) / factor / len(supports)
+
+    # bending stresses at the element centers
+    elements = np.arange(1, len(mesh.elements) + 1, dtype=np.int64)
+    center   = mesh.nodes[mesh.elements - 1].mean(axis=1)
+    sigma    = 100. * np.sin(math.pi * center[:,2] / data.l)
+
+    # output requests
+    rows   = None
+    stress = True
+    if not data.fullOutput:
+        rows   = np.sort(supports)
+        stress = data.stressOutput or data.limitState == "ULS"
+
+    if len(data.loadCases) == 0:
+        frames = [Frame({}), Frame(fieldOutputs(u, rf, sigma, labels, elements, blockSize,
+                                                rows, stress), 1.)]
+    else:
+        frames = []
+        for name, outer, inner in data.loadCaseList():
+            scale = (outer + inner) / (2.*data.p1)
+            frames.append(Frame(fieldOutputs(scale*u, scale*rf, scale*sigma, labels, elements,
+                                             blockSize, rows, stress), loadCase=OdbLoadCase(name)))
+
+    for frameId, frame in enumerate(frames): frame.frameId = frameId
+
+    stepName = data.stepName[data.LINEAR]
+    steps    = {stepName: Step(stepName, 1, frames)}
+    instance = OdbInstance(part.name.upper(), part.nodes, part.nodeSets)
+    odb      = Odb(odbName, steps, {instance.name: instance})
+    session.odbs[odbName] = odb
+    return odb
+
+# field outputs U, RF and S of a frame
+#   supports: rows of the nodes with RF output, None: all nodes
+#   stress  : write S
+def fieldOutputs(u, rf, sigma, labels, elements, blockSize, supports = None, stress = True):
+    if supports is None: supports = slice(None)
+    fields = {"U" : FieldOutput("U",  nodalBlocks(labels, u, blockSize)),
+              "RF": FieldOutput("RF", nodalBlocks(labels[supports], rf[supports], blockSize))}
+    if not stress: return fields
+
+    blocks = []
+    for number, sign in ((1, 1.), (5, -1.)):
+        s = np.column_stack((sign*sigma, 0.3*sign*sigma, 0.1*sigma))
+        for first in range(0, len(elements), blockSize):
+            rows = slice(first, first + blockSize)
+            blocks.append(FieldBulkData(s[rows], elementLabels=elements[rows],
+                                        integrationPoints=np.ones(len(elements[rows]), dtype=np.int64),
+                                        sectionPoint=SectionPoint(number)))
+    fields["S"] = FieldOutput("S", blocks)
+    return fields
+
+# synthetic odb of the buckling step with the given eigenvalues, only
+# the frame descriptions are written
+def createBucklingOdb(data, part, eigenvalues, odbName = None):
+    stepName = data.stepName[data.BUCKLING]
+    if odbName is None: odbName = data.prjName + "-" + stepName + ".odb"
+
+    frames = [Frame({}, 0., "Base state")]
+    for mode, eigenvalue in enumerate(eigenvalues):
+        frames.append(Frame({}, mode + 1., "Mode %5d: EigenValue = %12.5G" % (mode + 1, eigenvalue)))
+    for frameId, frame in enumerate(frames): frame.frameId = frameId
+
+    steps = {stepName: Step(stepName, 1, frames)}
+    odb   = Odb(odbName, steps, {part.name.upper(): OdbInstance(part.name.upper(), part.nodes)})
+    session.odbs[odbName] = odb
+    return odb
+
+# bulk data blocks of a nodal field
+def nodalBlocks(labels, data, blockSize):
+    return [FieldBulkData(data[first:first + blockSize], nodeLabels=labels[first:first + blockSize])
+            for first in range(0, len(labels), blockSize)]
@@ -0,0 +1,39 @@
+#=============================================================================
+# lazily loaded CAE backend
+# the Abaqus modules are imported on the first use of the backend only,
+# so the input, result and post-processing modules import without Abaqus
+# a different backend module can be selected before the first use
+#=============================================================================
+
+import importlib
+import threading
+
+# module of the backend, it provides mdb, session, regionToolset, mesh
+# and the Abaqus constants
+name = "AbaqusBackend"
+
+# loaded backend module
+_backend = None
+
+# the kernel objects (mdb, session, odbs) are shared by all objects of the
+# process, threads serialize their calls on them with this lock
+lock = threading.RLock()
+
+# select the backend module, e.g. select("AbaqusBackend")
+def select(moduleName):
+    global name, _backend
+    name     = moduleName
+    _backend = None
+
+# the backend module, imported on the first call
+def load():
+    global _backend
+    if _backend is None: _backend = importlib.import_module(name)
+    return _backend
+
+# an Abaqus constant from its name, e.g. constant("THREADS")
+def constant(constantName):
+    value = getattr(load(), constantName, None)
+    if value is None:
+        raise Exception("error: Unknown Abaqus constant", constantName)
+    return value
@@ -1,33 +1,89 @@
 # base class for the TWA
 from datetime import datetime as time
-import io
+import os
+import threading
+
+import LogWriter
 
 class Base:
 
+    # log levels
+    DEBUG = LogWriter.DEBUG
+    TABLE = LogWriter.TABLE
+    INFO  = LogWriter.INFO
+    WARNING = LogWriter.WARNING
+    ERROR = LogWriter.ERROR
+
     # instance counter
     __counter = 0                       # class attribute
-    __log     = "profiles.log"
+    __lock    = threading.Lock()        # protects the counter
+    __log     = "profiles.log"          # default log of the objects
+    __tagged  = False                   # records tagged with logTag()
 
     # constructor
+    #   log: log file of this object, "": the default log
+    # each base class of an object calls it, the first call sets the id
     def __init__(self,log = ""):
-        Base.__counter += 1
-        if len(log) > 0: Base.__log = log
+        if not hasattr(self, "instanceId"):
+            Base.__lock.acquire()
+            try:
+                Base.__counter += 1
+                self.instanceId = Base.__counter
+            finally:
+                Base.__lock.release()
+            self.logFile = Base.__log
+        if len(log) > 0: self.logFile = log
+
+    # set the default log of the objects created from now on
+    @staticmethod
+    def setDefaultLog(filename):
+        Base.__log = filename
+
+    # log writer of this object, shared by all objects with the same log
+    def logWriter(self):
+        return LogWriter.LogWriter.get(getattr(self, "logFile", Base.__log))
+
+    # tag the log records with the job name (hh.mm.ss|tag|text instead of
+    # hh.mm.ss|text) for runs whose jobs write into one log at the same
+    # time, e.g. pipelines and threads; returns the former setting
+    @staticmethod
+    def setTagged(tagged = True):
+        former        = Base.__tagged
+        Base.__tagged = bool(tagged)
+        return former
+
+    # tag of the log records, e.g. the job name; "" for no tag
+    def logTag(self):
+        return ""
 
     # reset the log
     def reset(self):
-        io.remove(Base.__log)
+        writer = self.logWriter()
+        writer.clear()
+        for filename in (writer.filename, writer.tableFile):
+            if filename and os.path.exists(filename): os.remove(filename)
+
+    # set the log levels
+    #   level    : records below this level are suppressed, e.g. INFO
+    #              suppresses the node tables
+    #   echo     : records from this level on are printed to the screen
+    #   tableFile: separate file for the node tables
+    def setLogLevel(self, level = None, echo = None, tableFile = None):
+        self.logWriter().setValues(level, echo, tableFile)
+
+    # write all buffered log records
+    def flushLog(self):
+        self.logWriter().flush()
 
     # log function
-    def appendLog(self,text):
+    def appendLog(self,text,level = LogWriter.INFO):
 
         t         = time.now()          # get the actual time
         timestamp = "%2.2d.%2.2d.%2.2d|" % (t.hour,t.minute,t.second)
+        if Base.__tagged:               # records of several jobs in one log
+            tag = self.logTag()
+            if len(tag) > 0: timestamp += tag + "|"
         textout   = timestamp + text    # output text
 
-        # create a file object
-        f = file(Base.__log,"a")        # open for append
-        f.write(textout + "\n")         # add linebreak
-        f.close()
-
-        # print to the screen
-        print textout
\ No newline at end of file
+        # buffered write, printed to the screen depending on the level
+        self.logWriter().write(level, textout)
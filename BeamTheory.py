@@ -0,0 +1,91 @@
+#=============================================================================
+# analytical estimate for the Combined profile
+# section properties of the thin walled cross section (center lines) and
+# beam theory for the vertical displacement and the total reaction force
+# all functions work on scalars or on NumPy arrays of candidate geometries
+#=============================================================================
+
+import numpy as np
+
+# input parameters used by the estimate
+NAMES = ("dh1", "dw1", "dt1", "ds1", "dh2", "dw2", "dt2", "ds2", "l", "EMod", "nue", "load")
+
+# get the parameters as float arrays from an InputData object or a
+# dict of columns
+def parameters(data):
+    values = {}
+    for name in NAMES:
+        if isinstance(data, dict): value = data[name]
+        else:                      value = getattr(data, name)
+        values[name] = np.asarray(value, dtype=float)
+    return values
+
+# plates of the cross section: (area, x, y, Ixx, Iyy) of the center lines,
+# Ixx and Iyy about the plate's own center
+def plates(dh1, dw1, dt1, ds1, dh2, dw2, dt2, ds2):
+    x2_I = dh2 + dw1/2.
+    x3_I = dh2
+    y1_I = dh1 - dt1
+    zero = 0.*y1_I      # zero of the shape of the input
+
+    def horizontal(b, t, x, y):
+        return (b*t, x, y, b*t**3/12., t*b**3/12.)
+
+    def vertical(h, t, x, y):
+        return (h*t, x, y, t*h**3/12., h*t**3/12.)
+
+    result = []
+    for side in (-1., 1.):
+        result.append(horizontal(dw1, dt1, side*x2_I, y1_I))        # I upper flange
+        result.append(horizontal(dw1, dt1, side*x2_I, zero))        # I lower flange
+        result.append(vertical(y1_I, ds1, side*x2_I, y1_I/2.))      # I web
+        result.append(horizontal(dh2, dt2, side*x3_I/2., y1_I))     # T web
+    result.append(vertical(dw2, dt2, zero, y1_I))                   # T flange
+    result.append(horizontal(2.*dh2, dt1, zero, zero))              # connecting flange
+    return result
+
+# section properties: area, centroid yc, second moments Ixx (bending
+# about the horizontal axis) and Iyy, shear area of the vertical plates
+def sectionProperties(dh1, dw1, dt1, ds1, dh2, dw2, dt2, ds2):
+    parts = plates(dh1, dw1, dt1, ds1, dh2, dw2, dt2, ds2)
+
+    area = sum([p[0] for p in parts])
+    yc   = sum([p[0]*p[2] for p in parts]) / area
+    Ixx  = sum([p[3] + p[0]*(p[2] - yc)**2 for p in parts])
+    Iyy  = sum([p[4] + p[0]*p[1]**2 for p in parts])
+
+    # vertical plates: I webs and T flange
+    shearArea = 2.*(dh1 - dt1)*ds1 + dw2*dt2
+
+    return {"area": area, "yc": yc, "Ixx": Ixx, "Iyy": Iyy, "shearArea": shearArea}
+
+# estimate of the linear step
+#   data   : InputData object or dict of columns (scalars or arrays)
+#   support: "clamped" (the supported lines are fixed in all dofs, like
+#            the FE model) or "pinned"
+# returns the section properties and
+#   q        : line load [N/mm]; the pressure p1 acts on the upper
+#              I flanges only (2*dw1), like in the FE model
+#   sumRFy   : total vertical reaction force [N]
+#   maxU2Disp: maximum vertical displacement (downwards) [mm], bending
+#              and shear deformation of the beam, no local plate bending
+def estimate(data, support = "clamped"):
+    v = parameters(data)
+
+    result = sectionProperties(v["dh1"], v["dw1"], v["dt1"], v["ds1"],
+                               v["dh2"], v["dw2"], v["dt2"], v["ds2"])
+
+    l  = v["l"]
+    E  = v["EMod"]
+    G  = E / (2.*(1. + v["nue"]))
+    p1 = v["load"]*1.e3 / (l*(2.*(v["dw1"] + v["dh2"])))
+    q  = p1 * 2.*v["dw1"]
+
+    if   support == "clamped": factor = 1./384.
+    elif support == "pinned":  factor = 5./384.
+    else: raise Exception("error: Unknown support", support)
+
+    result["q"]         = q
+    result["sumRFy"]    = q*l
+    result["maxU2Disp"] = factor*q*l**4/(E*result["Ixx"]) + q*l**2/(8.*G*result["shearArea"])
+    return result
@@ -2,25 +2,44 @@
 # Script to create the FE model and solve the Combined profile
 #=============================================================================
 
-from abaqus import *                # from the main library
-from caeModules import *            # import the modules
-from abaqusConstants import *       # constants we need
 from math import fabs
+import os
+import re
+import weakref
+
+import numpy as np
 
 # setup the logger
 from Base import Base
+from InputData import InputData
 from ResultData import ResultData
-
-# forced reload for the developer step
-import InputData                    # bind module to the symbol
-reload(InputData)                   # reload in any case
-from InputData import InputData     # standard import
+from NodeStore import NodeStore
+from NodeIndex import NodeIndex
+from ResultCache import ResultCache
+from FigureQueue import FigureQueue
+from FigureRenderer import FigureRenderer
+import FieldData
+import BeamTheory
+import Trace
+import Backend                      # the CAE kernel, loaded on the first use
 
 class CombinedProfile(InputData, ResultData):
+
+    # models of the living profiles of the process: model name -> profile
+    # the model, job and database names derive from prjName, so two
+    # profiles must not build the same model
+    __models = weakref.WeakValueDictionary()
+
+    # profiles reading the open databases: odb name -> profiles, a
+    # database is closed when its last profile closes it
+    __odbUsers = {}
+
     # constructor
-    def __init__(self):
+    #   log: log file of the profile, "": the default log
+    def __init__(self, log = ""):
 
         # call base Constructor
+        Base.__init__(self, log)
         InputData.__init__(self)
         ResultData.__init__(self)
 
@@ -28,10 +47,89 @@ class CombinedProfile(InputData, ResultData):
         self.myModel    = None
         self.mySketch   = None
         self.myPart     = None
+        self.myJob      = None
+        self.nodeIndex  = None
+        self.myViewport = None
+        self.buildPrints= {}        # fingerprints of the built parameter groups
+        self.builtCases = False     # the step has been built with load cases
+        self.jobStart   = None      # submit time of the job (trace clock)
+
+    # run a step: build the model, solve it and analyse the results
+    # model and solver are skipped if the job has been completed with
+    # the same input parameters before
+    @Trace.traced
+    def run(self, stepType):
+        self.stepType = stepType
+        if self.isUpToDate():
+            self.appendLog("> input of job '%s' unchanged, use the old results..." % self.jobName)
+        else:
+            self.createSystem()
+            self.createStep(stepType)
+            self.createAndRunJob()
+
+        self.openDatabase(stepType)
+        self.analyzeResults()
+
+        # the subspace solver found no positive eigenvalue: request more
+        if (stepType == self.BUCKLING and self.minBuckleEV is None and
+            self.eigenSolver == "SUBSPACE" and 2*self.numEigen <= self.maxEigen):
+            self.appendLog("> no positive eigenvalue, request %d eigenvalues..." % (2*self.numEigen))
+            self.setValues(numEigen = 2*self.numEigen)
+            self.run(stepType)
+
+    # check if the results of the job belong to the actual input parameters
+    # (a valid result cache or a completed odb with the same fingerprint)
+    def isUpToDate(self):
+        self.jobName = self.prjName + "-" + self.stepName[self.stepType]
+        fingerprint  = self.fingerprint()
+
+        cache = ResultCache(self.jobName + ".rcache")
+        if (self.useCache and cache.isValid(self.jobName + ".odb") and
+            cache.meta.get("fingerprint") == fingerprint): return True
+
+        return (os.path.exists(self.jobName + ".odb") and
+                not os.path.exists(self.jobName + ".lck") and
+                self.readFingerprint() == fingerprint)
+
+    # fingerprint of the input of the last completed job
+    def readFingerprint(self):
+        try:
+            f = open(self.jobName + ".fingerprint", "r")
+            fingerprint = f.read().strip()
+            f.close()
+        except IOError:
+            return None
+        return fingerprint
+
+    # parameter groups changed since the last build of the model
+    #   suffix: key of the built object, e.g. '@Linear' for a step
+    def changedGroups(self, suffix = ""):
+        groups = [group for group, names in InputData.PARAMETERS]
+        if self.myModel is None or self.myModel.name != self.prjName: return set(groups)
+        return set([group for group in groups
+                    if self.buildPrints.get(group + suffix) != self.fingerprint((group,))])
+
+    # store the fingerprints of the built parameter groups
+    def recordBuild(self, groups, suffix = ""):
+        for group in groups: self.buildPrints[group + suffix] = self.fingerprint((group,))
 
     # create the system (geometry, material, properties,...)
     # except loads and BCs
+    # an existing model with the same geometry and seeds is only updated,
+    # the part, mesh and fiber nodes are kept
     def createSystem(self):
+        changed = self.changedGroups()
+        if "geometry" not in changed and "seeds" not in changed:
+            if "material" in changed:
+                self.appendLog("> update material of model '%s'..." % self.prjName)
+                self.createMaterials()
+                self.createSections()
+            else:
+                self.appendLog("> model '%s' unchanged..." % self.prjName)
+            self.recordBuild(("material",))
+            return
+
+        self.buildPrints = {}
         self.createModel()
         self.createSketch()
         self.createPart()
@@ -39,20 +137,32 @@ class CombinedProfile(InputData, ResultData):
         self.createSections()
         self.assignSections()
         self.createMesh()
-        self.createInstance()
         self.getFiberNodes()
+        self.createSets()
+        self.createInstance()
+        self.createBCs()
+        self.recordBuild(("geometry", "material", "seeds"))
 
     # create model
+    @Trace.traced
     def createModel(self):
         self.appendLog("> create model '%s'..." % self.prjName)
-        try:
-            del mdb[self.prjName]
-        except:
-            pass
-        
-        self.myModel = mdb.Model(name=self.prjName)
+        abq = Backend.load()
+        with Backend.lock:
+            owner = CombinedProfile.__models.get(self.prjName)
+            if owner is not None and owner is not self:
+                raise Exception("error: Model is used by another profile", self.prjName)
+            CombinedProfile.__models[self.prjName] = self
+
+            try:
+                del abq.mdb.models[self.prjName]
+            except:
+                pass
+
+            self.myModel = abq.mdb.Model(name=self.prjName)
 
     # create a sketch
+    @Trace.traced
     def createSketch(self):
         self.appendLog("> create sketch '%s'..." % self.prjName)
         self.mySketch = self.myModel.ConstrainedSketch(name = self.prjName, sheetSize = 2*self.dh1)
@@ -77,30 +187,61 @@ class CombinedProfile(InputData, ResultData):
                      ( self.x1_I,0)]          # node 18
 
         #create the lines
-        self.mySketch.Line(point1=xyPoints[0] , point2=xyPoints[1]) 
-        self.mySketch.Line(point1=xyPoints[2] , point2=xyPoints[1]) 
-        self.mySketch.Line(point1=xyPoints[7] , point2=xyPoints[2]) 
-        self.mySketch.Line(point1=xyPoints[7], point2=xyPoints[12]) 
-        self.mySketch.Line(point1=xyPoints[12], point2=xyPoints[13])
-        self.mySketch.Line(point1=xyPoints[13], point2=xyPoints[14])
-        self.mySketch.Line(point1=xyPoints[1] , point2=xyPoints[4]) 
-        self.mySketch.Line(point1=xyPoints[6] , point2=xyPoints[7]) 
-        self.mySketch.Line(point1=xyPoints[7] , point2=xyPoints[8])
-        self.mySketch.Line(point1=xyPoints[13], point2=xyPoints[16])
-        self.mySketch.Line(point1=xyPoints[17], point2=xyPoints[16])
-        self.mySketch.Line(point1=xyPoints[16], point2=xyPoints[15])
-        self.mySketch.Line(point1=xyPoints[15], point2=xyPoints[5])
-        self.mySketch.Line(point1=xyPoints[5] , point2=xyPoints[4])
-        self.mySketch.Line(point1=xyPoints[4] , point2=xyPoints[3]) 
+        self.sketchLine(xyPoints[0] , xyPoints[1]) 
+        self.sketchLine(xyPoints[2] , xyPoints[1]) 
+        self.sketchLine(xyPoints[7] , xyPoints[2]) 
+        self.sketchLine(xyPoints[7], xyPoints[12]) 
+        self.sketchLine(xyPoints[12], xyPoints[13])
+        self.sketchLine(xyPoints[13], xyPoints[14])
+        self.sketchLine(xyPoints[1] , xyPoints[4]) 
+        self.sketchLine(xyPoints[6] , xyPoints[7]) 
+        self.sketchLine(xyPoints[7] , xyPoints[8])
+        self.sketchLine(xyPoints[13], xyPoints[16])
+        self.sketchLine(xyPoints[17], xyPoints[16])
+        self.sketchLine(xyPoints[16], xyPoints[15])
+        self.sketchLine(xyPoints[15], xyPoints[5])
+        self.sketchLine(xyPoints[5] , xyPoints[4])
+        self.sketchLine(xyPoints[4] , xyPoints[3]) 
+
+    # create a line of the sketch
+    # half and quarter models: the line is clipped at the symmetry plane x = 0
+    def sketchLine(self, point1, point2):
+        if self.symmetry != self.FULL:
+            (x1, y1), (x2, y2) = point1, point2
+            if x1 > 0. and x2 > 0.: return
+            if x1 > 0. or x2 > 0.:
+                # clip the line at x = 0
+                y0 = y1 + (y2 - y1) * (0. - x1) / (x2 - x1)
+                if x1 > 0.: point1 = (0., y0)
+                else:       point2 = (0., y0)
+                if point1 == point2: return
+
+        self.mySketch.Line(point1=point1, point2=point2)
+
+    # find the geometry (faces, edges, vertices) at some points
+    # points outside of a half or quarter model are skipped
+    def findAt(self, array, *points):
+        tol    = 1.e-6*self.l
+        select = []
+        for point in points:
+            if self.symmetry != self.FULL and point[0] > tol: continue
+            if point[2] > self.lm + tol: continue
+            select.append((point,))
+        Trace.count("findAt")
+        Trace.count("findAt.points", len(select))
+        return array.findAt(*select)
 
     # create the part
+    @Trace.traced
     def createPart(self):
-        self.appendLog("> create part '%s'..." % self.prjName)
+        self.appendLog("> create part '%s' (%s model)..." %
+                       (self.prjName, self.symmetryName[self.symmetry]))
         self.myPart = self.myModel.Part(name = self.prjName)
         self.myPart.BaseShellExtrude(sketch = self.mySketch,
-                                     depth = self.l)
+                                     depth = self.lm)
 
     # create the materials
+    @Trace.traced
     def createMaterials(self):
         self.appendLog("> create material '%s'..." % self.matName)
         myMaterial = self.myModel.Material(name = self.matName)
@@ -108,6 +249,7 @@ class CombinedProfile(InputData, ResultData):
         myMaterial.Density(table=((self.rho,),))
 
     # create section
+    @Trace.traced
     def createSections(self):
         self.appendLog("> create sections...")
         self.myModel.HomogeneousShellSection(name= self.prjName+"-I-Section-Flange",
@@ -120,55 +262,74 @@ class CombinedProfile(InputData, ResultData):
                                              material=self.matName,
                                              thickness=self.dt2)
 
+        # the T-flange in the symmetry plane x = 0 has half its thickness
+        if self.symmetry != self.FULL:
+            self.myModel.HomogeneousShellSection(name= self.prjName+"-T-Section-Sym",
+                                                 material=self.matName,
+                                                 thickness=self.dt2/2.)
+
     # assign sections
+    @Trace.traced
     def assignSections(self):
         self.appendLog("> assign sections...")
+        abq = Backend.load()
 
         # I-Section flange assignment
-        self.flangeFacesI = self.myPart.faces.findAt(
-            ( (-self.ix1, self.iy1, self.mz1),),   # node  1 -  2
-            ( (-self.ix2, self.iy1, self.mz1),),   # node  2 -  3
-            ( (-self.ix1,        0, self.mz1),),   # node  4 -  5
-            ( (-self.ix2,        0, self.mz1),),   # node  5 -  6
-            ( ( self.ix1, self.iy1, self.mz1),),   # node  14 -  15
-            ( ( self.ix2, self.iy1, self.mz1),),   # node  13 -  14
-            ( ( self.ix1,        0, self.mz1),),   # node  17 -  18
-            ( ( self.ix2,        0, self.mz1),),   # node  16 -  17
-            ( (        0,        0, self.mz1),),)  # connecting flange
-
-        region = regionToolset.Region(faces=self.flangeFacesI)
+        self.flangeFacesI = self.findAt(self.myPart.faces,
+            (-self.ix1, self.iy1, self.mz1),    # node  1 -  2
+            (-self.ix2, self.iy1, self.mz1),    # node  2 -  3
+            (-self.ix1,        0, self.mz1),    # node  4 -  5
+            (-self.ix2,        0, self.mz1),    # node  5 -  6
+            ( self.ix1, self.iy1, self.mz1),    # node  14 -  15
+            ( self.ix2, self.iy1, self.mz1),    # node  13 -  14
+            ( self.ix1,        0, self.mz1),    # node  17 -  18
+            ( self.ix2,        0, self.mz1),    # node  16 -  17
+            (-self.tx1,        0, self.mz1),)   # connecting flange
+
+        region = abq.regionToolset.Region(faces=self.flangeFacesI)
         self.myPart.SectionAssignment(region=region,
                                       sectionName= self.prjName + "-I-Section-Flange")
 
         # I-Section web assignment
-        self.webFacesI = self.myPart.faces.findAt(
-            ( (-self.ix3, self.iy2, self.mz1),),    # node  2 -  5
-            ( ( self.ix3, self.iy2, self.mz1),), )  # node 14 - 17
+        self.webFacesI = self.findAt(self.myPart.faces,
+            (-self.ix3, self.iy2, self.mz1),     # node  2 -  5
+            ( self.ix3, self.iy2, self.mz1), )   # node 14 - 17
 
-        region = regionToolset.Region(faces=self.webFacesI)
+        region = abq.regionToolset.Region(faces=self.webFacesI)
         self.myPart.SectionAssignment(region=region,
                                       sectionName= self.prjName + "-I-Section-Web")
 
         # T-Section assignment
-        self.facesT = self.myPart.faces.findAt(
-            ( (-self.tx1, self.ty2, self.mz1),),    # nodes 3 to 8
-            ( (-self.tx2, self.ty1, self.mz1),),    # node  7 to 8
-            ( (-self.tx2, self.ty3, self.mz1),),    # node  8 to 9
-            ( ( self.tx2, self.ty1, self.mz1),),    # node  10 to 
-            ( ( self.tx2, self.ty3, self.mz1),),    # node  11 to 
-            ( ( self.tx1, self.ty2, self.mz1),), )  # nodes 13 to 
+        websT   = ((-self.tx1, self.ty2, self.mz1),     # nodes 3 to 8
+                   ( self.tx1, self.ty2, self.mz1), )   # nodes 13 to 
+        flangeT = ((-self.tx2, self.ty1, self.mz1),     # node  7 to 8
+                   (-self.tx2, self.ty3, self.mz1),     # node  8 to 9
+                   ( self.tx2, self.ty1, self.mz1),     # node  10 to 
+                   ( self.tx2, self.ty3, self.mz1), )   # node  11 to 
+        self.facesT = self.findAt(self.myPart.faces, *(websT + flangeT))
         
-        region = regionToolset.Region(faces=self.facesT)
-        self.myPart.SectionAssignment(region=region,
-                                      sectionName= self.prjName + "-T-Section")
+        if self.symmetry == self.FULL:
+            region = abq.regionToolset.Region(faces=self.facesT)
+            self.myPart.SectionAssignment(region=region,
+                                          sectionName= self.prjName + "-T-Section")
+        else:
+            region = abq.regionToolset.Region(faces=self.findAt(self.myPart.faces, *websT))
+            self.myPart.SectionAssignment(region=region,
+                                          sectionName= self.prjName + "-T-Section")
+
+            region = abq.regionToolset.Region(faces=self.findAt(self.myPart.faces, *flangeT))
+            self.myPart.SectionAssignment(region=region,
+                                          sectionName= self.prjName + "-T-Section-Sym")
 
     # create the mesh on the part
+    @Trace.traced
     def createMesh(self):
         self.appendLog("> create mesh on part...")
 
         # Element type selection
-        elemType1 = mesh.ElemType(elemCode=S4R)
-        elemType2 = mesh.ElemType(elemCode=S3)
+        abq = Backend.load()
+        elemType1 = abq.mesh.ElemType(elemCode=abq.S4R)
+        elemType2 = abq.mesh.ElemType(elemCode=abq.S3)
         # assign the element types
         regions   = (self.flangeFacesI, self.webFacesI, self.facesT)
         self.myPart.setElementType(regions=regions,
@@ -176,92 +337,90 @@ class CombinedProfile(InputData, ResultData):
 
         # assign the seeds
         # I-flange
-        select = self.myPart.edges.findAt(
-            ((-self.ix1, self.iy1,      0),),
-            ((-self.ix2, self.iy1,      0),),
-            ((-self.ix1,        0,      0),),
-            ((-self.ix2,        0,      0),),
-            (( self.ix1, self.iy1,      0),),
-            (( self.ix2, self.iy1,      0),),
-            (( self.ix1,        0,      0),),
-            (( self.ix2,        0,      0),),
-            ((-self.ix1, self.iy1, self.l),),
-            ((-self.ix2, self.iy1, self.l),),
-            ((-self.ix1,        0, self.l),),
-            ((-self.ix2,        0, self.l),),
-            (( self.ix1, self.iy1, self.l),),
-            (( self.ix2, self.iy1, self.l),),
-            (( self.ix1,        0, self.l),),
-            (( self.ix2,        0, self.l),),
+        select = self.findAt(self.myPart.edges,
+            (-self.ix1, self.iy1,       0),
+            (-self.ix2, self.iy1,       0),
+            (-self.ix1,        0,       0),
+            (-self.ix2,        0,       0),
+            ( self.ix1, self.iy1,       0),
+            ( self.ix2, self.iy1,       0),
+            ( self.ix1,        0,       0),
+            ( self.ix2,        0,       0),
+            (-self.ix1, self.iy1, self.lm),
+            (-self.ix2, self.iy1, self.lm),
+            (-self.ix1,        0, self.lm),
+            (-self.ix2,        0, self.lm),
+            ( self.ix1, self.iy1, self.lm),
+            ( self.ix2, self.iy1, self.lm),
+            ( self.ix1,        0, self.lm),
+            ( self.ix2,        0, self.lm),
         )
         
         self.myPart.seedEdgeByNumber(edges=select,
                                 number=self.iFSeed)
 
         # I-Web
-        select = self.myPart.edges.findAt(
-            ((-self.ix3, self.iy2,      0),),
-            (( self.ix3, self.iy2,      0),),
-            ((        0,        0,      0),),
-            ((-self.ix3, self.iy2, self.l),),
-            (( self.ix3, self.iy2, self.l),),
-            ((        0,        0, self.l),),
+        select = self.findAt(self.myPart.edges,
+            (-self.ix3, self.iy2,       0),
+            ( self.ix3, self.iy2,       0),
+            (-self.ix3, self.iy2, self.lm),
+            ( self.ix3, self.iy2, self.lm),
         )
 
         self.myPart.seedEdgeByNumber(edges=select,
                                 number=self.iWSeed)
 
         # T-Web
-        select = self.myPart.edges.findAt(
-            ((-self.tx1, self.ty2,      0),),
-            ((-self.tx1, self.ty2, self.l),),
-            (( self.tx1, self.ty2,      0),),
-            (( self.tx1, self.ty2, self.l),),
+        select = self.findAt(self.myPart.edges,
+            (-self.tx1, self.ty2,       0),
+            (-self.tx1, self.ty2, self.lm),
+            ( self.tx1, self.ty2,       0),
+            ( self.tx1, self.ty2, self.lm),
         )
         
         self.myPart.seedEdgeByNumber(edges=select,
                                 number=self.tWSeed)
 
         # T-Flange
-        select = self.myPart.edges.findAt(
-            ((-self.tx2, self.ty1,      0),),
-            ((-self.tx2, self.ty3,      0),),
-            ((-self.tx2, self.ty1, self.l),),
-            ((-self.tx2, self.ty3, self.l),),
-            (( self.tx2, self.ty1,      0),),
-            (( self.tx2, self.ty3,      0),),
-            (( self.tx2, self.ty1, self.l),),
-            (( self.tx2, self.ty3, self.l),),
+        select = self.findAt(self.myPart.edges,
+            (-self.tx2, self.ty1,       0),
+            (-self.tx2, self.ty3,       0),
+            (-self.tx2, self.ty1, self.lm),
+            (-self.tx2, self.ty3, self.lm),
+            ( self.tx2, self.ty1,       0),
+            ( self.tx2, self.ty3,       0),
+            ( self.tx2, self.ty1, self.lm),
+            ( self.tx2, self.ty3, self.lm),
         )
         
         self.myPart.seedEdgeByNumber(edges=select,
                                 number=self.tFSeed)
         
-        # Connecting-Flange
-        select = self.myPart.edges.findAt(
-            (( 0, 0,      0),),
-            (( 0, 0, self.l),),
+        # Connecting-Flange, a half or quarter model has half of it
+        select = self.findAt(self.myPart.edges,
+            (-self.tx1, 0,       0),
+            (-self.tx1, 0, self.lm),
         )
         
         self.myPart.seedEdgeByNumber(edges=select,
-                                number=self.cFSeed)
+                                number=self.cFSeedModel)
 
         # Length seed
-        select = self.myPart.edges.findAt(
-            ((-self.x1_I, self.y1_I, self.l/2.),),
-            ((-self.x2_I, self.y1_I, self.l/2.),),
-            ((-self.x1_I,         0, self.l/2.),),
-            ((-self.x2_I,         0, self.l/2.),),
-            ((-self.x1_T, self.y1_T, self.l/2.),),
-            ((-self.x1_T, self.y2_T, self.l/2.),),
-            ((-self.x1_T, self.y3_T, self.l/2.),),
-            (( self.x1_T, self.y1_T, self.l/2.),),
-            (( self.x1_T, self.y2_T, self.l/2.),),
-            (( self.x1_T, self.y3_T, self.l/2.),),
-            (( self.x2_I, self.y1_I, self.l/2.),),
-            (( self.x1_I, self.y1_I, self.l/2.),),
-            (( self.x2_I,         0, self.l/2.),),
-            (( self.x1_I,         0, self.l/2.),),
+        select = self.findAt(self.myPart.edges,
+            (-self.x1_I, self.y1_I, self.mz1),
+            (-self.x2_I, self.y1_I, self.mz1),
+            (-self.x1_I,         0, self.mz1),
+            (-self.x2_I,         0, self.mz1),
+            (-self.x1_T, self.y1_T, self.mz1),
+            (-self.x1_T, self.y2_T, self.mz1),
+            (-self.x1_T, self.y3_T, self.mz1),
+            ( self.x1_T, self.y1_T, self.mz1),
+            ( self.x1_T, self.y2_T, self.mz1),
+            ( self.x1_T, self.y3_T, self.mz1),
+            ( self.x2_I, self.y1_I, self.mz1),
+            ( self.x1_I, self.y1_I, self.mz1),
+            ( self.x2_I,         0, self.mz1),
+            ( self.x1_I,         0, self.mz1),
         )      
                                         
         self.myPart.seedEdgeByNumber(edges=select,
@@ -276,44 +435,102 @@ class CombinedProfile(InputData, ResultData):
 
         # create mesh
         self.myPart.generateMesh()
+        Trace.count("nodes", len(self.myPart.nodes))
+        Trace.count("elements", len(self.myPart.elements))
 
         # print summary
         self.appendLog(">  %4d elements created." % len(self.myPart.elements))
         self.appendLog(">  %4d nodes created." % len(self.myPart.nodes))
 
     # create instance
+    @Trace.traced
     def createInstance(self):
         self.appendLog("> create instance...")
         
         self.myInstance = self.myModel.rootAssembly.Instance(
             name=self.prjName,
             part=self.myPart,
-            dependent=ON)
+            dependent=Backend.constant("ON"))
 
     # select fiber nodes, nodes for deformation analysis
+    @Trace.traced
     def getFiberNodes(self):
         self.appendLog("> select fiber nodes...")
 
-        # over all nodes
-        for node in self.myPart.nodes:
+        # spatial index of all nodes, reused for other node selections
+        self.nodeIndex = NodeIndex.fromNodes(self.myPart.nodes)
+        self.selectFiberNodes(self.nodeIndex)
 
-            # calculate distance from fiber line
-            dist = sqrt((node.coordinates[0] + self.x1_I)**2
-                      + (node.coordinates[1] +         0)**2)
-            if dist > 1.: continue
-
-            self.nodePos[node.label] = node.coordinates
+    # select the fiber nodes from a node index
+    #   labels: labels of the fiber nodes, e.g. of the set FIBER, None:
+    #           the nodes within 1 mm of the fiber line at (-x1_I, 0)
+    def selectFiberNodes(self, nodeIndex, labels = None):
+        if labels is None: index = nodeIndex.nearLine(-self.x1_I, 0., 1.)
+        else:              index = self.findRows(nodeIndex.labels, labels)
+        self.nodePos = NodeStore(nodeIndex.labels[index], nodeIndex.coordinates[index])
 
         # print fiber nodes
         self.appendLog("> %d fiber nodes:" % len(self.nodePos))
-        self.appendLog("--no ---------x ---------y ---------z")
-        for label in self.nodePos:
-            node = self.nodePos[label]
+        self.appendLog("--no ---------x ---------y ---------z", self.TABLE)
+        for label, node in self.nodePos.items():
             self.appendLog("%4d %10.2f %10.2f %10.2f" %
-                           (label,node[0],node[1],node[2]))
+                           (label,node[0],node[1],node[2]), self.TABLE)
+
+    # named sets of the part: FIBER (fiber nodes), SUPPORTS (supported
+    # lines) and LOAD (loaded flange faces); the BCs, the output requests
+    # and the post-processing use them
+    @Trace.traced
+    def createSets(self):
+        self.appendLog("> create sets...")
+        self.myPart.SetFromNodeLabels(name='FIBER', nodeLabels=tuple(self.nodePos.labels.tolist()))
+        self.myPart.Set(name='SUPPORTS', edges=self.supportEdges(self.myPart.edges))
+        self.myPart.Set(name='LOAD', faces=self.loadFaces(self.myPart.faces, "outer", "inner"))
+
+    # edges of the supported lines at the ends of the profile
+    def supportEdges(self, edges):
+        return self.findAt(edges,
+            (-self.ix1, self.iy1,      0),
+            (-self.ix2, self.iy1,      0),
+            (-self.tx1, self.iy1,      0),
+            (-self.ix1, self.iy1, self.l),
+            (-self.ix2, self.iy1, self.l),
+            (-self.tx1, self.iy1, self.l),
+            ( self.ix1, self.iy1,      0),
+            ( self.ix2, self.iy1,      0),
+            ( self.tx1, self.iy1,      0),
+            ( self.ix1, self.iy1, self.l),
+            ( self.ix2, self.iy1, self.l),
+            ( self.tx1, self.iy1, self.l),
+        )
 
+    # loaded faces of the upper flanges
+    #   regions: "outer" (Pressure-1) and/or "inner" (Pressure-2) flange halves
+    def loadFaces(self, faces, *regions):
+        points = []
+        if "outer" in regions: points += [(-self.ix1, self.iy1, self.mz1), (self.ix1, self.iy1, self.mz1)]
+        if "inner" in regions: points += [(-self.ix2, self.iy1, self.mz1), (self.ix2, self.iy1, self.mz1)]
+        return self.findAt(faces, *points)
+
+    # create the step with its loads, the BCs of the model are shared by
+    # the linear and the buckling step; the other steps are suppressed
+    # if only the load has changed, the load magnitudes are updated
+    # (load cases are always created again)
+    @Trace.traced
     def createStep(self,stepType):
         self.stepType = stepType
+        suffix  = "@" + self.stepName[self.stepType]
+        changed = self.changedGroups(suffix)
+        reuse   = ("step" not in changed and
+                   self.stepName[self.stepType] in self.myModel.steps.keys())
+        if (reuse and "load" in changed and self.stepType == self.LINEAR and
+            (self.builtCases or len(self.loadCases) > 0)):
+            reuse = False
+        if reuse:
+            if "load" in changed: self.updateLoads()
+            self.recordBuild(("load",), suffix)
+            self.activateStep()
+            return
+
         self.appendLog("> create step '%s'..." % self.stepName[self.stepType])
 
         # delete old step from step container
@@ -323,128 +540,351 @@ class CombinedProfile(InputData, ResultData):
             pass
 
         # create data for the linear step
+        # load cases: unit pressures of the regions, scaled in the cases of
+        # a perturbation step, solved with one factorization
         if self.stepType == self.LINEAR:
+            self.builtCases = False
+        if self.stepType == self.LINEAR and len(self.loadCases) == 0:
             self.myModel.StaticStep(name=self.stepName[self.stepType],
                                     previous='Initial')
-            self.createBCs()
             self.createLoads()
-
-    # create BCs
+        elif self.stepType == self.LINEAR:
+            self.myModel.StaticLinearPerturbationStep(name=self.stepName[self.stepType],
+                                                      previous='Initial')
+            self.createLoads(1.)
+            self.createLoadCases()
+            self.builtCases = True
+
+        # create data for the buckling step, the load is the reference load:
+        # p1 or the load case with the largest total load
+        elif self.stepType == self.BUCKLING:
+            self.createBuckleStep()
+            self.createLoads(*self.bucklingPressures())
+        self.createOutputRequests()
+        self.recordBuild(("load", "step"), suffix)
+        self.activateStep()
+
+    # field output requests of the step: only the fields and sets read by
+    # the analysis, i.e. U of the model (mode shapes of the buckling step),
+    # RF of the supports and optionally S; fullOutput keeps the default
+    # output of all nodes and elements
+    def createOutputRequests(self):
+        abq      = Backend.load()
+        stepName = self.stepName[self.stepType]
+
+        # the default request of the model isn't used in the step
+        for name in self.myModel.fieldOutputRequests.keys():
+            if name.startswith(stepName + "-"): continue
+            try:
+                self.myModel.fieldOutputRequests[name].deactivate(stepName)
+            except:
+                pass
+
+        if self.fullOutput:
+            self.appendLog("  full field output")
+            self.myModel.FieldOutputRequest(name=stepName + "-Full", createStepName=stepName,
+                                            variables=abq.PRESELECT)
+            return
+
+        variables = ('U',)
+        if (self.stressOutput or self.limitState == "ULS") and self.stepType == self.LINEAR:
+            variables += ('S',)
+        self.appendLog("  field output %s, RF of the supports" % ", ".join(variables))
+        self.myModel.FieldOutputRequest(name=stepName + "-Model", createStepName=stepName,
+                                        variables=variables)
+        if self.stepType == self.LINEAR:
+            self.myModel.FieldOutputRequest(name=stepName + "-Supports", createStepName=stepName,
+                                            region=self.myInstance.sets['SUPPORTS'],
+                                            variables=('RF',))
+
+    # create the buckling step
+    # Lanczos: only the eigenvalues above 0 are extracted, so numEigen = 1
+    # gives the lowest positive one; subspace: the lowest numEigen values,
+    # run doubles numEigen if none of them is positive
+    def createBuckleStep(self):
+        abq = Backend.load()
+        self.appendLog("  eigensolver %s, %d eigenvalues" % (self.eigenSolver, self.numEigen))
+        if self.eigenSolver == "LANCZOS":
+            self.myModel.BuckleStep(name=self.stepName[self.stepType],
+                                    previous='Initial',
+                                    numEigen=self.numEigen,
+                                    eigensolver=abq.LANCZOS,
+                                    minEigen=0.0)
+        elif self.eigenSolver == "SUBSPACE":
+            self.myModel.BuckleStep(name=self.stepName[self.stepType],
+                                    previous='Initial',
+                                    numEigen=self.numEigen,
+                                    eigensolver=abq.SUBSPACE,
+                                    vectors=max(2*self.numEigen, self.numEigen + 8),
+                                    maxIterations=100)
+        else:
+            raise Exception("error: Unknown eigensolver", self.eigenSolver)
+
+    # resume the actual step and suppress the other steps, so the job
+    # only solves the actual step
+    def activateStep(self):
+        for name in self.stepName:
+            if name not in self.myModel.steps.keys(): continue
+            if name == self.stepName[self.stepType]: self.myModel.steps[name].resume()
+            else:                                    self.myModel.steps[name].suppress()
+
+    # name of a load of the actual step, the loads of the buckling step
+    # get the step name as prefix
+    def loadName(self, name):
+        if self.stepType == self.LINEAR: return name
+        return self.stepName[self.stepType] + "-" + name
+
+    # create BCs in the initial step, valid for all steps
+    @Trace.traced
     def createBCs(self):
         self.appendLog("> create BCs...")
+        abq = Backend.load()
 
-        # physical BCs
-        edges = self.myInstance.edges.findAt(
-            ((-self.ix1, self.iy1,      0),),
-            ((-self.ix2, self.iy1,      0),),
-            ((-self.tx1, self.iy1,      0),),
-            ((-self.ix1, self.iy1, self.l),),
-            ((-self.ix2, self.iy1, self.l),),
-            ((-self.tx1, self.iy1, self.l),),
-            (( self.ix1, self.iy1,      0),),
-            (( self.ix2, self.iy1,      0),),
-            (( self.tx1, self.iy1,      0),),
-            (( self.ix1, self.iy1, self.l),),
-            (( self.ix2, self.iy1, self.l),),
-            (( self.tx1, self.iy1, self.l),),
-        )
-        region = regionToolset.Region(edges=edges)
+        # physical BCs on the supported lines
+        region = self.myInstance.sets['SUPPORTS']
         self.myModel.DisplacementBC(
             name='vertical supported lines',
-            createStepName=self.stepName[self.stepType],
+            createStepName='Initial',
             region=region,
-            u1=0.0, u2=0.0, u3=0.0, ur1=0.0, ur2=0.0, ur3=0.0)
+            u1=abq.SET, u2=abq.SET, u3=abq.SET, ur1=abq.SET, ur2=abq.SET, ur3=abq.SET)
 
-        # rigid body modes
-        vertices = self.myInstance.vertices.findAt(((-self.x1_I, self.iy1, self.l),),)
-        region = regionToolset.Region(vertices=vertices)
+        # rigid body modes, a quarter model has no end at z = l
+        zr = self.l
+        if self.symmetry == self.QUARTER: zr = 0.
+        vertices = self.findAt(self.myInstance.vertices, (-self.x1_I, self.iy1, zr))
+        region = abq.regionToolset.Region(vertices=vertices)
         self.myModel.DisplacementBC(
             name='rigid body modes',
-            createStepName=self.stepName[self.stepType],
+            createStepName='Initial',
             region = region,
-            u1=0.0, u3=0.0, ur2=0.0)
+            u1=abq.SET, u3=abq.SET, ur2=abq.SET)
+
+        # symmetry planes of a half or quarter model
+        tol = 1.e-6*self.l
+        big = 10.*(self.l + self.x1_I + self.y1_T)
+        if self.symmetry != self.FULL:
+            faces = self.myInstance.faces.getByBoundingBox(-tol, -big, -big, tol, big, big)
+            edges = self.myInstance.edges.getByBoundingBox(-tol, -big, -big, tol, big, big)
+            region = abq.regionToolset.Region(faces=faces, edges=edges)
+            self.myModel.XsymmBC(
+                name='symmetry plane x',
+                createStepName='Initial',
+                region=region)
+
+        if self.symmetry == self.QUARTER:
+            edges = self.myInstance.edges.getByBoundingBox(-big, -big, self.lm - tol, big, big, self.lm + tol)
+            region = abq.regionToolset.Region(edges=edges)
+            self.myModel.ZsymmBC(
+                name='symmetry plane z',
+                createStepName='Initial',
+                region=region)
 
     # create pressure load
-    def createLoads(self):
+    #   magnitude: pressure of the outer flange halves, None: p1
+    #   inner    : pressure of the inner flange halves, None: magnitude
+    @Trace.traced
+    def createLoads(self, magnitude = None, inner = None):
         self.appendLog("> create Loads...")
+        abq = Backend.load()
+        if magnitude is None: magnitude = self.p1
+        if inner is None:     inner     = magnitude
 
-        faces = self.myInstance.faces.findAt(
-            ((-self.ix1, self.iy1, self.mz1),),
-            (( self.ix1, self.iy1, self.mz1),),
-        )
-
-        region = regionToolset.Region(side2Faces=faces)
-        self.myModel.Pressure(name='Pressure-1',
+        faces  = self.loadFaces(self.myInstance.faces, "outer")
+        region = abq.regionToolset.Region(side2Faces=faces)
+        self.myModel.Pressure(name=self.loadName('Pressure-1'),
                               createStepName=self.stepName[self.stepType],
                               region=region,
-                              magnitude=self.p1)
-
-        faces = self.myInstance.faces.findAt(
-            ((-self.ix2, self.iy1, self.mz1),),
-            (( self.ix2, self.iy1, self.mz1),),
-        )
+                              magnitude=magnitude)
 
-        region = regionToolset.Region(side1Faces=faces)
-        self.myModel.Pressure(name='Pressure-2',
+        faces  = self.loadFaces(self.myInstance.faces, "inner")
+        region = abq.regionToolset.Region(side1Faces=faces)
+        self.myModel.Pressure(name=self.loadName('Pressure-2'),
                               createStepName=self.stepName[self.stepType],
                               region=region,
-                              magnitude=self.p1)
+                              magnitude=inner)
+
+    # create the load cases of the perturbation step
+    # Pressure-1 (outer flange halves) and Pressure-2 (inner flange halves)
+    # are scaled by the pressures of the case, the BCs of the initial step
+    # are active in all cases
+    @Trace.traced
+    def createLoadCases(self):
+        step = self.myModel.steps[self.stepName[self.stepType]]
+        for name, outer, inner in self.loadCaseList():
+            self.appendLog("> create load case '%s' (%.5f, %.5f N/mm^2)..." % (name, outer, inner))
+            loads = tuple([(load, scale) for load, scale in (('Pressure-1', outer), ('Pressure-2', inner))
+                           if scale != 0.])
+            step.LoadCase(name=name, loads=loads)
+
+    # set the load magnitudes of the existing step
+    def updateLoads(self):
+        self.appendLog("> update Loads...")
+        magnitudes = (self.p1, self.p1)
+        if self.stepType == self.BUCKLING: magnitudes = self.bucklingPressures()
+        for name, magnitude in zip(('Pressure-1', 'Pressure-2'), magnitudes):
+            self.myModel.loads[self.loadName(name)].setValues(magnitude=magnitude)
 
     # create and run the job
-    def createAndRunJob(self):
+    # options: job parameters overriding the InputData values,
+    #          e.g. numCpus=4, parallel="THREADS"
+    def createAndRunJob(self, **options):
+        self.submitJob(**options)
+        with Trace.Span("waitForCompletion", profile=self.prjName):
+            self.myJob.waitForCompletion()
+        self.finishJob()
+
+    # create the job and submit it without waiting for the solver
+    @Trace.traced
+    def submitJob(self, **options):
         self.jobName = self.prjName + "-" + self.stepName[self.stepType]
         self.appendLog("> create job '%s' and run it..." % self.jobName)
 
-        job = mdb.Job(name=self.jobName,
-                      model=self.prjName)
+        jobOptions = self.jobOptions(**options)
+        self.appendLog("  cpus %d, domains %d, mode %s, memory %s %s" %
+                       (jobOptions["numCpus"], jobOptions["numDomains"],
+                        jobOptions["multiprocessingMode"],
+                        jobOptions["memory"], jobOptions["memoryUnits"]))
+
+        with Backend.lock:
+            self.myJob = Backend.load().mdb.Job(name=self.jobName,
+                                                model=self.prjName,
+                                                **jobOptions)
 
         self.closeDatabase()
-        job.submit()
-        job.waitForCompletion()
 
-    # set font size of all components
+        # the old results don't belong to the new job
+        self.jobFingerprint = self.fingerprint()
+        if os.path.exists(self.jobName + ".fingerprint"): os.remove(self.jobName + ".fingerprint")
+
+        self.jobStart = Trace.clock()
+        self.myJob.submit()
+
+    # keyword arguments of mdb.Job from the job parameters
+    def jobOptions(self, numCpus = None, numDomains = None, parallel = None,
+                   memory = None, memoryUnits = None):
+        if numCpus     is None: numCpus     = self.numCpus
+        if numDomains  is None: numDomains  = self.numDomains
+        if parallel    is None: parallel    = self.parallel
+        if memory      is None: memory      = self.memory
+        if memoryUnits is None: memoryUnits = self.memoryUnits
+
+        # the number of domains must be a multiple of the cpus
+        if numDomains is None: numDomains = numCpus
+        numDomains = max(1, numDomains // numCpus) * numCpus
+
+        return {"numCpus"            : numCpus,
+                "numDomains"         : numDomains,
+                "multiprocessingMode": Backend.constant(parallel),
+                "memory"             : memory,
+                "memoryUnits"        : Backend.constant(memoryUnits)}
+
+    # check the finished job, the fingerprint of its input parameters
+    # is stored with completed jobs
+    @Trace.traced
+    def finishJob(self):
+        status = self.jobStatus()
+        if self.jobStart is not None:
+            Trace.record("job " + self.jobName, self.jobStart, Trace.clock(), status=status)
+        if status == "COMPLETED":
+            f = open(self.jobName + ".fingerprint", "w")
+            f.write(self.jobFingerprint + "\n")
+            f.close()
+        else:
+            self.appendLog("> job '%s' not completed: %s" % (self.jobName, status))
+        return status
+
+    # status of the submitted job, e.g. 'RUNNING' or 'COMPLETED'
+    def jobStatus(self):
+        status = str(self.myJob.status)
+
+        # the status is only updated if job messages are received,
+        # so check the end of the status file as well
+        if status in ("SUBMITTED", "RUNNING", "None"):
+            try:
+                f = open(self.jobName + ".sta", "r")
+                text = f.read()
+                f.close()
+            except IOError:
+                return status
+            if   "HAS COMPLETED SUCCESSFULLY" in text: status = "COMPLETED"
+            elif "HAS NOT BEEN COMPLETED"     in text: status = "ABORTED"
+
+        return status
+
+    # check if the submitted job has finished
+    def jobFinished(self):
+        return self.jobStatus() in ("COMPLETED", "ABORTED", "TERMINATED")
+
+    # set font size of all components (see FigureRenderer)
     def setFontSize(self,size):
-        fsize = int(size*10 +0.5)
-        self.myViewport.viewportAnnotationOptions.setValues(
-            triadFont='-*-verdana-medium-r-normal-*-*-%d-*-*-p-*-*-*' % fsize,
-            legendFont='-*-verdana-medium-r-normal-*-*-%d-*-*-p-*-*-*' % fsize,
-            titleFont='-*-verdana-medium-r-normal-*-*-%d-*-*-p-*-*-*' % fsize,
-            stateFont='-*-verdana-medium-r-normal-*-*-%d-*-*-p-*-*-*' % fsize)
-
-    # close the database
+        FigureRenderer(self.myViewport).setFontSize(size)
+
+    # close the database, unless another profile still reads it
     def closeDatabase(self):
         self.odbName = self.prjName + "-" + self.stepName[self.stepType] + ".odb"
-        self.appendLog("> close database '%s'..." % self.odbName)
-        try:
-            session.odbs[self.odbName].close()
-        except:
-            pass
+        with Backend.lock:
+            users = CombinedProfile.__odbUsers.get(self.odbName, weakref.WeakSet())
+            users.discard(self)
+            if len(users) > 0:
+                self.appendLog("> database '%s' is still read by another profile." % self.odbName)
+                return
+
+            CombinedProfile.__odbUsers.pop(self.odbName, None)
+            self.appendLog("> close database '%s'..." % self.odbName)
+            try:
+                Backend.load().session.odbs[self.odbName].close()
+            except:
+                pass
 
     # open the result database and set a default viewport configuration
+    # a valid result cache is used instead of the database, the headless
+    # mode doesn't touch the viewport
+    @Trace.traced
     def openDatabase(self, stepType):
-        self.odbName = self.prjName + "-" + self.stepName[self.stepType] + ".odb"
+        self.odbName   = self.prjName + "-" + self.stepName[self.stepType] + ".odb"
+        self.cacheName = self.prjName + "-" + self.stepName[self.stepType] + ".rcache"
+
+        self.myOdb = None
+        if self.useCache and self.loadCache(self.cacheName, self.odbName):
+            self.appendLog("> read results from cache '%s'..." % self.cacheName)
+            return
+        self.loadDatabase()
+
+    # open the odb of the step and, if not headless, show it in the viewport
+    def loadDatabase(self):
         self.appendLog("> open database '%s'..." % self.odbName)
 
-        self.myViewport = session.viewports['Viewport: 1']
-        self.myOdb = session.openOdb(name=self.odbName)
+        # the session is shared by the profiles of the process, an open
+        # database is reused and stays open until all its profiles close it
+        abq = Backend.load()
+        with Backend.lock:
+            if self.odbName in abq.session.odbs.keys():
+                self.myOdb = abq.session.odbs[self.odbName]
+            else:
+                self.myOdb = abq.session.openOdb(name=self.odbName, readOnly=self.headless)
+            CombinedProfile.__odbUsers.setdefault(self.odbName, weakref.WeakSet()).add(self)
+        if self.headless: return
+
+        self.myViewport = abq.session.viewports['Viewport: 1']
 
         # assign database to viewport
         self.myViewport.setValues(displayedObject=self.myOdb)
 
         # set standard view: U/U2 vertical displacements
-        self.myViewport.odbDisplay.display.setValues(plotState=CONTOURS_ON_DEF)
+        self.myViewport.odbDisplay.display.setValues(plotState=abq.CONTOURS_ON_DEF)
         self.myViewport.odbDisplay.setPrimaryVariable(
                 variableLabel='U',
-                outputPosition=NODAL,
-                refinement=(COMPONENT, 'U2'))
+                outputPosition=abq.NODAL,
+                refinement=(abq.COMPONENT, 'U2'))
 
         # set standard font size
-        self.setFontSize(10)
+        self.setFontSize(self.fontSize)
 
         # auto scale it
         self.myViewport.view.fitView()
 
     # main routine for the analysis
+    @Trace.traced
     def analyzeResults(self):
         self.jobName = self.prjName + "-" + self.stepName[self.stepType]
         self.appendLog("> analysis of step '%s'..." %
@@ -452,124 +892,310 @@ class CombinedProfile(InputData, ResultData):
 
         # analyse static calculation
         if self.stepType == self.LINEAR:
-            self.analyseLinearStep()
-        else:
-            pass
+            self.analyseLinearStep(self.limitState)
+        elif self.stepType == self.BUCKLING:
+            self.analyseBucklingStep()
+
+    # read the fields of the last frame from the odb into arrays
+    # and store them in the result cache; the ULS proof reads the
+    # stresses of all frames of the step
+    # the odb objects are shared by the threads of the process, only the
+    # calls of the odb API hold the kernel lock
+    @Trace.traced
+    def readLinearFields(self, state = "SLS"):
+        fields = {}
+
+        # the reactions are read at the supports only
+        supports = self.odbNodeSet('SUPPORTS')
+        for prefix, frame in self.linearFrames():
+            for name in ('U', 'RF'):
+                with Backend.lock:
+                    field = frame.fieldOutputs[name]
+                    if name == 'RF' and supports is not None: field = field.getSubset(region=supports)
+                fields[prefix + name + ".labels"], fields[prefix + name + ".data"] = \
+                    FieldData.nodalData(field)
+
+            frames = [frame]
+            if state == "ULS" and len(self.loadCases) == 0:
+                with Backend.lock:
+                    frames = list(self.myOdb.steps[self.stepName[self.stepType]].frames)
+            self.readStress(fields, prefix, frames)
+
+        # node coordinates of all instances
+        nodeIndex = NodeIndex.fromOdb(self.myOdb)
+        fields["nodes.labels"]      = nodeIndex.labels
+
+        # the model has not been built, if the results are reused
+        if len(self.nodePos) == 0:
+            self.appendLog("> select fiber nodes from the database...")
+            fiber = self.odbNodeSet('FIBER')
+            if fiber is None: self.selectFiberNodes(nodeIndex)
+            else:
+                with Backend.lock: labels = [node.label for node in fiber.nodes]
+                self.selectFiberNodes(nodeIndex, labels)
+
+        fields["nodes.coordinates"] = nodeIndex.coordinates
+
+        if self.useCache:
+            self.appendLog("> write result cache '%s'..." % self.cacheName)
+            self.writeCache(self.cacheName, fields,
+                            {"job"        : self.jobName,
+                             "step"       : self.stepName[self.stepType],
+                             "fingerprint": self.readFingerprint()},
+                            self.odbName)
+        return fields
+
+    # read the stresses of some frames into the fields prefix + 'S.labels',
+    # 'S.points', 'S.sections', 'S.mises', 'S.data' and 'S.frames' (frame
+    # number), one row per value; frames without S are skipped
+    def readStress(self, fields, prefix, frames):
+        names  = ("labels", "points", "sections", "mises", "data", "frames")
+        arrays = dict((name, []) for name in names)
+        for frame in frames:
+            with Backend.lock:
+                if 'S' not in frame.fieldOutputs.keys(): continue
+                field   = frame.fieldOutputs['S']
+                frameId = frame.frameId
+            values = FieldData.elementData(field)
+            for name, value in zip(names, values): arrays[name].append(value)
+            number = np.empty(len(values[0]), dtype=np.int64)
+            number.fill(frameId)
+            arrays["frames"].append(number)
+
+        if len(arrays["labels"]) == 0: return
+        for name in names:
+            fields[prefix + "S." + name] = np.concatenate(arrays[name])
+
+    # node set of the database, None if the model has no such set
+    def odbNodeSet(self, name):
+        with Backend.lock:
+            for instance in self.myOdb.rootAssembly.instances.values():
+                if name in instance.nodeSets.keys(): return instance.nodeSets[name]
+        return None
+
+    # prefix of the field names of a load case, e.g. 'LC1:U.data'
+    def casePrefix(self, name):
+        if len(self.loadCases) == 0: return ""
+        return name + ":"
+
+    # frames of the linear step as (field prefix, frame): the frames of the
+    # load cases or the last frame
+    def linearFrames(self):
+        frames = {}
+        with Backend.lock:
+            step = self.myOdb.steps[self.stepName[self.stepType]]
+            if len(self.loadCases) == 0: return [("", step.frames[-1])]
+
+            for frame in step.frames:
+                if frame.loadCase is not None: frames[frame.loadCase.name.upper()] = frame
+
+        result = []
+        for name, outer, inner in self.loadCaseList():
+            if name.upper() not in frames:
+                raise Exception("error: Load case not found in the database", name, self.odbName)
+            result.append((self.casePrefix(name), frames[name.upper()]))
+        return result
 
     # analyses of the linear static calculation
+    # returns the results of the load cases, the result attributes are
+    # set to the governing case
+    @Trace.traced
     def analyseLinearStep(self,state="SLS"):
-        # get frame
-        frame = self.myOdb.steps[self.stepName[self.stepType]].frames[-1]
-
-        # get reaction forces
-        rfo   = frame.fieldOutputs['RF']
+        # get the field arrays from the cache or the odb
+        if self.myOdb is None: fields = self.resultCache
+        else:                  fields = self.readLinearFields(state)
+
+        # the beam theory values scale with the mean pressure of a case
+        estimate = BeamTheory.estimate(self)
+
+        self.loadCaseResults = []
+        for name, outer, inner in self.loadCaseList():
+            if len(self.loadCases) > 0:
+                self.appendLog("> load case '%s':" % name)
+            self.analyseLoadCase(fields, self.casePrefix(name), estimate,
+                                 (outer + inner) / (2.*self.p1), state)
+
+            self.loadCaseResults.append({"name"            : name,
+                                         "outer"           : outer,
+                                         "inner"           : inner,
+                                         "sumRFo"          : list(self.sumRFo),
+                                         "maxU2Disp"       : self.maxU2Disp,
+                                         "maxU2FiberDisp"  : self.maxU2FiberDisp,
+                                         "maxFiberDisp"    : self.getMaxDisp(),
+                                         "maxStress"       : self.maxStress,
+                                         "elementX"        : self.elementX,
+                                         "criticalElements": list(self.criticalElements)})
+
+        # governing load case, the node stores keep the last case
+        if len(self.loadCaseResults) > 1:
+            self.printLoadCases(state)
+            if state == "SLS": key = "maxU2Disp"
+            else:              key = "maxStress"
+            governing = max(self.loadCaseResults, key=lambda result: result[key])
+            self.appendLog("> governing load case '%s'" % governing["name"])
+            for name in ("sumRFo", "maxU2Disp", "maxU2FiberDisp", "maxStress", "elementX",
+                         "criticalElements"):
+                setattr(self, name, governing[name])
 
+        # print figures
+        self.printFigures(self.figureRequests(state))
+        return self.loadCaseResults
+
+    # analyses of a load case of the linear step
+    #   prefix  : prefix of the field names of the case
+    #   estimate: beam theory of the load
+    #   scale   : ratio of the case's pressure to the load's pressure
+    def analyseLoadCase(self, fields, prefix, estimate, scale, state = "SLS"):
         # sum of reaction forces
-        self.sumRFo = [0.,0.,0.]
-
-        # table header
-        self.appendLog("  --no ------Fx ------Fy ------Fz")
-
-        # over all nodes
-        for value in rfo.values:
-            if sqrt(value.data[0]**2
-                   +value.data[1]**2
-                   +value.data[2]**2) < 1.e-3: continue
+        self.evalReactions(fields[prefix + "RF.labels"], fields[prefix + "RF.data"],
+                           self.symmetryFactor())
 
+        # table of the nodes with reaction forces
+        self.appendLog("  --no ------Fx ------Fy ------Fz", self.TABLE)
+        for label, rf in self.nodeRFo.items():
             self.appendLog("  %4d %8.2f %8.2f %8.2f" %
-                           (value.nodeLabel,
-                            value.data[0],value.data[1],value.data[2]))
-
-            # sum up components
-            for i in range(3): self.sumRFo[i] += value.data[i]
+                           (label, rf[0], rf[1], rf[2]), self.TABLE)
 
+        if self.symmetry != self.FULL:
+            self.appendLog("reaction forces of the full model (%s model):" %
+                           self.symmetryName[self.symmetry])
         self.appendLog("sum of reaction forces: %8.3f %8.3f %8.3f kN" %
                        (self.sumRFo[0]/1.e3,
                         self.sumRFo[1]/1.e3,
                         self.sumRFo[2]/1.e3))
 
-        # maximum vertical displacement
-        if 2 > 1:
-
-            # get displacements
-            disp = frame.fieldOutputs['U']
-
-            self.maxU2Disp = None
-            for value in disp.values:
-
-                if self.maxU2Disp is None: self.maxU2Disp = -value.data[1]
-                else:
-                    if self.maxU2Disp < -value.data[1]:
-                        self.maxU2Disp = -value.data[1]
+        # sanity check with the beam theory
+        if scale != 0.: self.checkReactions(float(estimate["sumRFy"])*scale)
 
-                # save node displacement vectors
-                self.nodeDisp[value.nodeLabel] = value.data
+        # displacements of the load case, also for the ULS proof, so the
+        # displacement results (getMaxDisp) belong to this case
+        self.evalDisplacements(fields[prefix + "U.labels"], fields[prefix + "U.data"])
 
+        # maximum vertical displacement
+        if state == "SLS":
             self.appendLog("Maximum vertical displacements:")
             self.appendLog("  total............: %8.3f mm" % self.maxU2Disp)
-
-            # maximum vertical displacement on support fiber
-            maxU2FiberDisp = None
-            # over all fiber nodes
-            for label in self.nodePos:
-                #                                            - vector ----------
-                #                                                                 |y-component
-                if maxU2FiberDisp is None: maxU2FiberDisp = -self.nodeDisp[label][1]
-                else:
-                    if maxU2FiberDisp < -self.nodeDisp[label][1]:
-                        maxU2FiberDisp = -self.nodeDisp[label][1]
-
-            self.appendLog("  on supported line: %8.3f mm" % maxU2FiberDisp)
+            self.appendLog("  on supported line: %8.3f mm" % self.maxU2FiberDisp)
+            self.appendLog("  beam theory......: %8.3f mm" % (float(estimate["maxU2Disp"])*scale))
 
         # calculate maximum stress
         else:
 
-            # get displacements
-            self.elementX  = 0
-            self.maxStress = 0.
-            for value in frame.fieldOutputs['S'].values:
-                if self.maxStress < value.mises:
-                    self.maxStress = value.mises
-                    self.elementX  = value.elementLabel
+            # Mises stress envelope of all frames and section points
+            if prefix + "S.labels" not in fields:
+                raise Exception("error: No stress output in the database", self.odbName)
+            self.evalStress(fields[prefix + "S.labels"], fields[prefix + "S.points"],
+                            fields[prefix + "S.sections"], fields[prefix + "S.mises"],
+                            fields[prefix + "S.frames"], self.numCritical)
 
             self.appendLog("> max. Mises stress:")
             self.appendLog(">   Element %d, %8.1f N/mm^2" % (self.elementX,self.maxStress))
-
-        # set standard font size
-        self.setFontSize(10)
-
-        # print figures
-        # displacement figures for SLS
-        if 2 > 1:
-            varList = ["U1","U3","U2"]
-            for var in varList:
-                self.myViewport.odbDisplay.setPrimaryVariable(
-                        variableLabel='U',
-                        outputPosition=NODAL,
-                        refinement=(COMPONENT, var))
-
-                # auto scale it
-                self.myViewport.view.fitView()
-
-                # print figure into a file
-                self.printPngFile(self.jobName + "-" + var)
-
-        # stress plot for ULS
+            self.appendLog("  %d most critical elements:" % len(self.criticalElements), self.TABLE)
+            self.appendLog("  --element ----Mises --IP --SP -frame", self.TABLE)
+            for critical in self.criticalElements:
+                self.appendLog("  %9d %9.1f %4d %4d %6d" %
+                               (critical["element"], critical["mises"], critical["integrationPoint"],
+                                critical["sectionPoint"], critical["frame"]), self.TABLE)
+
+    # print a table of the load case results
+    def printLoadCases(self, state = "SLS"):
+        self.appendLog("> results of %d load cases:" % len(self.loadCaseResults))
+        if state == "ULS":
+            self.appendLog("  -------case ---sum Fy kN --Mises N/mm^2 --element")
+            for result in self.loadCaseResults:
+                self.appendLog("  %11s %12.3f %15.1f %10d" %
+                               (result["name"], result["sumRFo"][1]/1.e3,
+                                result["maxStress"], result["elementX"]))
+            return
+
+        self.appendLog("  -------case ---sum Fy kN ---max U2 mm --fiber U2 mm")
+        for result in self.loadCaseResults:
+            self.appendLog("  %11s %12.3f %12.3f %13.3f" %
+                           (result["name"], result["sumRFo"][1]/1.e3,
+                            result["maxU2Disp"] or 0., result["maxFiberDisp"]))
+
+    # read the eigenvalues of the buckling step from the frame descriptions,
+    # e.g. 'Mode   1: EigenValue =  12.345'; no field output is read
+    @Trace.traced
+    def readEigenvalues(self):
+        with Backend.lock:
+            step         = self.myOdb.steps[self.stepName[self.stepType]]
+            descriptions = [frame.description for frame in step.frames]
+        eigenvalues = []
+        for description in descriptions:
+            match = re.search(r"EigenValue\s*=\s*([-+0-9.eEdD]+)", description)
+            if match: eigenvalues.append(float(match.group(1).replace("D", "E").replace("d", "e")))
+        eigenvalues = np.array(eigenvalues)
+
+        if self.useCache:
+            self.appendLog("> write result cache '%s'..." % self.cacheName)
+            self.writeCache(self.cacheName, {"buckling.eigenvalues": eigenvalues},
+                            {"job"        : self.jobName,
+                             "step"       : self.stepName[self.stepType],
+                             "fingerprint": self.readFingerprint()},
+                            self.odbName)
+        return eigenvalues
+
+    # analyses of the buckling step
+    @Trace.traced
+    def analyseBucklingStep(self):
+        if self.myOdb is None: eigenvalues = self.resultCache["buckling.eigenvalues"]
+        else:                  eigenvalues = self.readEigenvalues()
+
+        self.evalEigenvalues(eigenvalues, self.totalLoad(*self.bucklingPressures()))
+        self.appendLog("%d eigenvalues: %s" %
+                       (len(eigenvalues), " ".join(["%.4f" % ev for ev in eigenvalues])))
+
+        if self.minBuckleEV is None:
+            self.appendLog("warning: no positive buckling eigenvalue found", self.ERROR)
+            return
+
+        self.appendLog("minimal positive buckling eigenvalue: %10.4f" % self.minBuckleEV)
+        self.appendLog("critical load.......................: %10.2f kN" %
+                       (self.criticalLoad/1.e3))
+
+        # antisymmetric modes are suppressed by the symmetry planes
+        if self.symmetry != self.FULL:
+            self.appendLog("warning: %s model, antisymmetric buckling modes are not found" %
+                           self.symmetryName[self.symmetry], self.ERROR)
+
+    # figure requests of the step
+    # displacement figures for SLS, stress plot for ULS
+    def figureRequests(self, state = "SLS"):
+        step     = self.stepName[self.stepType]
+        requests = []
+        if state == "SLS":
+            for var in ["U1","U3","U2"]:
+                requests.append(FigureQueue.request(self.odbName, step, self.jobName + "-" + var,
+                                                    'U', 'NODAL', ('COMPONENT', var),
+                                                    self.fontSize))
         else:
-            self.myViewport.odbDisplay.setPrimaryVariable(
-                    variableLabel='S',
-                    outputPosition=INTEGRATION_POINT,
-                    refinement=(INVARIANT, 'Mises'), )
-
-            # auto scale it
-            self.myViewport.view.fitView()
-
-            # print figure into a file
-            self.printPngFile(self.jobName + "-S")
-
-    # print a png file from a viewport
-    def printPngFile(self,name):
-        session.printOptions.setValues(vpBackground=ON)
-        session.printToFile(fileName = name,
-                            format=PNG,
-                            canvasObjects=(self.myViewport,))      
\ No newline at end of file
+            requests.append(FigureQueue.request(self.odbName, step, self.jobName + "-S",
+                                                'S', 'INTEGRATION_POINT', ('INVARIANT', 'Mises'),
+                                                self.fontSize))
+        return requests
+
+    # print the figures in the viewport or, in headless mode, put them
+    # into the queue of the rendering worker
+    @Trace.traced
+    def printFigures(self, requests):
+        if self.headless:
+            if self.figureQueue is None or not os.path.exists(self.odbName): return
+            FigureQueue(self.figureQueue).put(requests)
+            self.appendLog("> %d figures queued in '%s'." % (len(requests), self.figureQueue))
+            return
+
+        # figures need the database, results read from the cache open it now
+        if self.myOdb is None:
+            with Backend.lock:
+                found = (self.odbName in Backend.load().session.odbs.keys() or
+                         os.path.exists(self.odbName))
+            if not found:
+                self.appendLog("warning: database '%s' not found, %d figures skipped" %
+                               (self.odbName, len(requests)), self.ERROR)
+                return
+            self.loadDatabase()
+
+        renderer = FigureRenderer(self.myViewport)
+        renderer.odbs[requests[0]["odb"]] = self.myOdb
+        renderer.renderAll(requests)
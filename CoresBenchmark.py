@@ -0,0 +1,79 @@
+#=============================================================================
+# cores scaling benchmark for the Combined profile
+# runs the same model with different numbers of cpus and records the
+# wall time of pre-processing, solver and post-processing
+#=============================================================================
+
+import time
+
+from Base import Base
+from CombinedProfile import CombinedProfile
+
+# high resolution wall clock
+clock = getattr(time, "perf_counter", time.time)
+
+class CoresBenchmark(Base):
+    # constructor
+    #   parameters: input parameters of the profile, all others are taken
+    #               from InputData
+    #   cores     : numbers of cpus to run
+    #   parallel  : multiprocessing mode, DEFAULT, THREADS or MPI
+    #   csvFile   : file to write the timing table to
+    def __init__(self, parameters = None, cores = (1, 2, 4, 8), parallel = "DEFAULT",
+                 csvFile = "coresBenchmark.csv"):
+        Base.__init__(self)
+        self.parameters = dict(parameters or {})
+        self.cores      = list(cores)
+        self.parallel   = parallel
+        self.csvFile    = csvFile
+        self.results    = []
+
+    # run all core counts, always with a new model and job
+    def run(self):
+        self.results = []
+        for numCpus in self.cores:
+            profile = CombinedProfile()
+            profile.setValues(**self.parameters)
+            profile.setValues(prjName = "%s-C%d" % (profile.prjName, numCpus))
+
+            t0 = clock()
+            profile.createSystem()
+            profile.createStep(profile.LINEAR)
+            t1 = clock()
+            profile.createAndRunJob(numCpus = numCpus, parallel = self.parallel)
+            t2 = clock()
+            profile.openDatabase(profile.LINEAR)
+            profile.analyzeResults()
+            t3 = clock()
+
+            self.results.append({"cpus"    : numCpus,
+                                 "status"  : profile.jobStatus(),
+                                 "elements": len(profile.myPart.elements),
+                                 "pre"     : t1 - t0,
+                                 "solve"   : t2 - t1,
+                                 "post"    : t3 - t2,
+                                 "total"   : t3 - t0})
+        self.printSummary()
+        self.writeCsv()
+        return self.results
+
+    # print the timing table with the speedup of the solver
+    def printSummary(self):
+        self.appendLog("> cores benchmark, wall times [s]:")
+        self.appendLog("  cpus ------pre ----solve -----post ----total --speedup status")
+        solve1 = None
+        for result in self.results:
+            if solve1 is None: solve1 = result["solve"]
+            self.appendLog("  %4d %9.2f %9.2f %9.2f %9.2f %9.2f %s" %
+                           (result["cpus"], result["pre"], result["solve"], result["post"],
+                            result["total"], solve1 / max(result["solve"], 1.e-9),
+                            result["status"]))
+
+    # write the timing table
+    def writeCsv(self):
+        names = ("cpus", "elements", "pre", "solve", "post", "total", "status")
+        f = open(self.csvFile, "w")
+        f.write(";".join(names) + "\n")
+        for result in self.results:
+            f.write(";".join([str(result[name]) for name in names]) + "\n")
+        f.close()
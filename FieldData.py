@@ -0,0 +1,82 @@
+#=============================================================================
+# bulk access to the field outputs of an odb
+# the values are read block by block through bulkDataBlocks into
+# contiguous NumPy arrays instead of one FieldValue object per node
+# the blocks are copied under the kernel lock, the arrays are assembled
+# outside of it, so that the threads of a process read in parallel
+#=============================================================================
+
+import numpy as np
+
+import Trace
+import Backend
+
+# nodal field output (U, RF, ...): node labels and data, shape (n,ncomp)
+def nodalData(field):
+    labels = []
+    data   = []
+    with Backend.lock:
+        for block in field.bulkDataBlocks:
+            labels.append(np.array(block.nodeLabels, dtype=np.int64).ravel())
+            data.append(np.array(block.data, dtype=float))
+    data = [values.reshape(len(blockLabels), -1) for blockLabels, values in zip(labels, data)]
+
+    if len(labels) == 0:
+        return np.zeros(0, dtype=np.int64), np.zeros((0, 3))
+    Trace.count("fieldValues", sum([len(block) for block in labels]))
+    return np.concatenate(labels), np.concatenate(data)
+
+# element field output (S, ...): element labels, integration points,
+# section point numbers, Mises stress and data, one row per value
+def elementData(field):
+    labels  = []
+    points  = []
+    section = []
+    mises   = []
+    data    = []
+    with Backend.lock:
+        for block in field.bulkDataBlocks:
+            labels.append(np.array(block.elementLabels, dtype=np.int64).ravel())
+            data.append(np.array(block.data, dtype=float))
+
+            if block.integrationPoints is not None:
+                points.append(np.array(block.integrationPoints, dtype=np.int64).ravel())
+            else:
+                points.append(None)
+
+            number = 0
+            if block.sectionPoint is not None: number = block.sectionPoint.number
+            section.append(number)
+
+            if block.mises is not None:
+                mises.append(np.array(block.mises, dtype=float).ravel())
+            else:
+                mises.append(None)
+
+    # blocks without integration points or Mises stress
+    for i in range(len(labels)):
+        n       = len(labels[i])
+        data[i] = data[i].reshape(n, -1)
+        if points[i] is None: points[i] = np.zeros(n, dtype=np.int64)
+        if mises[i]  is None: mises[i]  = misesStress(data[i])
+        number     = section[i]
+        section[i] = np.empty(n, dtype=np.int64)
+        section[i].fill(number)
+
+    if len(labels) == 0:
+        empty = np.zeros(0, dtype=np.int64)
+        return empty, empty, empty, np.zeros(0), np.zeros((0, 0))
+    Trace.count("fieldValues", sum([len(block) for block in labels]))
+    return (np.concatenate(labels), np.concatenate(points),
+            np.concatenate(section), np.concatenate(mises), np.concatenate(data))
+
+# Mises stress of stress components (S11,S22,S33,S12,S13,S23) or
+# shell components (S11,S22,S12), one row per value
+def misesStress(s):
+    s = np.asarray(s, dtype=float)
+    if s.shape[1] == 3:
+        return np.sqrt(s[:,0]**2 - s[:,0]*s[:,1] + s[:,1]**2 + 3.*s[:,2]**2)
+
+    s = np.concatenate((s, np.zeros((len(s), 6 - s.shape[1]))), axis=1)
+    return np.sqrt(0.5*((s[:,0] - s[:,1])**2 + (s[:,1] - s[:,2])**2 + (s[:,2] - s[:,0])**2)
+                   + 3.*(s[:,3]**2 + s[:,4]**2 + s[:,5]**2))
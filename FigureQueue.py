@@ -0,0 +1,87 @@
+#=============================================================================
+# queue of figure requests
+# the numeric analysis only appends the requests to a file, a separate
+# rendering worker (FigureRenderer) prints them later or in parallel
+#
+# file layout: one JSON request per line, e.g.
+#   {"odb": "D:/.../CP3-Linear.odb", "step": "Linear", "file": "CP3-Linear-U2",
+#    "variable": "U", "position": "NODAL", "refinement": ["COMPONENT", "U2"],
+#    "fontSize": 10, "view": null}
+#=============================================================================
+
+import json
+import os
+import threading
+
+# serializes the appends of the threads of a process
+_lock = threading.Lock()
+
+class FigureQueue:
+
+    # constructor
+    #   filename: queue file, shared by all producers and the worker
+    def __init__(self, filename = "figures.queue"):
+        self.filename = filename
+
+    # create a figure request
+    #   odbName   : result database
+    #   step      : step name, the last frame is plotted
+    #   fileName  : png file without extension
+    #   variable  : field output, e.g. 'U' or 'S'
+    #   position  : output position, e.g. 'NODAL', 'INTEGRATION_POINT'
+    #   refinement: e.g. ('COMPONENT', 'U2') or ('INVARIANT', 'Mises')
+    #   fontSize  : font size of the annotations
+    #   view      : named view, e.g. 'Iso', None: fit the actual view
+    @staticmethod
+    def request(odbName, step, fileName, variable, position, refinement,
+                fontSize = 10, view = None):
+        return {"odb"       : os.path.abspath(odbName),
+                "step"      : step,
+                "file"      : os.path.abspath(fileName),
+                "variable"  : variable,
+                "position"  : position,
+                "refinement": list(refinement),
+                "fontSize"  : fontSize,
+                "view"      : view}
+
+    # append requests to the queue, one line per request
+    # the lines are written at once, so requests of several producers
+    # aren't mixed
+    def put(self, requests):
+        lines = "".join([json.dumps(request, sort_keys=True) + "\n" for request in requests])
+        _lock.acquire()
+        try:
+            f = open(self.filename, "a")
+            f.write(lines)
+            f.close()
+        finally:
+            _lock.release()
+
+    # take all queued requests, the queue is empty afterwards
+    # the queue file is renamed first, so producers can go on appending
+    # returns [] if the queue is empty or just in use
+    def take(self):
+        if not os.path.exists(self.filename): return []
+
+        workName = "%s.%d" % (self.filename, os.getpid())
+        try:
+            os.rename(self.filename, workName)
+        except OSError:
+            return []
+
+        requests = []
+        f = open(workName, "r")
+        for line in f:
+            line = line.strip()
+            if len(line) > 0: requests.append(json.loads(line))
+        f.close()
+        os.remove(workName)
+        return requests
+
+    # number of queued requests
+    def __len__(self):
+        if not os.path.exists(self.filename): return 0
+        f = open(self.filename, "r")
+        n = len([line for line in f if len(line.strip()) > 0])
+        f.close()
+        return n
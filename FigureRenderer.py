@@ -0,0 +1,110 @@
+#=============================================================================
+# rendering worker for the figure requests of a FigureQueue
+# needs the CAE kernel, e.g. abaqus cae noGUI=runFigureRenderer.py
+#=============================================================================
+
+import time
+
+from Base import Base
+import Backend                      # the CAE kernel, loaded on the first use
+from FigureQueue import FigureQueue
+
+class FigureRenderer(Base):
+    # constructor
+    #   viewport: viewport to render into, None: 'Viewport: 1'
+    def __init__(self, viewport = None):
+        Base.__init__(self)
+        if viewport is None: viewport = Backend.load().session.viewports['Viewport: 1']
+        self.myViewport = viewport
+        self.odbs       = {}        # opened databases: name -> odb
+        self.rendered   = 0         # number of printed figures
+
+    # set font size of all components
+    def setFontSize(self,size):
+        fsize = int(size*10 +0.5)
+        self.myViewport.viewportAnnotationOptions.setValues(
+            triadFont='-*-verdana-medium-r-normal-*-*-%d-*-*-p-*-*-*' % fsize,
+            legendFont='-*-verdana-medium-r-normal-*-*-%d-*-*-p-*-*-*' % fsize,
+            titleFont='-*-verdana-medium-r-normal-*-*-%d-*-*-p-*-*-*' % fsize,
+            stateFont='-*-verdana-medium-r-normal-*-*-%d-*-*-p-*-*-*' % fsize)
+
+    # database of a request, opened read only on the first use
+    def openDatabase(self, odbName):
+        if odbName not in self.odbs:
+            self.appendLog("> open database '%s'..." % odbName)
+            session = Backend.load().session
+            if odbName in session.odbs.keys(): self.odbs[odbName] = session.odbs[odbName]
+            else: self.odbs[odbName] = session.openOdb(name=odbName, readOnly=True)
+        return self.odbs[odbName]
+
+    # close all databases opened by the renderer
+    def closeDatabases(self):
+        for odb in self.odbs.values():
+            try:
+                odb.close()
+            except:
+                pass
+        self.odbs = {}
+
+    # render a figure request into a png file
+    def render(self, request):
+        abq = Backend.load()
+        odb = self.openDatabase(request["odb"])
+
+        if self.myViewport.displayedObject is not odb:
+            self.myViewport.setValues(displayedObject=odb)
+            self.myViewport.odbDisplay.display.setValues(plotState=abq.CONTOURS_ON_DEF)
+
+        # last frame of the step
+        step = odb.steps[request["step"]]
+        self.myViewport.odbDisplay.setFrame(step=step.number - 1, frame=len(step.frames) - 1)
+
+        refinement = request["refinement"]
+        self.myViewport.odbDisplay.setPrimaryVariable(
+                variableLabel=request["variable"],
+                outputPosition=Backend.constant(request["position"]),
+                refinement=(Backend.constant(refinement[0]), refinement[1]))
+
+        self.setFontSize(request.get("fontSize", 10))
+
+        # named view or auto scale
+        if request.get("view"):
+            self.myViewport.view.setValues(abq.session.views[request["view"]])
+        self.myViewport.view.fitView()
+
+        # print figure into a file
+        abq.session.printOptions.setValues(vpBackground=abq.ON)
+        abq.session.printToFile(fileName = request["file"],
+                                format=abq.PNG,
+                                canvasObjects=(self.myViewport,))
+        self.rendered += 1
+
+    # render a list of requests, failed requests are logged and skipped
+    def renderAll(self, requests):
+        for request in requests:
+            try:
+                self.render(request)
+            except Exception as e:
+                self.appendLog("warning: figure '%s' not printed: %s" % (request.get("file"), e),
+                               self.ERROR)
+
+    # process the queue until it stays empty for idleTime seconds
+    #   idleTime: 0 processes the queued requests once
+    def run(self, queue = None, pollTime = 2., idleTime = 0.):
+        if queue is None: queue = FigureQueue()
+        self.appendLog("> render the figures of queue '%s'..." % queue.filename)
+
+        idle = 0.
+        while True:
+            requests = queue.take()
+            if len(requests) > 0:
+                self.renderAll(requests)
+                idle = 0.
+                continue
+            if idle >= idleTime: break
+            time.sleep(pollTime)
+            idle += pollTime
+
+        self.closeDatabases()
+        self.appendLog("> %d figures printed." % self.rendered)
+        return self.rendered
@@ -0,0 +1,252 @@
+#=============================================================================
+# input file writer for the Combined profile
+# writes nodes, S4R elements, sections, BC node sets, pressure surfaces and
+# the linear static step directly from the InputData parameters, without
+# the CAE kernel; the solver can be started on the written file
+#=============================================================================
+
+import subprocess
+
+import numpy as np
+
+from Base import Base
+from ShellMesh import ShellMesh
+
+class InpWriter(Base):
+
+    # command to start the solver
+    abaqusCommand = "abaqus"
+
+    # constructor
+    #   data: InputData (or CombinedProfile) with the parameters
+    def __init__(self, data):
+        Base.__init__(self)
+        self.data    = data
+        self.jobName = data.prjName + "-" + data.stepName[data.LINEAR]
+        self.inpName = self.jobName + ".inp"
+        self.mesh    = None
+
+    # cross section segments of the model:
+    # (point1, point2, seeds, section, flags), flags: 'support' (supported
+    # line at the ends), 'outer'/'inner' (loaded upper flanges)
+    def segments(self):
+        d = self.data
+        P = [ (-d.x1_I, d.y1_I), # node 1
+              (-d.x2_I, d.y1_I), # node 2
+              (-d.x3_I, d.y1_I), # node 3
+              (-d.x1_I,0),       # node 4
+              (-d.x2_I,0),       # node 5
+              (-d.x3_I,0),       # node 6
+              (0,d.y1_T),        # node 7
+              (0,d.y2_T),        # node 8
+              (0,d.y3_T),        # node 9
+              (0,d.y1_T),        # node 10
+              (0,d.y2_T),        # node 11
+              (0,d.y3_T),        # node 12
+              ( d.x3_I,d.y1_I),  # node 13
+              ( d.x2_I,d.y1_I),  # node 14
+              ( d.x1_I,d.y1_I),  # node 15
+              ( d.x3_I,0),       # node 16
+              ( d.x2_I,0),       # node 17
+              ( d.x1_I,0)]       # node 18
+
+        flange = "I-Section-Flange"
+        web    = "I-Section-Web"
+        tee    = "T-Section"
+        teeSym = "T-Section"
+        if d.symmetry != d.FULL: teeSym = "T-Section-Sym"
+
+        # same lines as the sketch of CombinedProfile
+        lines = [(P[0] , P[1] , d.iFSeed, flange, ("support", "outer")),
+                 (P[2] , P[1] , d.iFSeed, flange, ("support", "inner")),
+                 (P[7] , P[2] , d.tWSeed, tee,    ("support",)),
+                 (P[7] , P[12], d.tWSeed, tee,    ("support",)),
+                 (P[12], P[13], d.iFSeed, flange, ("support", "inner")),
+                 (P[13], P[14], d.iFSeed, flange, ("support", "outer")),
+                 (P[1] , P[4] , d.iWSeed, web,    ()),
+                 (P[6] , P[7] , d.tFSeed, teeSym, ()),
+                 (P[7] , P[8] , d.tFSeed, teeSym, ()),
+                 (P[13], P[16], d.iWSeed, web,    ()),
+                 (P[17], P[16], d.iFSeed, flange, ()),
+                 (P[16], P[15], d.iFSeed, flange, ()),
+                 (P[15], P[5] , d.cFSeedModel, flange, ()),
+                 (P[5] , P[4] , d.iFSeed, flange, ()),
+                 (P[4] , P[3] , d.iFSeed, flange, ())]
+
+        if d.symmetry == d.FULL: return lines
+
+        # half and quarter models: clip the lines at x = 0
+        result = []
+        for point1, point2, seeds, section, flags in lines:
+            (x1, y1), (x2, y2) = point1, point2
+            if x1 > 0. and x2 > 0.: continue
+            if x1 > 0. or x2 > 0.:
+                y0 = y1 + (y2 - y1) * (0. - x1) / (x2 - x1)
+                if x1 > 0.: point1 = (0., y0)
+                else:       point2 = (0., y0)
+                if point1 == point2: continue
+            result.append((point1, point2, seeds, section, flags))
+        return result
+
+    # create the mesh
+    #   divisions: elements along the length, None: lengthSeed
+    def createMesh(self, divisions = None):
+        d = self.data
+        if divisions is None: divisions = d.lengthSeed
+        self.mesh = ShellMesh(d.lm, divisions)
+        self.supportPoints = []
+        for point1, point2, seeds, section, flags in self.segments():
+            sets = [section]
+            for region in ("outer", "inner"):
+                if region not in flags: continue
+                # normal (dy,-dx): the upper side is SPOS for dx < 0
+                side = "SPOS"
+                if point2[0] - point1[0] > 0.: side = "SNEG"
+                sets.append("LOAD-%s-%s" % (region.upper(), side))
+            segment = self.mesh.addSegment(point1, point2, seeds, sets)
+            if "support" in flags:
+                self.supportPoints.extend(self.mesh.segmentPoints(segment).tolist())
+        self.mesh.build()
+
+        self.appendLog(">  %4d elements created." % len(self.mesh.elements))
+        self.appendLog(">  %4d nodes created." % len(self.mesh.nodes))
+        return self.mesh
+
+    # node sets: name -> node labels
+    def nodeSets(self):
+        d    = self.data
+        mesh = self.mesh
+        nz   = mesh.divisions
+
+        # supported lines at z = 0 and z = l (a quarter model ends at l/2)
+        ends = [0, nz]
+        zr   = nz
+        if d.symmetry == d.QUARTER:
+            ends = [0]
+            zr   = 0
+
+        sets = {"SUPPORTS": mesh.nodeLabels(np.unique(self.supportPoints), ends),
+                "RIGID"   : mesh.nodeLabels(mesh.findPoints(-d.x1_I, d.y1_I), [zr]),
+                "FIBER"   : mesh.nodeLabels(mesh.findPoints(-d.x1_I, 0.))}
+
+        if d.symmetry != d.FULL:
+            points = np.array(mesh.points)
+            sets["XSYMM"] = mesh.nodeLabels(np.where(np.abs(points[:,0]) <= mesh.tol)[0])
+        if d.symmetry == d.QUARTER:
+            sets["ZSYMM"] = mesh.nodeLabels(np.arange(len(mesh.points)), [nz])
+        return sets
+
+    # write the input file, returns its name
+    def write(self, filename = None):
+        if filename is not None: self.inpName = filename
+        self.appendLog("> write input file '%s'..." % self.inpName)
+
+        d = self.data
+        if self.mesh is None: self.createMesh()
+        mesh = self.mesh
+
+        f = open(self.inpName, "w")
+        f.write("*Heading\n")
+        f.write("%s %s model, linear static step\n" % (d.prjName, d.symmetryName[d.symmetry]))
+        f.write("*Preprint, echo=NO, model=NO, history=NO, contact=NO\n")
+
+        # mesh
+        f.write("*Node\n")
+        labels = np.arange(1, len(mesh.nodes) + 1)
+        np.savetxt(f, np.column_stack((labels, mesh.nodes)), fmt="%d, %.8g, %.8g, %.8g")
+        f.write("*Element, type=S4R\n")
+        labels = np.arange(1, len(mesh.elements) + 1)
+        np.savetxt(f, np.column_stack((labels, mesh.elements)), fmt="%d, %d, %d, %d, %d")
+
+        for name in sorted(mesh.elementSets):
+            self.writeSet(f, "*Elset, elset=%s" % name.upper(), mesh.elementSets[name])
+        nodeSets = self.nodeSets()
+        for name in sorted(nodeSets):
+            self.writeSet(f, "*Nset, nset=%s" % name, nodeSets[name])
+
+        # pressure surfaces
+        for region in ("OUTER", "INNER"):
+            f.write("*Surface, type=ELEMENT, name=LOAD-%s\n" % region)
+            for side in ("SPOS", "SNEG"):
+                name = "LOAD-%s-%s" % (region, side)
+                if name in mesh.elementSets: f.write("%s, %s\n" % (name, side))
+
+        # material and sections
+        f.write("*Material, name=%s\n" % d.matName)
+        f.write("*Elastic\n%.8g, %.8g\n" % (d.EMod, d.nue))
+        f.write("*Density\n%.8g,\n" % d.rho)
+        thickness = {"I-Section-Flange": d.dt1,
+                     "I-Section-Web"   : d.ds1,
+                     "T-Section"       : d.dt2,
+                     "T-Section-Sym"   : d.dt2/2.}
+        for name in sorted(thickness):
+            if name not in mesh.elementSets: continue
+            f.write("** Section: %s-%s\n" % (d.prjName, name))
+            f.write("*Shell Section, elset=%s, material=%s\n" % (name.upper(), d.matName))
+            f.write("%.8g, 5\n" % thickness[name])
+
+        # linear static step, load cases in a perturbation step
+        if len(d.loadCases) == 0:
+            f.write("*Step, name=%s, nlgeom=NO\n" % d.stepName[d.LINEAR])
+            f.write("*Static\n")
+            self.writeBoundaries(f, nodeSets)
+            self.writeLoads(f, d.p1, d.p1)
+        else:
+            f.write("*Step, name=%s, perturbation\n" % d.stepName[d.LINEAR])
+            f.write("*Static\n")
+            for name, outer, inner in d.loadCaseList():
+                f.write("*Load Case, name=%s\n" % name)
+                self.writeBoundaries(f, nodeSets)
+                self.writeLoads(f, outer, inner)
+                f.write("*End Load Case\n")
+        f.write("*Output, field\n")
+        if d.fullOutput:
+            f.write("*Node Output\nU, RF\n")
+            f.write("*Element Output, directions=YES\nS\n")
+        else:
+            # only the fields and sets the analysis reads
+            f.write("*Node Output\nU\n")
+            f.write("*Node Output, nset=SUPPORTS\nRF\n")
+            if d.stressOutput or d.limitState == "ULS":
+                f.write("*Element Output, directions=YES\nS\n")
+        f.write("*End Step\n")
+        f.close()
+
+        return self.inpName
+
+    # boundary conditions of the step or a load case
+    def writeBoundaries(self, f, nodeSets):
+        f.write("*Boundary\n")
+        f.write("SUPPORTS, 1, 6, 0.\n")
+        f.write("RIGID, 1, 1, 0.\nRIGID, 3, 3, 0.\nRIGID, 5, 5, 0.\n")
+        if "XSYMM" in nodeSets: f.write("XSYMM, XSYMM\n")
+        if "ZSYMM" in nodeSets: f.write("ZSYMM, ZSYMM\n")
+
+    # pressure loads of the step or a load case
+    #   outer, inner: pressures of the outer and inner flange halves
+    def writeLoads(self, f, outer, inner):
+        f.write("*Dsload\n")
+        f.write("LOAD-OUTER, P, %.8g\n" % outer)
+        f.write("LOAD-INNER, P, %.8g\n" % inner)
+
+    # write a set with 16 labels per line
+    def writeSet(self, f, keyword, labels):
+        labels = np.asarray(labels, dtype=np.int64)
+        f.write(keyword + "\n")
+        full = len(labels) // 16 * 16
+        if full > 0:
+            np.savetxt(f, labels[:full].reshape(-1, 16), fmt="%d", delimiter=", ")
+        if full < len(labels):
+            f.write(", ".join([str(label) for label in labels[full:]]) + "\n")
+
+    # command to run the solver on the input file
+    def command(self, cpus = None):
+        if cpus is None: cpus = self.data.numCpus
+        return [InpWriter.abaqusCommand, "job=" + self.jobName, "input=" + self.inpName,
+                "cpus=%d" % cpus, "interactive"]
+
+    # write the input file and run the solver, returns the exit code
+    def run(self, cpus = None):
+        self.write()
+        self.appendLog("> run job '%s'..." % self.jobName)
+        return subprocess.call(self.command(cpus))
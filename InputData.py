@@ -4,11 +4,30 @@
 # ==============================================================================
 
 from Base import Base
+import copy
+import csv
+import hashlib
+import json
+import numpy as np
 from math import sin
 from math import cos
 from math import radians as rad
 
 class InputData(Base):
+
+    # input parameters which define the results of a job
+    PARAMETERS = (("geometry", ("dh1", "dw1", "dt1", "ds1", "dh2", "dw2", "dt2", "ds2", "l", "symmetry")),
+                  ("material", ("matName", "EMod", "nue", "rho")),
+                  ("seeds",    ("maxElement", "iFSeed", "iWSeed", "tFSeed", "tWSeed", "cFSeed")),
+                  ("load",     ("load", "loadCases")),
+                  ("step",     ("stepType", "eigenSolver", "numEigen", "fullOutput", "stressOutput",
+                                "limitState")))
+
+    # numeric input parameters of the profile definitions
+    INTEGERS = ("maxElement", "iFSeed", "iWSeed", "tFSeed", "tWSeed", "cFSeed", "symmetry")
+    FLOATS   = ("dh1", "dw1", "dt1", "ds1", "dh2", "dw2", "dt2", "ds2", "l",
+                "EMod", "nue", "rho", "load")
+
     # constructor
     def __init__(self):
         # uncomment the required combined profile(CP) here.
@@ -39,6 +58,13 @@ class InputData(Base):
         self.rho     = 7.8e-5  			    # density [N/mm^3]
         self.load    = 43.0  				# load in [kN]
 
+        # load cases, solved in one linear perturbation step; a case has
+        # a name and either a total load [kN], e.g. {"name": "LC1", "load": 60.},
+        # or the pressures [N/mm^2] of the outer and inner flange halves,
+        # e.g. {"name": "LC2", "outer": 0.05, "inner": 0.}
+        # no load cases: one static step with the load above
+        self.loadCases = []
+
         # model parameters
         # set mesh seed
         self.maxElement = int(1000)		    # maximum allowed elements in Abaqus student version
@@ -48,82 +74,359 @@ class InputData(Base):
         self.tWSeed     = int(2)            # no of seeds on I-Web
         self.cFSeed     = int(4)			# no of seeds on Connecting flange
 
-        # no of seed along the length  
-        self.lengthSeed = self.maxElement/(8*self.iFSeed+2*self.iWSeed+2*self.tFSeed+2*self.tWSeed+2*self.cFSeed)
+        # symmetry of the model
+        self.FULL     = 0   # full model
+        self.HALF     = 1   # half model, symmetry plane x = 0
+        self.QUARTER  = 2   # quarter model, symmetry planes x = 0 and z = l/2
+        self.symmetryName = ("full", "half", "quarter")
+        self.symmetry = self.FULL
 
         # step parameters
         self.LINEAR   = 0   # linear static calculation
         self.BUCKLING = 1   # stability analysis
         self.stepName = ("Linear", "Buckling")
-        self.jobnames = (self.prjName + "-Linear", self.prjName + "-Buckling")
         self.stepType = self.LINEAR
+        self.useCache = True    # read the results from a valid result cache
+
+        # buckling step parameters
+        self.eigenSolver = "LANCZOS"        # eigensolver: LANCZOS or SUBSPACE
+        self.numEigen    = 1                # no of requested eigenvalues
+        self.maxEigen    = 16               # maximum no of eigenvalues (subspace)
+
+        # job parameters (solver parallelism and memory)
+        self.numCpus     = 1                # no of cpus
+        self.numDomains  = None             # no of domains, None: numCpus
+        self.parallel    = "DEFAULT"        # multiprocessing mode: DEFAULT, THREADS or MPI
+        self.memory      = 90               # memory limit
+        self.memoryUnits = "PERCENTAGE"     # PERCENTAGE, MEGA_BYTES or GIGA_BYTES
+
+        # output parameters
+        self.headless    = False            # no viewport work, figures are queued
+        self.figureQueue = "figures.queue"  # queue of the figure requests in headless mode,
+                                            # None: no figures
+        self.fontSize    = 10               # font size of the figures
+        self.fullOutput  = False            # default field output of all nodes and elements,
+                                            # False: only the fields and sets the analysis reads
+        self.stressOutput= False            # S in the field output (Mises stress),
+                                            # always written for the ULS proof
+        self.limitState  = "SLS"            # proof of the linear step: SLS (displacements)
+                                            # or ULS (Mises stress envelope)
+        self.numCritical = 10               # no of critical elements of the ULS proof
+
+        self.Check()        # check for possible geometrical errors
+        self.calcHelpers()  # calculate helper variables
+
+    # the log records are tagged with the job (or the profile) name
+    def logTag(self):
+        return getattr(self, "jobName", None) or getattr(self, "prjName", "")
+
+    # set some input parameters and update the helper variables
+    # e.g. setValues(prjName="CP2", dh2=70, dw2=70, dt2=8, ds2=8)
+    def setValues(self, **values):
+        for name in values:
+            if not hasattr(self, name):
+                raise Exception("error: Unknown input parameter", name)
+            setattr(self, name, values[name])
 
         self.Check()        # check for possible geometrical errors
         self.calcHelpers()  # calculate helper variables
 
-    # load the input data from a file
-    def Load(self, filename):
-        # calculate helper variables
-        self.calcHelpers()
+    # input parameters and their values, without the helper variables,
+    # e.g. the defaults of a new profile: InputData().inputValues()
+    def inputValues(self):
+        skip = set(self.helpers(vars(self))) | set(("jobnames", "instanceId", "logFile"))
+        return dict((name, copy.deepcopy(value)) for name, value in vars(self).items()
+                    if name not in skip)
+
+    # fingerprint of the input parameters, optionally of some groups only
+    # equal numbers give equal fingerprints, e.g. 120 and 120.0
+    def fingerprint(self, groups = None):
+        sha = hashlib.sha1()
+        for group, names in InputData.PARAMETERS:
+            if groups is not None and group not in groups: continue
+            for name in names:
+                value = getattr(self, name)
+                if isinstance(value, (int, float)) and not isinstance(value, bool):
+                    value = float(value)
+                elif isinstance(value, (list, tuple, dict)):
+                    value = json.dumps(value, sort_keys=True)
+                sha.update(("%s=%r;" % (name, value)).encode("utf-8"))
+        return sha.hexdigest()
+
+    # factors to map the reaction sums of the model to the full model
+    # the symmetric model has no resulting x force (and no z force for a
+    # quarter model), the other sums are multiplied by the number of parts
+    def symmetryFactor(self):
+        if   self.symmetry == self.HALF:    return (0., 2., 2.)
+        elif self.symmetry == self.QUARTER: return (0., 4., 0.)
+        return (1., 1., 1.)
+
+    # use the seeds recorded for a profile family, e.g. by a mesh
+    # convergence study
+    def applySeeds(self, filename, key):
+        f = open(filename, "r")
+        seeds = json.load(f)
+        f.close()
+
+        if key not in seeds:
+            raise Exception("error: No seeds recorded for", key, filename)
+        names = ("maxElement", "iFSeed", "iWSeed", "tFSeed", "tWSeed", "cFSeed")
+        self.setValues(**dict((name, int(seeds[key][name])) for name in names))
+
+    # pressure on the upper flanges of a total load [kN]
+    def pressure(self, load):
+        return load * 1.e3 / (self.l * (2 * (self.dw1 + self.dh2)))
+
+    # load cases as (name, outer pressure, inner pressure), one case with
+    # the pressure p1 if no load cases are defined
+    def loadCaseList(self):
+        if len(self.loadCases) == 0: return [("Load", self.p1, self.p1)]
+
+        result = []
+        for case in self.loadCases:
+            if "load" in case:
+                p = self.pressure(case["load"])
+                result.append((case["name"], p, p))
+            else:
+                result.append((case["name"], case.get("outer", 0.), case.get("inner", 0.)))
+        return result
+
+    # outer and inner pressure of the buckling step: the load case with
+    # the largest total load, p1 if no load cases are defined
+    def bucklingPressures(self):
+        return max(self.loadCaseList(), key=lambda case: case[1] + case[2])[1:]
+
+    # total load of the outer and inner pressures [N], the pressures act
+    # on the flange halves of width dw1 (BeamTheory: sumRFy for p1, p1)
+    def totalLoad(self, outer, inner):
+        return (outer + inner) * self.dw1 * self.l
+
+    # read the profile definitions of a CSV or JSON file, one dict per
+    # profile with the values converted to the parameter types
+    # CSV: header with the parameter names, ';' or ',' separated
+    # JSON: list of objects, JSON lines or an object of columns
+    @staticmethod
+    def readProfiles(filename):
+        if filename.lower().endswith(".csv"):
+            f = open(filename, "r")
+            dialect = csv.Sniffer().sniff(f.readline(), delimiters=";,")
+            f.seek(0)
+            for row in csv.DictReader(f, dialect=dialect):
+                yield InputData.convertRow(row)
+            f.close()
+            return
+
+        f = open(filename, "r")
+        text = f.read()
+        f.close()
+        try:
+            data = json.loads(text)
+        except ValueError:
+            data = [json.loads(line) for line in text.splitlines() if len(line.strip()) > 0]
+
+        if isinstance(data, dict):
+            names = sorted(data)
+            data  = [dict(zip(names, values)) for values in zip(*[data[name] for name in names])]
+        for row in data:
+            yield InputData.convertRow(row)
+
+    # convert the values of a row to the parameter types
+    @staticmethod
+    def convertRow(row):
+        values = {}
+        for name in row:
+            value = row[name]
+            if name is None or value is None or value == "": continue
+            name = name.strip()
+            if name in InputData.INTEGERS:  value = int(float(value))
+            elif name in InputData.FLOATS:  value = float(value)
+            elif name == "loadCases" and not isinstance(value, list): value = json.loads(value)
+            values[name] = value
+        return values
+
+    # read the profile definitions of a file as columns, the numeric
+    # columns as float arrays
+    @staticmethod
+    def readColumns(filename):
+        if filename.lower().endswith(".csv"):
+            # column-wise, without a dict per row
+            f = open(filename, "r")
+            dialect = csv.Sniffer().sniff(f.readline(), delimiters=";,")
+            f.seek(0)
+            rows = list(csv.reader(f, dialect=dialect))
+            f.close()
+            columns = {}
+            for values in zip(*rows):
+                name   = values[0].strip()
+                values = list(values[1:])
+                if name in InputData.INTEGERS or name in InputData.FLOATS:
+                    values = np.array([value or "nan" for value in values], dtype=float)
+                elif name == "loadCases":
+                    values = [json.loads(value) if value else None for value in values]
+                columns[name] = values
+            return columns
+
+        rows    = list(InputData.readProfiles(filename))
+        names   = sorted(set([name for row in rows for name in row]))
+        columns = {}
+        for name in names:
+            values = [row.get(name) for row in rows]
+            if name in InputData.INTEGERS or name in InputData.FLOATS:
+                values = np.array([np.nan if value is None else value for value in values], dtype=float)
+            columns[name] = values
+        return columns
+
+    # load the input data of a profile from a CSV or JSON file
+    #   profile: row number or prjName of the profile
+    def Load(self, filename, profile = 0):
+        for i, row in enumerate(InputData.readProfiles(filename)):
+            if profile == i or profile == row.get("prjName"):
+                self.setValues(**row)   # checks and calculates the helper variables
+                return
+        raise Exception("error: Profile not found", profile, filename)
+
+    # checks of the input data as (section, condition, message, names)
+    # the conditions work on numbers and on arrays
+    CHECKS = (("T", lambda v: v["dh2"] < 0.1, "Invalid flange length for T section", ("dh2",)),
+              ("T", lambda v: v["ds2"] < 0.1, "Invalid web length for T section", ("ds2",)),
+              ("T", lambda v: v["dw2"] < 0.1, "Invalid flange breath for T section", ("dw2",)),
+              ("T", lambda v: v["dt2"] < 0.1,
+               "Geometric parameters must be non-negative - invalid T section thickness : %8.4f", ("dt2",)),
+              ("T", lambda v: v["dt2"] > v["dh2"],
+               "Flange length must be greater than T section thickness", ("dt2", "dh2")),
+              ("T", lambda v: v["dt2"] > v["ds2"],
+               "Web length must be greater than T section thickness", ("dt2", "ds2")),
+              ("I", lambda v: v["dh1"] < 0.1, "Invalid flange length for I section", ("dh1",)),
+              ("I", lambda v: v["ds1"] < 0.1, "Invalid web length for I section", ("ds1",)),
+              ("I", lambda v: v["dw1"] < 0.1, "Invalid flange breath for I section", ("dw1",)),
+              ("I", lambda v: v["dt1"] < 0.1,
+               "Geometric parameters must be non-negative - invalid I section thickness : %8.4f", ("dt1",)),
+              ("I", lambda v: v["dh1"] < 2*v["dt1"],
+               "Flange length must be greater than I section thickness", ("dt1", "dh1")),
+              ("I", lambda v: v["ds1"] > v["dt1"],
+               "Web length must be greater than I section thickness", ("dt1", "ds1")))
 
     # check the input data
     def Check(self):
-        dmin = 0.1  # minimum length
-        if self.dh2 < dmin:
-            raise Exception("error: Invalid flange length for T section", self.dh2)
-        elif self.ds2 < dmin:
-            raise Exception("error: Invalid web length for T section", self.ds2)
-        elif self.dw2 < dmin:
-            raise Exception("error: Invalid flange breath for T section", self.dw2)
-        elif (self.dt2 < dmin):
-            raise Exception("error: Geometric parameters must be non-negative - invalid T section thickness : %8.4f",
-                            self.dt2)
-        elif (self.dt2 > self.dh2):
-            raise Exception("error: Flange length must be greater than T section thickness", self.dt2, self.dh2)
-        elif (self.dt2 > self.ds2):
-            raise Exception("error: Web length must be greater than T section thickness", self.dt2, self.ds2)
-        else:
-            print"--------------error check on T-section successful:::::no errors found-----------------"
-        if self.dh1 < dmin:
-            raise Exception("error: Invalid flange length for I section", self.dh1)
-        elif self.ds1 < dmin:
-            raise Exception("error: Invalid web length for I section", self.ds1)
-        elif self.dw1 < dmin:
-            raise Exception("error: Invalid flange breath for I section", self.dw1)
-        elif (self.dt1 < dmin):
-            raise Exception("error: Geometric parameters must be non-negative - invalid I section thickness : %8.4f",
-                            self.dt1)
-        elif (self.dh1 < 2*self.dt1):
-            raise Exception("error: Flange length must be greater than I section thickness", self.dt1, self.dh1)
-        elif (self.ds1 > self.dt1):
-            raise Exception("error: Web length must be greater than I section thickness", self.dt1, self.ds1)
-        else:
-            print"--------------error check on I-section successful:::::no errors found-----------------"
+        values = vars(self)
+        for section in ("T", "I"):
+            for checkSection, condition, message, names in InputData.CHECKS:
+                if checkSection != section or not condition(values): continue
+                self.checkFailed(*(["error: " + message] + [values[name] for name in names]))
+
+        names = []
+        for case in self.loadCases:
+            if "name" not in case:
+                self.checkFailed("error: Load case without name", case)
+            elif case["name"] in names:
+                self.checkFailed("error: Load case defined twice", case["name"])
+            elif "load" not in case and "outer" not in case and "inner" not in case:
+                self.checkFailed("error: Load case without load or pressures", case["name"])
+            names.append(case["name"])
+
+    # log a failed input check as warning and raise its error
+    # args: message, which may hold the formats of the values, and values
+    def checkFailed(self, *args):
+        try:
+            text = args[0] % args[1:]
+        except TypeError:
+            text = " ".join([str(arg) for arg in args])
+        self.appendLog("warning: input check failed: %s" % text, self.WARNING)
+        raise Exception(*args)
+
+    # check many profiles at once
+    #   columns: parameter name -> array, one value per profile
+    # returns the validity mask and the reasons of the invalid profiles
+    # ('' for valid profiles)
+    def checkBatch(self, columns):
+        v       = self.batchValues(columns)
+        n       = len(v["dh1"])
+        mask    = np.ones(n, dtype=bool)
+        reasons = [[] for i in range(n)]
+
+        # blank cells are NaN, which passes every comparison of the rules
+        for name in InputData.INTEGERS + InputData.FLOATS:
+            missing = np.isnan(v[name]) & np.ones(n, dtype=bool)
+            mask   &= ~missing
+            for row in np.nonzero(missing)[0].tolist():
+                reasons[row].append("missing value: %s" % name)
+
+        for section, condition, message, names in InputData.CHECKS:
+            failed = condition(v) & np.ones(n, dtype=bool)
+            mask  &= ~failed
+            for row in np.nonzero(failed)[0].tolist():
+                reasons[row].append(message.split(" :")[0])
+        return mask, ["; ".join(reason) for reason in reasons]
+
+    # check many profiles and calculate their helper variables
+    #   columns: parameter name -> values, missing parameters are taken
+    #            from this object
+    # returns the columns with the helper variables, the validity mask and
+    # the reasons of the invalid profiles
+    def prepareBatch(self, columns):
+        v = self.batchValues(columns)
+        mask, reasons = self.checkBatch(v)
+        v.update(self.helpers(v))
+        return v, mask, reasons
+
+    # numeric parameters as arrays of the same length, missing parameters
+    # are taken from this object
+    def batchValues(self, columns):
+        n = max([len(columns[name]) for name in columns] + [0])
+        v = dict(columns)
+        for name in InputData.INTEGERS + InputData.FLOATS:
+            if name in columns: v[name] = np.asarray(columns[name], dtype=float)
+            else:               v[name] = np.empty(n); v[name].fill(getattr(self, name))
+        return v
+
+    # helper variables of the parameters v (a dict of numbers or arrays)
+    def helpers(self, v):
+        h = {}
+
+        # no of seed along the length
+        # a half or quarter model has half the elements in the cross section
+        # and a quarter model half the length, so the resolution is higher
+        sectionSeeds     = 8*v["iFSeed"]+2*v["iWSeed"]+2*v["tFSeed"]+2*v["tWSeed"]+2*v["cFSeed"]
+        symmetric        = np.not_equal(v["symmetry"], self.FULL)
+        sectionSeeds     = np.where(symmetric, (sectionSeeds + 1)//2, sectionSeeds)
+        h["cFSeedModel"] = np.where(symmetric, np.maximum(1, (v["cFSeed"] + 1)//2), v["cFSeed"])
+        h["lengthSeed"]  = v["maxElement"]//sectionSeeds
+
+        # modelled length
+        h["lm"] = np.where(np.equal(v["symmetry"], self.QUARTER), v["l"]/2., v["l"])
 
-    # calculate helper variables
-    def calcHelpers(self):
         # helper variables to locate the nodes
-        self.x1_I = self.dh2 + self.dw1
-        self.x2_I = self.dh2 + (self.dw1 / 2.)
-        self.x3_I = self.dh2
-        self.y1_I = self.dh1 - self.dt1
-        self.x1_T = 0.
-        self.y1_T = self.dh1 - self.dt1 + (self.dw2 / 2.)
-        self.y2_T = self.dh1 - self.dt1
-        self.y3_T = self.dh1 - self.dt1 - (self.dw2 / 2.)
+        h["x1_I"] = v["dh2"] + v["dw1"]
+        h["x2_I"] = v["dh2"] + (v["dw1"] / 2.)
+        h["x3_I"] = v["dh2"]
+        h["y1_I"] = v["dh1"] - v["dt1"]
+        h["x1_T"] = 0.
+        h["y1_T"] = v["dh1"] - v["dt1"] + (v["dw2"] / 2.)
+        h["y2_T"] = v["dh1"] - v["dt1"]
+        h["y3_T"] = v["dh1"] - v["dt1"] - (v["dw2"] / 2.)
 
         # helper variables to locate the midpoints between nodes
-        self.ix1 =  (self.x1_I+self.x2_I)/2.
-        self.ix2 =  (self.x2_I+self.x3_I)/2.
-        self.ix3 =   self.x2_I
-        self.iy1 =   self.y1_I
-        self.iy2 =   self.y1_I/2.
-        self.tx1 =  (self.x3_I+self.x1_T)/2.
-        self.tx2 =   self.x1_T
-        self.ty1 =  (self.y1_T+self.y2_T)/2.
-        self.ty2 =   self.y2_T
-        self.ty3 =  (self.y2_T+self.y3_T)/2.
-        self.mz1 =   self.l/2.
-        
+        h["ix1"] =  (h["x1_I"]+h["x2_I"])/2.
+        h["ix2"] =  (h["x2_I"]+h["x3_I"])/2.
+        h["ix3"] =   h["x2_I"]
+        h["iy1"] =   h["y1_I"]
+        h["iy2"] =   h["y1_I"]/2.
+        h["tx1"] =  (h["x3_I"]+h["x1_T"])/2.
+        h["tx2"] =   h["x1_T"]
+        h["ty1"] =  (h["y1_T"]+h["y2_T"])/2.
+        h["ty2"] =   h["y2_T"]
+        h["ty3"] =  (h["y2_T"]+h["y3_T"])/2.
+        h["mz1"] =   h["lm"]/2.
+
         # helper variables to calculate the load
-        self.p1   = self.load * 1.e3 / (self.l * (2 * (self.dw1 + self.dh2)))  # pressure
+        h["p1"]  = v["load"] * 1.e3 / (v["l"] * (2 * (v["dw1"] + v["dh2"])))  # pressure
+        return h
+
+    # calculate helper variables
+    def calcHelpers(self):
+        # job names of the steps
+        self.jobnames = (self.prjName + "-Linear", self.prjName + "-Buckling")
+
+        for name, value in self.helpers(vars(self)).items():
+            if isinstance(value, (np.ndarray, np.generic)): value = value.item()
+            setattr(self, name, value)
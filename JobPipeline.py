@@ -0,0 +1,254 @@
+#=============================================================================
+# asyncio job pipeline for the Combined profile (Python 3 kernels only)
+# a submitted job is an awaitable JobHandle, the solver runs in its own
+# process while the kernel builds the next model and analyses the
+# previous results; the jobs are followed by polling the job status and
+# the .sta/.lck files, the increments of the .sta file are a progress
+# stream:
+#   handle = JobPipeline.submit(profile)
+#   async for progress in handle.progress(): print(progress["increment"])
+#   status = await handle
+#=============================================================================
+
+import asyncio
+import os
+
+from Base import Base
+from CombinedProfile import CombinedProfile
+from ProfileSweep import ProfileSweep
+import Trace
+
+# awaitable handle of a submitted job, the result is the job status
+class JobHandle:
+    # constructor
+    #   profile : CombinedProfile with the submitted job
+    #   pollTime: time between two status checks [s]
+    def __init__(self, profile, pollTime = 1.):
+        self.profile  = profile
+        self.jobName  = profile.jobName
+        self.pollTime = pollTime
+        self.start    = Trace.clock()
+        self.status   = "SUBMITTED"
+        self.offset   = 0           # read position in the .sta file
+        self.last     = None        # last progress record
+        self.task     = asyncio.ensure_future(self.wait())
+
+    def __await__(self):
+        return self.task.__await__()
+
+    def done(self):
+        return self.task.done()
+
+    # wait for the solver, the job is checked with finishJob at the end
+    async def wait(self):
+        with Trace.Span("waitForCompletion", profile=self.profile.prjName):
+            while not self.profile.jobFinished():
+                await asyncio.sleep(self.pollTime)
+        self.status = self.profile.finishJob()
+        return self.status
+
+    # stream of the progress records until the job has finished
+    # record: {"step", "increment", "attempt", "totalTime", "stepTime",
+    #          "timeIncrement", "elapsed", "remaining", "running"}
+    # remaining: estimated time to the end of the step [s], None if unknown
+    async def progress(self):
+        while True:
+            finished = self.done()
+            for record in self.readStatusFile():
+                yield record
+            if finished: return
+            await asyncio.sleep(self.pollTime)
+
+    # new increments of the .sta file
+    def readStatusFile(self):
+        try:
+            f = open(self.jobName + ".sta", "r")
+            f.seek(self.offset)
+            text = f.read()
+            self.offset = f.tell()
+            f.close()
+        except IOError:
+            return []
+
+        records = []
+        for line in text.splitlines():
+            record = self.parseIncrement(line)
+            if record is not None:
+                records.append(record)
+                self.last = record
+        return records
+
+    # progress record of an increment line of the .sta file, e.g.
+    #   STEP  INC ATT SEVERE EQUIL TOTAL  TOTAL      STEP       INC OF
+    #      1    3   1U    0     4     4  0.250      0.250      0.1250
+    def parseIncrement(self, line):
+        items = line.split()
+        if len(items) < 9: return None
+        try:
+            step, increment = int(items[0]), int(items[1])
+            totalTime, stepTime, timeIncrement = float(items[6]), float(items[7]), float(items[8])
+        except ValueError:
+            return None
+
+        # the step time runs to the step period, 1 by default
+        elapsed   = Trace.clock() - self.start
+        remaining = None
+        if 0. < stepTime <= 1.: remaining = elapsed * (1. - stepTime) / stepTime
+        return {"job"          : self.jobName,
+                "step"         : step,
+                "increment"    : increment,
+                "attempt"      : items[2],
+                "totalTime"    : totalTime,
+                "stepTime"     : stepTime,
+                "timeIncrement": timeIncrement,
+                "elapsed"      : elapsed,
+                "remaining"    : remaining,
+                "running"      : os.path.exists(self.jobName + ".lck")}
+
+# pipeline over several profiles: while a job solves, the kernel builds
+# the next model and analyses the results of the previous job
+class JobPipeline(Base):
+    # constructor
+    #   parameters: list of parameter sets (dicts of InputData attributes)
+    #   step      : step to solve, "LINEAR" or "BUCKLING"
+    #   maxJobs   : maximum number of jobs solving at the same time
+    #               (license tokens)
+    #   pollTime  : time between two job status checks [s]
+    def __init__(self, parameters, step = "LINEAR", maxJobs = 1, pollTime = 1.):
+        Base.__init__(self)
+        self.parameters = list(parameters)
+        self.step       = step
+        self.maxJobs    = max(1, int(maxJobs))
+        self.pollTime   = pollTime
+        self.results    = []        # analysed profiles
+        self.failed     = []        # profiles with errors or jobs not completed
+
+    # submit the job of a built profile, returns its awaitable handle
+    # (must be called inside the event loop)
+    #   options: job parameters, e.g. numCpus=4
+    @staticmethod
+    def submit(profile, pollTime = 1., **options):
+        profile.submitJob(**options)
+        return JobHandle(profile, pollTime)
+
+    # run the pipeline, returns the analysed profiles
+    # an error of a profile is recorded, the pipeline goes on
+    # the jobs log at the same time, their records are tagged
+    def run(self):
+        tagged = Base.setTagged(True)
+        try:
+            return asyncio.run(self.runAsync())
+        finally:
+            Base.setTagged(tagged)
+
+    async def runAsync(self):
+        self.appendLog("> pipeline over %d profiles, %d jobs at a time..." %
+                       (len(self.parameters), self.maxJobs))
+        self.results = []
+        self.failed  = []
+
+        pending  = list(self.parameters)
+        ready    = None                 # built profile waiting for a job slot
+        running  = []                   # handles of the solving jobs
+        solved   = []                   # profiles to analyse
+        watchers = []                   # progress logging tasks
+
+        while ready is not None or len(pending) > 0 or len(running) > 0 or len(solved) > 0:
+
+            # submit the built model as soon as a job slot is free
+            if ready is not None and len(running) < self.maxJobs:
+                try:
+                    handle = JobPipeline.submit(ready, self.pollTime)
+                    running.append(handle)
+                    watchers.append(asyncio.ensure_future(self.logProgress(handle)))
+                except Exception as e:
+                    self.fail(ready, e)
+                ready = None
+
+            # build the next model while the jobs solve, old results
+            # with the same input are analysed at once
+            if ready is None and len(pending) > 0:
+                profile = self.prepare(pending.pop(0))
+                if profile is None:
+                    pass
+                elif profile.isUpToDate():
+                    self.appendLog("> input of job '%s' unchanged, use the old results..." %
+                                   profile.jobName)
+                    solved.append(profile)
+                else:
+                    ready = profile
+                await asyncio.sleep(0)  # let the watchers run
+                continue
+
+            # analyse a solved job while the jobs solve
+            if len(solved) > 0:
+                self.analyse(solved.pop(0))
+                await asyncio.sleep(0)
+                continue
+
+            # wait for a job
+            if len(running) > 0:
+                await asyncio.wait([handle.task for handle in running],
+                                   return_when=asyncio.FIRST_COMPLETED)
+                for handle in [handle for handle in running if handle.done()]:
+                    running.remove(handle)
+                    if handle.task.exception() is not None:
+                        self.fail(handle.profile, handle.task.exception())
+                    elif handle.task.result() == "COMPLETED":
+                        solved.append(handle.profile)
+                    else:
+                        self.fail(handle.profile, "job status %s" % handle.task.result())
+
+        if len(watchers) > 0: await asyncio.gather(*watchers, return_exceptions=True)
+        self.printSummary()
+        return self.results
+
+    # build the model of a parameter set, None if it failed
+    def prepare(self, parameter):
+        profile = CombinedProfile()
+        try:
+            profile.setValues(**parameter)
+            profile.stepType = getattr(profile, self.step)
+            if not profile.isUpToDate():
+                profile.createSystem()
+                profile.createStep(profile.stepType)
+        except Exception as e:
+            self.fail(profile, e)
+            return None
+        return profile
+
+    # analyse the results of a profile
+    def analyse(self, profile):
+        try:
+            profile.openDatabase(profile.stepType)
+            profile.analyzeResults()
+        except Exception as e:
+            self.fail(profile, e)
+            return
+        finally:
+            profile.closeDatabase()
+        self.results.append(profile)
+
+    # record a failed profile with its error
+    def fail(self, profile, error):
+        if isinstance(error, Exception):
+            error = " ".join([str(arg) for arg in error.args]) or repr(error)
+        profile.error = error
+        self.failed.append(profile)
+        self.appendLog("warning: profile '%s' failed: %s" % (profile.prjName, profile.error),
+                       self.ERROR)
+
+    # log the progress stream of a job
+    async def logProgress(self, handle):
+        async for record in handle.progress():
+            remaining = "?"
+            if record["remaining"] is not None: remaining = "%.0f s" % record["remaining"]
+            self.appendLog("  %s: step %d, increment %d, step time %.4f, %s left" %
+                           (record["job"], record["step"], record["increment"],
+                            record["stepTime"], remaining))
+
+    # print a summary table of all analysed profiles
+    def printSummary(self):
+        self.appendLog("> pipeline results: %d completed, %d failed" %
+                       (len(self.results), len(self.failed)))
+        ProfileSweep.printTable(self, self.results, self.failed)
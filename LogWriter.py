@@ -0,0 +1,143 @@
+#=============================================================================
+# buffered log writer
+# collects the log records in memory and writes them to the log file
+# from a background thread
+#=============================================================================
+
+import atexit
+import threading
+
+# log levels
+DEBUG = 10      # developer output
+TABLE = 15      # tables with one line per node or element
+INFO  = 20      # standard messages
+WARNING = 30    # warnings, e.g. failed input checks
+ERROR = 40      # errors
+
+class LogWriter:
+
+    # one writer per log file
+    __writers = {}
+    __lock    = threading.Lock()
+
+    # get the writer of a log file, create it if necessary
+    @staticmethod
+    def get(filename):
+        LogWriter.__lock.acquire()
+        try:
+            writer = LogWriter.__writers.get(filename)
+            if writer is None:
+                writer = LogWriter(filename)
+                LogWriter.__writers[filename] = writer
+        finally:
+            LogWriter.__lock.release()
+        return writer
+
+    # flush and stop all writers, called at exit
+    @staticmethod
+    def closeAll():
+        LogWriter.__lock.acquire()
+        try:
+            writers = list(LogWriter.__writers.values())
+            LogWriter.__writers.clear()
+        finally:
+            LogWriter.__lock.release()
+        for writer in writers: writer.close()
+
+    # constructor
+    #   filename  : log file
+    #   tableFile : separate file for the TABLE records (None: log file)
+    #   level     : records below this level are suppressed
+    #   echo      : records from this level on are printed to the screen
+    #   flushTime : maximum time between two writes [s]
+    #   maxRecords: number of records which triggers a write
+    def __init__(self, filename, tableFile = None, level = TABLE, echo = INFO,
+                 flushTime = 0.5, maxRecords = 10000):
+        self.filename   = filename
+        self.tableFile  = tableFile
+        self.level      = level
+        self.echo       = echo
+        self.flushTime  = flushTime
+        self.maxRecords = maxRecords
+
+        self.records    = []                    # (filename, text) to write
+        self.lock       = threading.Lock()      # protects the records
+        self.fileLock   = threading.Lock()      # serializes the writes
+        self.event      = threading.Event()     # wakes up the writer thread
+        self.running    = True
+
+        self.thread = threading.Thread(target = self.__run,
+                                       name   = "LogWriter " + filename)
+        self.thread.daemon = True
+        self.thread.start()
+
+    # set the levels and the table file
+    def setValues(self, level = None, echo = None, tableFile = None):
+        if level     is not None: self.level     = level
+        if echo      is not None: self.echo      = echo
+        if tableFile is not None: self.tableFile = tableFile
+
+    # add a formatted line to the log
+    def write(self, level, textout):
+        if level < self.level: return
+
+        if level >= self.echo: print(textout)
+
+        filename = self.filename
+        if level == TABLE and self.tableFile: filename = self.tableFile
+
+        self.lock.acquire()
+        try:
+            self.records.append((filename, textout))
+            full = len(self.records) >= self.maxRecords
+        finally:
+            self.lock.release()
+
+        if full: self.event.set()
+
+    # write all pending records
+    def flush(self):
+        self.fileLock.acquire()
+        try:
+            self.lock.acquire()
+            try:
+                records      = self.records
+                self.records = []
+            finally:
+                self.lock.release()
+
+            # one write per file and batch
+            lines = {}
+            for filename, textout in records:
+                lines.setdefault(filename, []).append(textout + "\n")
+            for filename in lines:
+                f = open(filename, "a")     # open for append
+                f.writelines(lines[filename])
+                f.close()
+        finally:
+            self.fileLock.release()
+
+    # drop all pending records
+    def clear(self):
+        self.lock.acquire()
+        try:
+            self.records = []
+        finally:
+            self.lock.release()
+
+    # stop the writer thread and write the rest
+    def close(self):
+        self.running = False
+        self.event.set()
+        self.thread.join()
+        self.flush()
+
+    # writer thread
+    def __run(self):
+        while self.running:
+            self.event.wait(self.flushTime)
+            self.event.clear()
+            self.flush()
+
+# write all logs at exit
+atexit.register(LogWriter.closeAll)
@@ -0,0 +1,146 @@
+#=============================================================================
+# mesh convergence study for the Combined profile
+# refines the seeds step by step, extrapolates the maximum displacements
+# to the converged values and selects the coarsest seeds within a
+# tolerance; the selected seeds are recorded for similar profiles
+#=============================================================================
+
+import json
+import os
+
+from Base import Base
+from CombinedProfile import CombinedProfile
+
+# seed parameters of the refinement
+SEEDS = ("iFSeed", "iWSeed", "tFSeed", "tWSeed", "cFSeed")
+
+# extrapolate values f(h) = f0 + C*h**p to h = 0 (Richardson)
+#   h     : mesh sizes, decreasing, at least 3
+#   values: values on these meshes
+# returns the extrapolated value and the order p, the finest value and
+# None if the values don't converge monotonically
+def extrapolate(h, values):
+    h1, h2, h3 = [float(x) for x in h[-3:]]
+    f1, f2, f3 = [float(x) for x in values[-3:]]
+
+    d12 = f1 - f2
+    d23 = f2 - f3
+    if d23 == 0.: return f3, None
+    ratio = d12 / d23
+    if ratio <= 0.: return f3, None
+
+    # solve (h1^p - h2^p)/(h2^p - h3^p) = ratio for p by bisection
+    def g(p): return (h1**p - h2**p) / (h2**p - h3**p) - ratio
+    lo, hi = 0.1, 10.
+    if g(lo)*g(hi) > 0.: return f3, None
+    for i in range(60):
+        p = 0.5*(lo + hi)
+        if g(lo)*g(p) <= 0.: hi = p
+        else:                lo = p
+    p = 0.5*(lo + hi)
+
+    return f3 - d23 * h3**p / (h2**p - h3**p), p
+
+class MeshConvergence(Base):
+    # constructor
+    #   parameters: input parameters of the profile, e.g. dict(prjName="CP2",
+    #               dh2=70, ...), all others are taken from InputData
+    #   levels    : refinement factors of the seeds, at least 3
+    #   tol       : relative tolerance to the extrapolated values
+    #   seedFile  : file to record the selected seeds
+    def __init__(self, parameters = None, levels = (1, 2, 4), tol = 0.01,
+                 seedFile = "meshSeeds.json"):
+        Base.__init__(self)
+
+        if len(levels) < 3:
+            raise Exception("error: a convergence study needs at least 3 levels", levels)
+
+        self.parameters = dict(parameters or {})
+        self.levels     = sorted(levels)
+        self.tol        = tol
+        self.seedFile   = seedFile
+        self.results    = []        # one dict per level
+        self.converged  = None      # selected level
+
+    # run the linear step on all levels and select the seeds
+    def run(self):
+        base = CombinedProfile()
+        base.setValues(**self.parameters)
+        self.family = base.prjName
+
+        self.appendLog("> mesh convergence study of '%s', levels %s..." %
+                       (self.family, self.levels))
+
+        self.results = []
+        for level in self.levels:
+            # seeds of the level, the element limit grows with the mesh
+            values = dict(self.parameters)
+            values["prjName"]    = "%s-M%d" % (self.family, level)
+            values["maxElement"] = base.maxElement*level**2
+            for name in SEEDS: values[name] = getattr(base, name)*level
+
+            profile = CombinedProfile()
+            profile.setValues(**values)
+            profile.run(profile.LINEAR)
+
+            result = dict((name, values[name]) for name in SEEDS + ("maxElement",))
+            result["level"]          = level
+            result["lengthSeed"]     = profile.lengthSeed
+            result["maxU2Disp"]      = profile.maxU2Disp
+            result["maxU2FiberDisp"] = profile.maxU2FiberDisp
+            self.results.append(result)
+
+        self.select()
+        return self.converged
+
+    # extrapolate the displacements and select the coarsest level within
+    # the tolerance
+    def select(self):
+        h = [1./result["level"] for result in self.results]
+
+        self.extrapolated = {}
+        for name in ("maxU2Disp", "maxU2FiberDisp"):
+            value, order = extrapolate(h, [result[name] for result in self.results])
+            self.extrapolated[name] = value
+            if order is None:
+                self.appendLog("warning: %s doesn't converge monotonically" % name, self.ERROR)
+            else:
+                self.appendLog("  %-16s extrapolated %10.4f mm, order %5.2f" % (name, value, order))
+
+        self.appendLog("  level --max U2 mm --error % --fiber mm --error %")
+        self.converged = None
+        for result in self.results:
+            errors = [abs(result[name] - self.extrapolated[name]) / max(abs(self.extrapolated[name]), 1.e-12)
+                      for name in ("maxU2Disp", "maxU2FiberDisp")]
+            self.appendLog("  %5d %10.4f %10.3f %10.4f %10.3f" %
+                           (result["level"], result["maxU2Disp"], errors[0]*100.,
+                            result["maxU2FiberDisp"], errors[1]*100.))
+            if self.converged is None and max(errors) <= self.tol:
+                self.converged = result
+
+        if self.converged is None:
+            self.appendLog("warning: no level within the tolerance of %.2f %%" % (self.tol*100.),
+                           self.ERROR)
+            return
+
+        self.appendLog("> selected level %d: %s" %
+                       (self.converged["level"],
+                        ", ".join(["%s=%d" % (name, self.converged[name]) for name in SEEDS])))
+        self.record()
+
+    # record the selected seeds for the profile family
+    def record(self, key = None):
+        seeds = {}
+        if os.path.exists(self.seedFile):
+            f = open(self.seedFile, "r")
+            seeds = json.load(f)
+            f.close()
+
+        entry = dict((name, self.converged[name]) for name in SEEDS + ("maxElement",))
+        entry["tol"]       = self.tol
+        entry["maxU2Disp"] = self.extrapolated["maxU2Disp"]
+        seeds[key or self.family] = entry
+
+        f = open(self.seedFile, "w")
+        json.dump(seeds, f, indent=2, sort_keys=True)
+        f.close()
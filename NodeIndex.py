@@ -0,0 +1,144 @@
+#=============================================================================
+# spatial index of the mesh nodes
+# the nodes are sorted into a grid of cells in the x-y plane (the plane of
+# the cross section), so that the nodes near a line along the length or
+# near a point are found by looking into a few cells only
+#=============================================================================
+
+import threading
+
+import numpy as np
+
+from ResultCache import ResultCache
+import Backend
+
+class NodeIndex:
+
+    # indexes of the odbs read before: odb name -> (odb stamp, index), at
+    # most MAXODBS, the oldest is dropped first
+    MAXODBS      = 4
+    __odbIndexes = {}
+    __odbOrder   = []
+    __odbLock    = threading.Lock()
+
+    # create the index from an Abaqus node array (part, instance or odb)
+    @staticmethod
+    def fromNodes(nodes, cellSize = None):
+        labels, coordinates = NodeIndex.readNodes(nodes)
+        return NodeIndex(labels, coordinates, cellSize)
+
+    # create the index of the nodes of all instances of an odb
+    # the index is kept per odb file (name, size and time), so the nodes
+    # of an unchanged odb are read only once
+    @staticmethod
+    def fromOdb(odb):
+        stamp = ResultCache.stamp(odb.name)
+        with NodeIndex.__odbLock:
+            cached = NodeIndex.__odbIndexes.get(odb.name)
+        if stamp is not None and cached is not None and cached[0] == stamp: return cached[1]
+
+        labels      = [np.zeros(0, dtype=np.int64)]
+        coordinates = [np.zeros((0,3))]
+        with Backend.lock:
+            arrays = [instance.nodes for instance in odb.rootAssembly.instances.values()]
+        for nodes in arrays:
+            instanceLabels, instanceCoordinates = NodeIndex.readNodes(nodes)
+            labels.append(instanceLabels)
+            coordinates.append(instanceCoordinates)
+        index = NodeIndex(np.concatenate(labels), np.concatenate(coordinates))
+
+        if stamp is None: return index
+        with NodeIndex.__odbLock:
+            if odb.name in NodeIndex.__odbOrder: NodeIndex.__odbOrder.remove(odb.name)
+            NodeIndex.__odbOrder.append(odb.name)
+            NodeIndex.__odbIndexes[odb.name] = (stamp, index)
+            while len(NodeIndex.__odbOrder) > NodeIndex.MAXODBS:
+                del NodeIndex.__odbIndexes[NodeIndex.__odbOrder.pop(0)]
+        return index
+
+    # labels and coordinates of a node array as arrays, read in one pass
+    # over the nodes (the odb API has no bulk access to the coordinates)
+    # under the kernel lock, the arrays are built outside of it
+    @staticmethod
+    def readNodes(nodes):
+        with Backend.lock: data = [(node.label, node.coordinates) for node in nodes]
+        if len(data) == 0: return np.zeros(0, dtype=np.int64), np.zeros((0,3))
+
+        labels, coordinates = zip(*data)
+        return (np.asarray(labels, dtype=np.int64),
+                np.asarray(coordinates, dtype=float).reshape(-1,3))
+
+    # constructor
+    #   labels     : node labels
+    #   coordinates: node coordinates, shape (n,3)
+    #   cellSize   : edge length of the grid cells, by default about one
+    #                node per cell in the cross section
+    def __init__(self, labels, coordinates, cellSize = None):
+        self.labels      = np.asarray(labels, dtype=np.int64).ravel()
+        self.coordinates = np.asarray(coordinates, dtype=float).reshape(-1,3)
+
+        xy = self.coordinates[:,:2]
+        if len(xy) > 0:
+            self.origin = xy.min(axis=0)
+            extent      = xy.max(axis=0) - self.origin
+        else:
+            self.origin = np.zeros(2)
+            extent      = np.zeros(2)
+
+        if cellSize is None:
+            # nodes of the same cross section position fall into one cell
+            nxy      = len(np.unique(np.round(xy[:,0], 6) + 1j*np.round(xy[:,1], 6)))
+            cellSize = max(extent.max(), 1.) / max(np.sqrt(nxy), 1.)
+        self.cellSize = float(cellSize)
+
+        # cell keys of all nodes, the nodes are sorted by their key
+        cells      = np.floor((xy - self.origin) / self.cellSize).astype(np.int64)
+        self.ny    = int(cells[:,1].max()) + 1 if len(cells) > 0 else 1
+        keys       = cells[:,0]*self.ny + cells[:,1]
+        self.order = np.argsort(keys, kind="mergesort")
+        self.keys  = keys[self.order]
+
+    # number of nodes
+    def __len__(self):
+        return len(self.labels)
+
+    # indices of the nodes in the cells touched by a circle in the x-y plane
+    def __candidates(self, x, y, radius):
+        lo = np.floor((np.array([x, y]) - radius - self.origin) / self.cellSize).astype(np.int64)
+        hi = np.floor((np.array([x, y]) + radius - self.origin) / self.cellSize).astype(np.int64)
+        lo = np.maximum(lo, 0)
+        hi[1] = min(hi[1], self.ny - 1)
+        if hi[0] < lo[0] or hi[1] < lo[1]: return np.zeros(0, dtype=np.int64)
+
+        ix     = np.arange(lo[0], hi[0] + 1)
+        iy     = np.arange(lo[1], hi[1] + 1)
+        keys   = np.repeat(ix, len(iy))*self.ny + np.tile(iy, len(ix))
+        starts = np.searchsorted(self.keys, keys, side="left")
+        ends   = np.searchsorted(self.keys, keys, side="right")
+        if len(keys) == 1: return self.order[starts[0]:ends[0]]
+        return np.concatenate([self.order[s:e] for s, e in zip(starts, ends) if e > s] or
+                              [np.zeros(0, dtype=np.int64)])
+
+    # indices of the nodes with a distance <= radius from the line
+    # through (x,y) along the length (z axis), optionally limited to
+    # zmin <= z <= zmax; sorted by node label
+    def nearLine(self, x, y, radius, zmin = None, zmax = None):
+        index = self.__candidates(x, y, radius)
+        c     = self.coordinates[index]
+        mask  = (c[:,0] - x)**2 + (c[:,1] - y)**2 <= radius**2
+        if zmin is not None: mask &= c[:,2] >= zmin
+        if zmax is not None: mask &= c[:,2] <= zmax
+        return self.__sorted(index[mask])
+
+    # indices of the nodes with a distance <= radius from a point,
+    # sorted by node label
+    def nearPoint(self, point, radius):
+        x, y, z = point
+        index = self.__candidates(x, y, radius)
+        c     = self.coordinates[index]
+        mask  = (c[:,0] - x)**2 + (c[:,1] - y)**2 + (c[:,2] - z)**2 <= radius**2
+        return self.__sorted(index[mask])
+
+    # sort node indices by label
+    def __sorted(self, index):
+        return index[np.argsort(self.labels[index], kind="mergesort")]
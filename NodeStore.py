@@ -0,0 +1,85 @@
+#=============================================================================
+# compact store of node results
+# the node labels and the values are kept in two contiguous arrays sorted
+# by label; a label is looked up by a binary search, whole columns (e.g.
+# U2) are array views; the store behaves like a dict label -> tuple
+#=============================================================================
+
+import numpy as np
+
+class NodeStore:
+
+    # constructor
+    #   labels : node labels
+    #   data   : values, one row per node
+    #   columns: names of the value columns, e.g. ("U1","U2","U3")
+    def __init__(self, labels = (), data = None, columns = ("x", "y", "z")):
+        self.columns = tuple(columns)
+
+        labels = np.asarray(labels, dtype=np.int64).ravel()
+        if data is None: data = np.zeros((len(labels), len(self.columns)))
+        data = np.asarray(data, dtype=float).reshape(len(labels), len(self.columns))
+
+        # sort by label, sorted input is only copied if it isn't contiguous
+        if len(labels) > 1 and np.any(labels[1:] < labels[:-1]):
+            order  = np.argsort(labels, kind="mergesort")
+            labels = labels[order]
+            data   = data[order]
+        self.labels = np.ascontiguousarray(labels)
+        self.data   = np.ascontiguousarray(data)
+
+    # number of nodes
+    def __len__(self):
+        return len(self.labels)
+
+    # rows of the given labels, missing labels are skipped
+    def rows(self, labels):
+        labels = np.asarray(labels, dtype=np.int64).ravel()
+        if len(self.labels) == 0 or len(labels) == 0: return np.zeros(0, dtype=np.int64)
+
+        rows = np.minimum(np.searchsorted(self.labels, labels), len(self.labels) - 1)
+        return rows[self.labels[rows] == labels]
+
+    # row of a label, -1 if it isn't stored
+    def row(self, label):
+        i = int(np.searchsorted(self.labels, label))
+        if i < len(self.labels) and self.labels[i] == label: return i
+        return -1
+
+    def __contains__(self, label):
+        return self.row(label) >= 0
+
+    # values of a node as a tuple
+    def __getitem__(self, label):
+        i = self.row(label)
+        if i < 0: raise KeyError(label)
+        return tuple(self.data[i].tolist())
+
+    def get(self, label, default = None):
+        i = self.row(label)
+        if i < 0: return default
+        return tuple(self.data[i].tolist())
+
+    # labels in ascending order
+    def __iter__(self):
+        return iter(self.labels.tolist())
+
+    def keys(self):
+        return self.labels.tolist()
+
+    def items(self):
+        return zip(self.labels.tolist(), map(tuple, self.data.tolist()))
+
+    # a column as an array view, by name or index, e.g. column("U2")
+    def column(self, name):
+        if not isinstance(name, int): name = self.columns.index(name)
+        return self.data[:, name]
+
+    # store of some nodes only
+    def select(self, labels):
+        rows = self.rows(labels)
+        return NodeStore(self.labels[rows], self.data[rows], self.columns)
+
+    # memory of the arrays in bytes
+    def nbytes(self):
+        return self.labels.nbytes + self.data.nbytes
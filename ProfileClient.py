@@ -0,0 +1,66 @@
+#=============================================================================
+# client of the profile worker (ProfileWorker)
+# sends profile definitions to a running worker and returns its answers,
+# runs with a plain Python interpreter
+#=============================================================================
+
+import json
+import socket
+
+class ProfileClient:
+
+    # constructor
+    #   host, port: address of the worker
+    #   timeout   : maximum time to wait for an answer [s], None: no limit
+    def __init__(self, host = "127.0.0.1", port = 47011, timeout = None):
+        self.address = (host, port)
+        self.timeout = timeout
+        self.socket  = None
+        self.stream  = None
+        self.lastId  = 0
+
+    # connect to the worker, on the first request by default
+    def connect(self):
+        if self.socket is None:
+            self.socket = socket.create_connection(self.address, self.timeout)
+            self.stream = self.socket.makefile("rb")
+
+    def close(self):
+        if self.socket is not None:
+            self.stream.close()
+            self.socket.close()
+        self.socket = None
+        self.stream = None
+
+    # send a request and wait for the answer
+    def request(self, command, **values):
+        self.connect()
+        self.lastId += 1
+        request = dict(values, id=self.lastId, command=command)
+        self.socket.sendall((json.dumps(request) + "\n").encode("utf-8"))
+
+        line = self.stream.readline()
+        if len(line) == 0:
+            self.close()
+            raise Exception("error: worker closed the connection", self.address)
+        return json.loads(line.decode("utf-8"))
+
+    # run the steps of a profile, returns the results per step
+    # (dicts of ResultData.asDict), a failed run raises an exception
+    #   parameters: input parameters, all others are taken from InputData
+    #   steps     : e.g. ("LINEAR", "BUCKLING")
+    def run(self, parameters, steps = ("LINEAR",)):
+        response = self.request("run", parameters=parameters, steps=list(steps))
+        if response["status"] != "ok":
+            raise Exception("error: profile run failed", parameters.get("prjName"),
+                            response.get("error"))
+        return response["result"]
+
+    def ping(self):
+        return self.request("ping")["status"] == "ok"
+
+    # stop the worker
+    def shutdown(self):
+        response = self.request("shutdown")
+        self.close()
+        return response
@@ -0,0 +1,161 @@
+#=============================================================================
+# sweep driver for the Combined profile
+# runs the linear jobs of many parameter sets in a bounded job pool
+#=============================================================================
+
+import time
+from itertools import product
+
+from Base import Base
+from CombinedProfile import CombinedProfile
+
+class ProfileSweep(Base):
+    # constructor
+    #   parameters: list of parameter sets (dicts of InputData attributes)
+    #   maxJobs   : maximum number of jobs running at the same time
+    #               (license tokens, cores)
+    #   pollTime  : time between two job status checks [s]
+    def __init__(self, parameters, maxJobs = 2, pollTime = 5.):
+        Base.__init__(self)
+
+        self.parameters = list(parameters)  # parameter sets to calculate
+        self.maxJobs    = max(1, int(maxJobs))
+        self.pollTime   = pollTime
+        self.results    = []                # finished profiles (ResultData)
+        self.failed     = []                # profiles with errors or aborted jobs
+
+    # create the parameter sets of a grid, i.e. all combinations of the
+    # given values, e.g. grid("CP", dh2=(60,70,80), dt2=(7,8,9))
+    @staticmethod
+    def grid(prefix = "CP", **values):
+        names      = sorted(values)
+        parameters = []
+        for i, combination in enumerate(product(*[values[name] for name in names])):
+            parameter = dict(zip(names, combination))
+            parameter.setdefault("prjName", "%s-%03d" % (prefix, i + 1))
+            parameters.append(parameter)
+        return parameters
+
+    # run all linear jobs, at most maxJobs at the same time
+    # the jobs log at the same time, their records are tagged
+    def run(self):
+        tagged = Base.setTagged(True)
+        try:
+            return self.runJobs()
+        finally:
+            Base.setTagged(tagged)
+
+    def runJobs(self):
+        self.appendLog("> sweep over %d profiles, %d jobs at a time..." %
+                       (len(self.parameters), self.maxJobs))
+
+        self.results = []
+        self.failed  = []
+        pending      = list(self.parameters)
+        running      = []
+
+        while len(pending) > 0 or len(running) > 0:
+
+            # fill up the job pool
+            while len(pending) > 0 and len(running) < self.maxJobs:
+                profile = self.submit(pending.pop(0))
+                if profile is not None: running.append(profile)
+
+            # collect the finished jobs
+            finished = [profile for profile in running if self.finished(profile)]
+            for profile in finished:
+                running.remove(profile)
+                self.collect(profile)
+
+            if len(finished) == 0: time.sleep(self.pollTime)
+
+        self.printSummary()
+        return self.results
+
+    # build the model of a parameter set and submit its linear job
+    # profiles calculated before with the same input are analysed at once
+    # an error of a profile is recorded, the sweep goes on
+    def submit(self, parameter):
+        profile = CombinedProfile()
+        try:
+            profile.setValues(**parameter)
+            profile.stepType = profile.LINEAR
+            if profile.isUpToDate():
+                self.appendLog("> input of job '%s' unchanged, use the old results..." % profile.jobName)
+                self.analyse(profile)
+                return None
+
+            profile.createSystem()
+            profile.createStep(profile.LINEAR)
+            profile.submitJob()
+        except Exception as e:
+            self.fail(profile, e)
+            return None
+        return profile
+
+    # check a running job, a job which can't be checked has failed
+    def finished(self, profile):
+        try:
+            return profile.jobFinished()
+        except Exception as e:
+            self.fail(profile, e)
+            return True
+
+    # analyse the results of a finished job
+    def collect(self, profile):
+        if profile in self.failed: return
+        try:
+            status = profile.finishJob()
+        except Exception as e:
+            self.fail(profile, e)
+            return
+        if status != "COMPLETED":
+            self.fail(profile, "job status %s" % status)
+            return
+        self.analyse(profile)
+
+    # analyse the results of a profile
+    def analyse(self, profile):
+        try:
+            profile.openDatabase(profile.LINEAR)
+            profile.analyzeResults()
+        except Exception as e:
+            self.fail(profile, e)
+            return
+        finally:
+            profile.closeDatabase()
+        self.results.append(profile)
+
+    # record a failed profile with its error
+    def fail(self, profile, error):
+        if isinstance(error, Exception):
+            error = " ".join([str(arg) for arg in error.args]) or repr(error)
+        profile.error = error
+        self.failed.append(profile)
+        self.appendLog("warning: profile '%s' failed: %s" % (profile.prjName, profile.error),
+                       self.ERROR)
+
+    # print a summary table of all calculated profiles
+    def printSummary(self):
+        self.appendLog("> sweep results: %d completed, %d failed" %
+                       (len(self.results), len(self.failed)))
+        ProfileSweep.printTable(self, self.results, self.failed)
+
+    # table of the analysed and the failed profiles, missing values are
+    # printed as '-'
+    #   log: Base instance to log to
+    @staticmethod
+    def printTable(log, results, failed):
+        log.appendLog("  ---------profile ---sum Fy kN ---max U2 mm")
+        for profile in results:
+            log.appendLog("  %16s %s %s" % (profile.prjName,
+                          ProfileSweep.column(profile.sumRFo[1]/1.e3),
+                          ProfileSweep.column(profile.maxU2Disp)))
+        for profile in failed:
+            log.appendLog("  %16s failed: %s" % (profile.prjName, getattr(profile, "error", "")))
+
+    # column of the summary table
+    @staticmethod
+    def column(value):
+        if value is None: return "%12s" % "-"
+        return "%12.3f" % value
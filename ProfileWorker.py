@@ -0,0 +1,135 @@
+#=============================================================================
+# warm worker for the Combined profile
+# the CAE kernel and the modules are loaded once, the worker runs the
+# profiles sent over a local TCP socket and answers with the results;
+# models of a profile are kept, so a second run with changed loads or
+# materials only updates the model
+#
+# protocol: one JSON object per line
+#   request : {"id": 1, "command": "run", "parameters": {"prjName": "CP2", ...},
+#              "steps": ["LINEAR", "BUCKLING"]}
+#             {"command": "ping"}, {"command": "shutdown"}
+#   response: {"id": 1, "status": "ok", "seconds": 1.25,
+#              "result": {"prjName": "CP2", "LINEAR": {...}, ...}}
+#             {"id": 1, "status": "error", "error": "..."}
+#
+# start it with: abaqus cae noGUI=runProfileWorker.py
+#=============================================================================
+
+import copy
+import json
+import socket
+
+from Base import Base
+from CombinedProfile import CombinedProfile
+from InputData import InputData
+import Trace
+import Backend                      # the CAE kernel, loaded on the first use
+
+class ProfileWorker(Base):
+    # constructor
+    #   host, port: local address to listen on, port 0: any free port
+    def __init__(self, host = "127.0.0.1", port = 47011):
+        Base.__init__(self)
+        self.host     = host
+        self.port     = port
+        self.server   = None        # listening socket
+        self.profiles = {}          # warm profiles: prjName -> CombinedProfile
+        self.defaults = InputData().inputValues()   # input of a new profile
+        self.served   = 0           # number of answered requests
+
+    # open the listening socket, returns the address (host, port)
+    def listen(self):
+        if self.server is None:
+            self.server = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+            self.server.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+            self.server.bind((self.host, self.port))
+            self.server.listen(5)
+            self.port = self.server.getsockname()[1]
+        return (self.host, self.port)
+
+    # serve the clients one after the other until a shutdown request
+    # (one kernel, the profiles are run one at a time)
+    def serve(self):
+        Backend.load()
+        self.appendLog("> profile worker listening on %s:%d..." % self.listen())
+
+        running = True
+        while running:
+            connection, address = self.server.accept()
+            try:
+                running = self.serveConnection(connection)
+            finally:
+                connection.close()
+
+        self.server.close()
+        self.server = None
+        self.appendLog("> profile worker stopped, %d requests served." % self.served)
+        self.flushLog()
+
+    # answer the requests of a connection until it's closed
+    # returns False after a shutdown request
+    def serveConnection(self, connection):
+        stream = connection.makefile("rb")
+        try:
+            for line in stream:
+                line = line.decode("utf-8").strip()
+                if len(line) == 0: continue
+
+                response = self.handle(line)
+                connection.sendall((json.dumps(response) + "\n").encode("utf-8"))
+                self.served += 1
+                if response.get("command") == "shutdown": return False
+        finally:
+            stream.close()
+        return True
+
+    # answer a request line
+    def handle(self, line):
+        request  = {}
+        response = {"status": "ok"}
+        start    = Trace.clock()
+        try:
+            request = json.loads(line)
+            response["id"] = request.get("id")
+            command = request.get("command", "run")
+            if command == "run":
+                response["result"] = self.runProfile(request.get("parameters", {}),
+                                                     request.get("steps", ["LINEAR"]))
+            elif command in ("ping", "shutdown"):
+                response["command"] = command
+            else:
+                raise Exception("error: Unknown command", command)
+        except Exception as e:
+            self.appendLog("warning: request %s failed: %s" % (request.get("id"), e), self.ERROR)
+            response["status"] = "error"
+            response["error"]  = str(e)
+        response["seconds"] = Trace.clock() - start
+        self.flushLog()
+        return response
+
+    # run the steps of a profile, returns the results per step
+    # a warm profile is reset to the defaults first, so the parameters of
+    # former requests don't leak into this one; after an error it's dropped
+    #   parameters: input parameters, all others are taken from InputData
+    #   steps     : names of the steps, e.g. ["LINEAR", "BUCKLING"]
+    def runProfile(self, parameters, steps):
+        values = copy.deepcopy(self.defaults)
+        values.update(parameters)
+        profile = self.profiles.pop(values["prjName"], None)
+        if profile is None: profile = CombinedProfile()
+        profile.setValues(**values)
+
+        result = {"prjName": profile.prjName}
+        for step in steps:
+            if step not in ("LINEAR", "BUCKLING"):
+                raise Exception("error: Unknown step", step)
+            self.solve(profile, getattr(profile, step))
+            result[step] = profile.asDict()
+
+        self.profiles[profile.prjName] = profile
+        return result
+
+    # build, solve and analyse a step of a profile
+    def solve(self, profile, stepType):
+        profile.run(stepType)
@@ -0,0 +1,154 @@
+#=============================================================================
+# columnar result cache of a job
+# the node and element arrays of an odb are written once into a single
+# file beside the odb; later analyses read the columns lazily through
+# memory maps and don't need the odb API at all
+#
+# file layout:  8 bytes  magic
+#               8 bytes  header length (little endian)
+#               header   JSON: job, odb stamp, meta data, columns
+#               columns  raw arrays, 64 byte aligned
+#=============================================================================
+
+import json
+import os
+import struct
+import zlib
+
+import numpy as np
+
+# view of the data of an array without a copy (zlib and files of Python 2
+# take buffers, not memory views)
+try:
+    _view = buffer
+except NameError:
+    _view = memoryview
+
+class ResultCache:
+
+    MAGIC   = b"RCACHE01"
+    ALIGN   = 64
+
+    # write a cache file
+    #   filename: cache file, e.g. 'CP3-Linear.rcache'
+    #   columns : dict name -> array
+    #   meta    : dict of JSON serializable values
+    #   odbName : odb the data comes from, its size and time are stored
+    @staticmethod
+    def write(filename, columns, meta = None, odbName = None):
+        names   = sorted(columns)
+        arrays  = [np.ascontiguousarray(columns[name]) for name in names]
+
+        header  = {"meta"   : meta or {},
+                   "odb"    : ResultCache.stamp(odbName),
+                   "columns": {}}
+
+        # the header size depends on the offsets, so place the columns
+        # behind a generously estimated header
+        estimate = 1024 + 256*len(names) + len(json.dumps(meta or {}))
+        offset   = ResultCache.__align(16 + estimate)
+        for name, array in zip(names, arrays):
+            header["columns"][name] = {"dtype" : array.dtype.str,
+                                       "shape" : list(array.shape),
+                                       "offset": offset,
+                                       "crc32" : zlib.crc32(_view(array)) & 0xffffffff}
+            offset = ResultCache.__align(offset + array.nbytes)
+
+        text = json.dumps(header).encode("ascii")
+        if 16 + len(text) > ResultCache.__align(16 + estimate):
+            raise Exception("error: result cache header too large", filename)
+
+        # write into a temporary file and replace the old cache at the end
+        tmpName = filename + ".tmp"
+        f = open(tmpName, "wb")
+        f.write(ResultCache.MAGIC)
+        f.write(struct.pack("<Q", len(text)))
+        f.write(text)
+        for name, array in zip(names, arrays):
+            f.seek(header["columns"][name]["offset"])
+            f.write(_view(array))
+        f.close()
+
+        if os.path.exists(filename): os.remove(filename)
+        os.rename(tmpName, filename)
+
+    # size and modification time of an odb
+    @staticmethod
+    def stamp(odbName):
+        if odbName is None or not os.path.exists(odbName): return None
+        return {"name" : os.path.basename(odbName),
+                "size" : os.path.getsize(odbName),
+                "mtime": int(os.path.getmtime(odbName))}
+
+    # constructor, the header is read on the first access
+    #   verify: check the checksum of every column on its first access
+    def __init__(self, filename, verify = True):
+        self.filename = filename
+        self.verify   = verify
+        self.header   = None
+        self.arrays   = {}
+
+    # check if the cache can be used: the file exists and belongs to the
+    # odb, if the odb is still there (archived jobs may have no odb)
+    def isValid(self, odbName = None):
+        try:
+            header = self.readHeader()
+        except Exception:
+            return False
+
+        if odbName is None or not os.path.exists(odbName): return True
+        return header["odb"] == ResultCache.stamp(odbName)
+
+    # read the header
+    def readHeader(self):
+        if self.header is None:
+            f = open(self.filename, "rb")
+            try:
+                if f.read(8) != ResultCache.MAGIC:
+                    raise Exception("error: no result cache file", self.filename)
+                length      = struct.unpack("<Q", f.read(8))[0]
+                self.header = json.loads(f.read(length).decode("ascii"))
+            finally:
+                f.close()
+        return self.header
+
+    # meta data
+    @property
+    def meta(self):
+        return self.readHeader()["meta"]
+
+    # column names
+    def keys(self):
+        return sorted(self.readHeader()["columns"])
+
+    def __contains__(self, name):
+        return name in self.readHeader()["columns"]
+
+    # memory mapped column
+    def __getitem__(self, name):
+        if name in self.arrays: return self.arrays[name]
+
+        column = self.readHeader()["columns"][name]
+        dtype  = np.dtype(str(column["dtype"]))
+        shape  = tuple(column["shape"])
+        if int(np.prod(shape)) == 0:
+            array = np.zeros(shape, dtype=dtype)
+        else:
+            array = np.memmap(self.filename, dtype=dtype, mode="r",
+                              offset=column["offset"], shape=shape)
+
+        if self.verify and zlib.crc32(_view(array)) & 0xffffffff != column["crc32"]:
+            raise Exception("error: checksum error in result cache", self.filename, name)
+
+        self.arrays[name] = array
+        return array
+
+    # get a column, default if it's not in the cache
+    def get(self, name, default = None):
+        if name not in self: return default
+        return self[name]
+
+    # align an offset
+    @staticmethod
+    def __align(offset):
+        return (offset + ResultCache.ALIGN - 1) // ResultCache.ALIGN * ResultCache.ALIGN
@@ -3,30 +3,185 @@
 # calculates maximum vertical displacements
 
 from math import fabs
+import numpy as np
 from Base import Base
+from ResultCache import ResultCache
+from NodeStore import NodeStore
 
 class ResultData(Base):
 
     # initialize the attributes
     def __init__(self):
         Base.__init__(self)
-        self.nodePos    = {}           # selected fiber nodes
+        self.nodePos    = NodeStore()  # selected fiber nodes
         self.sumRFo     = [0.,0.,0.]   # sum of reaction forces
-        self.nodeRFo    = {}           # reaction force on nodes
-        self.nodeDisp   = {}           # displacements along the fiber
+        self.nodeRFo    = NodeStore(columns=("RF1","RF2","RF3"))   # reaction force on nodes
+        self.nodeDisp   = NodeStore(columns=("U1","U2","U3"))      # displacements of the nodes
         self.maxU2Disp  = None         # maximum displacment for the SLS proof
+        self.maxU2FiberDisp = None     # maximum displacement on the supported line
+                                       # (a symmetric model has the values of the full model)
         self.maxStress  = None         # maximum stress for the ULS proof
         self.elementX   = 0            # most critical element
+        self.criticalElements = []     # most critical elements of the ULS proof (dicts)
+        self.misesEnvelope = NodeStore(columns=("Mises","IP","SP","frame"))
+                                       # maximum Mises stress per element and its location
         self.minBuckleEV= None         # minimal positive buckling value
+        self.criticalLoad = None       # critical load of the buckling step [N]
+        self.loadCaseResults = []      # results of the load cases (dicts)
                                        
         self.myOdb      = None         # reference to result odb
+        self.resultCache= None         # result cache, used instead of the odb
         self.myViewport = None         # viewport to show results
 
+    # load the results from a result cache, if it's valid for the odb
+    # the fiber nodes are taken from the cache, the node and element
+    # arrays are read on demand
+    def loadCache(self, filename, odbName = None):
+        self.resultCache = None
+        cache = ResultCache(filename)
+        if not cache.isValid(odbName): return False
+
+        self.resultCache = cache
+        if "fiber.labels" in cache and "nodes.labels" in cache:
+            rows = self.findRows(cache["nodes.labels"], cache["fiber.labels"])
+            self.nodePos = NodeStore(cache["nodes.labels"][rows],
+                                     cache["nodes.coordinates"][rows])
+        return True
+
+    # write the field arrays and the fiber nodes into a result cache
+    #   fields: dict name -> array, e.g. 'U.labels', 'U.data'
+    def writeCache(self, filename, fields, meta = None, odbName = None):
+        columns = dict(fields)
+        columns["fiber.labels"] = self.nodePos.labels
+        ResultCache.write(filename, columns, meta, odbName)
+        self.resultCache = ResultCache(filename)
+
+    # sum of the reaction forces and the nodes with a reaction force
+    #   labels: node labels, data: RF vectors, one row per node
+    #   factor: factors of the sums, maps the sums of a symmetric model
+    #           to the full model
+    def evalReactions(self, labels, data, factor = (1.,1.,1.), tol = 1.e-3):
+        data  = np.asarray(data, dtype=float)[:,:3]
+        mask  = np.sqrt((data**2).sum(axis=1)) >= tol
+
+        self.nodeRFo = NodeStore(np.asarray(labels)[mask], data[mask], ("RF1","RF2","RF3"))
+        self.sumRFo  = (data[mask].sum(axis=0) * np.asarray(factor)).tolist()
+
+    # compare the vertical reaction sum with an expected value, e.g. from
+    # the beam theory; returns the relative deviation
+    def checkReactions(self, expected, tol = 0.01):
+        deviation = (fabs(self.sumRFo[1]) - expected) / expected
+        self.appendLog("  expected vertical sum: %8.3f kN, deviation %6.2f %%" %
+                       (expected/1.e3, deviation*100.))
+        if fabs(deviation) > tol:
+            self.appendLog("warning: vertical reaction sum deviates from the expected value",
+                           self.ERROR)
+        return deviation
+
+    # maximum vertical displacements, total and on the supported line
+    #   labels: node labels, data: U vectors, one row per node
+    def evalDisplacements(self, labels, data):
+        # save node displacement vectors
+        self.nodeDisp = NodeStore(labels, np.asarray(data, dtype=float)[:,:3], ("U1","U2","U3"))
+        u2 = -self.nodeDisp.column("U2")
+
+        self.maxU2Disp = None
+        if len(u2) > 0: self.maxU2Disp = float(u2.max())
+
+        self.maxU2FiberDisp = None
+        rows = self.nodeDisp.rows(self.nodePos.labels)
+        if len(rows) > 0: self.maxU2FiberDisp = float(u2[rows].max())
+
+    # minimal positive buckling eigenvalue, None if there is none
+    #   referenceLoad: total load of the buckling step [N]
+    def evalEigenvalues(self, eigenvalues, referenceLoad = None):
+        eigenvalues = np.asarray(eigenvalues, dtype=float)
+        positive    = eigenvalues[eigenvalues > 0.]
+
+        self.minBuckleEV  = None
+        self.criticalLoad = None
+        if len(positive) > 0: self.minBuckleEV = float(positive.min())
+        if self.minBuckleEV is not None and referenceLoad is not None:
+            self.criticalLoad = self.minBuckleEV * referenceLoad
+
+    # Mises stress envelope over all frames, integration and section
+    # points: the maximum per element with its location, and the k most
+    # critical elements (partial sort)
+    #   labels, points, sections, mises, frames: element label, integration
+    #           point, section point, Mises stress and frame of the values,
+    #           one row per value
+    def evalStress(self, labels, points, sections, mises, frames, k = 10):
+        self.elementX         = 0
+        self.maxStress        = 0.
+        self.criticalElements = []
+        self.misesEnvelope    = NodeStore(columns=("Mises","IP","SP","frame"))
+        if len(mises) == 0: return
+
+        # the first row of an element in this order has its maximum
+        mises = np.asarray(mises, dtype=float)
+        order = np.lexsort((-mises, labels))
+        first = np.ones(len(order), dtype=bool)
+        first[1:] = labels[order][1:] != labels[order][:-1]
+        rows  = order[first]
+
+        self.misesEnvelope = NodeStore(labels[rows],
+                                       np.column_stack((mises[rows], points[rows],
+                                                        sections[rows], frames[rows])),
+                                       ("Mises","IP","SP","frame"))
+
+        # k largest element maxima, sorted
+        envelope = self.misesEnvelope.column("Mises")
+        k        = max(1, min(int(k), len(envelope)))
+        top      = np.argpartition(-envelope, k - 1)[:k]
+        top      = top[np.argsort(-envelope[top], kind="mergesort")]
+        for label, row in zip(self.misesEnvelope.labels[top].tolist(), top.tolist()):
+            value, point, section, frame = self.misesEnvelope.data[row].tolist()
+            self.criticalElements.append({"element"         : label,
+                                          "mises"           : value,
+                                          "integrationPoint": int(point),
+                                          "sectionPoint"    : int(section),
+                                          "frame"           : int(frame)})
+
+        self.elementX  = self.criticalElements[0]["element"]
+        self.maxStress = self.criticalElements[0]["mises"]
+
+    # rows of the given labels in an array of labels, missing labels are skipped
+    @staticmethod
+    def findRows(labels, wanted):
+        labels = np.asarray(labels)
+        wanted = np.asarray(wanted, dtype=labels.dtype)
+        if len(labels) == 0 or len(wanted) == 0: return np.zeros(0, dtype=np.int64)
+
+        order = np.argsort(labels, kind="mergesort")
+        pos   = np.searchsorted(labels[order], wanted)
+        pos   = np.minimum(pos, len(labels) - 1)
+        rows  = order[pos]
+        return rows[labels[rows] == wanted]
+
     # calculate the maximum vertical displacement along the fiber
+    # (the U2 value with the largest magnitude)
     def getMaxDisp(self):
-        max = 0.
-        for label in self.nodePos:
-            disp = self.nodeDis[label]
-            # y
-            if (fabs(disp[1]) > fabs(max)): max = disp[1]
-        return max
\ No newline at end of file
+        u2 = self.nodeDisp.column("U2")[self.nodeDisp.rows(self.nodePos.labels)]
+        if len(u2) == 0: return 0.
+        return float(u2[np.argmax(np.abs(u2))])
+
+    # results as plain data (numbers, lists, dicts), e.g. to send them as
+    # JSON; the node tables are summarized by their numbers of nodes
+    def asDict(self):
+        def plain(value):
+            if isinstance(value, np.generic): return value.item()
+            if isinstance(value, (list, tuple)): return [plain(item) for item in value]
+            if isinstance(value, dict): return dict((key, plain(value[key])) for key in value)
+            return value
+
+        return plain({"sumRFo"          : self.sumRFo,
+                      "maxU2Disp"       : self.maxU2Disp,
+                      "maxU2FiberDisp"  : self.maxU2FiberDisp,
+                      "maxStress"       : self.maxStress,
+                      "elementX"        : self.elementX,
+                      "criticalElements": self.criticalElements,
+                      "minBuckleEV"     : self.minBuckleEV,
+                      "criticalLoad"    : self.criticalLoad,
+                      "loadCaseResults" : self.loadCaseResults,
+                      "fiberNodes"      : len(self.nodePos),
+                      "reactionNodes"   : len(self.nodeRFo)})
@@ -0,0 +1,136 @@
+#=============================================================================
+# scaling benchmark of the post-processing hot paths
+# times the fiber node selection, the analysis of the linear step, the
+# maximum fiber displacement and the node table logging on synthetic
+# models of several sizes (stand-in backend, no Abaqus needed) and
+# compares the times with a recorded baseline
+#=============================================================================
+
+import os
+
+import Backend
+from Base import Base
+from CoresBenchmark import clock
+from CombinedProfile import CombinedProfile
+
+# benchmarked hot paths
+CASES = ("getFiberNodes", "analyseLinearStep", "getMaxDisp", "appendLog")
+
+class ScalingBenchmark(Base):
+    # constructor
+    #   parameters: input parameters of the profile, all others are taken
+    #               from InputData
+    #   sizes     : approximate numbers of nodes of the synthetic models
+    #   repeat    : runs per case and size, the fastest run counts
+    #   csvFile   : file to write the timing table to
+    def __init__(self, parameters = None, sizes = (10000, 100000, 1000000), repeat = 3,
+                 csvFile = "scalingBenchmark.csv"):
+        Base.__init__(self)
+        self.parameters = dict(parameters or {})
+        self.sizes      = list(sizes)
+        self.repeat     = max(1, int(repeat))
+        self.csvFile    = csvFile
+        self.results    = []
+
+    # run all cases on all sizes
+    def run(self):
+        Backend.select("AbaqusStandIn")
+        standIn = Backend.load()
+
+        self.results = []
+        for size in self.sizes:
+            profile = CombinedProfile()
+            profile.setValues(**self.parameters)
+            profile.setValues(prjName = "%s-N%d" % (profile.prjName, size),
+                              headless = True, figureQueue = None, useCache = False)
+            profile.stepType = profile.LINEAR
+
+            part = standIn.createPart(profile, size)
+            odb  = standIn.createOdb(profile, part)
+            profile.myPart = part
+
+            def fiberNodes():
+                profile.getFiberNodes()
+
+            def analyse():
+                profile.openDatabase(profile.LINEAR)
+                profile.analyzeResults()
+
+            def maxDisp():
+                profile.getMaxDisp()
+
+            def nodeTable():
+                for label, coordinates in enumerate(part.mesh.nodes.tolist(), 1):
+                    self.appendLog("%8d %10.2f %10.2f %10.2f" % ((label,) + tuple(coordinates)),
+                                   self.TABLE)
+                self.flushLog()
+
+            for case, function in zip(CASES, (fiberNodes, analyse, maxDisp, nodeTable)):
+                self.results.append({"case"    : case,
+                                     "nodes"   : len(part.nodes),
+                                     "elements": len(part.elements),
+                                     "seconds" : self.time(function)})
+            odb.close()
+
+        self.printSummary()
+        self.writeCsv()
+        return self.results
+
+    # fastest wall time of a function
+    def time(self, function):
+        best = None
+        for i in range(self.repeat):
+            t0 = clock()
+            function()
+            t1 = clock()
+            if best is None or t1 - t0 < best: best = t1 - t0
+        return best
+
+    # print the timing table, the time per node shows the scaling
+    def printSummary(self):
+        self.appendLog("> scaling benchmark, wall times [s]:")
+        self.appendLog("  ---------------case ----nodes -elements ---seconds -us/node")
+        for result in self.results:
+            self.appendLog("  %19s %9d %9d %9.4f %8.3f" %
+                           (result["case"], result["nodes"], result["elements"],
+                            result["seconds"], result["seconds"] / result["nodes"] * 1.e6))
+
+    # write the timing table
+    def writeCsv(self, filename = None):
+        names = ("case", "nodes", "elements", "seconds")
+        f = open(filename or self.csvFile, "w")
+        f.write(";".join(names) + "\n")
+        for result in self.results:
+            f.write(";".join([str(result[name]) for name in names]) + "\n")
+        f.close()
+
+    # compare the times with a baseline table written by writeCsv
+    #   factor : allowed slowdown
+    #   minTime: shorter times are not compared (timer noise)
+    # returns the regressions as (case, nodes, baseline, seconds)
+    def compare(self, baselineFile, factor = 1.5, minTime = 0.01):
+        if not os.path.exists(baselineFile):
+            self.appendLog("> no baseline '%s', write it..." % baselineFile)
+            self.writeCsv(baselineFile)
+            return []
+
+        baseline = {}
+        f = open(baselineFile, "r")
+        names = f.readline().strip().split(";")
+        for line in f:
+            row = dict(zip(names, line.strip().split(";")))
+            if len(row) == len(names):
+                baseline[(row["case"], int(row["nodes"]))] = float(row["seconds"])
+        f.close()
+
+        regressions = []
+        for result in self.results:
+            old = baseline.get((result["case"], result["nodes"]))
+            if old is None or max(old, result["seconds"]) < minTime: continue
+            if result["seconds"] > factor*old:
+                regressions.append((result["case"], result["nodes"], old, result["seconds"]))
+                self.appendLog("warning: %s with %d nodes: %.4f s, baseline %.4f s" %
+                               (result["case"], result["nodes"], result["seconds"], old),
+                               self.ERROR)
+        self.appendLog("> %d regressions against '%s'." % (len(regressions), baselineFile))
+        return regressions
@@ -0,0 +1,96 @@
+#=============================================================================
+# structured shell mesh of an extruded cross section
+# the cross section is a set of straight segments in the x-y plane, each
+# divided into a number of elements; the section is extruded along z
+# the mesh has no Abaqus dependency
+#=============================================================================
+
+import numpy as np
+
+class ShellMesh:
+    # constructor
+    #   length   : extrusion length (z from 0 to length)
+    #   divisions: number of elements along the length
+    def __init__(self, length, divisions, tol = 1.e-6):
+        self.length    = float(length)
+        self.divisions = int(divisions)
+        self.tol       = tol
+        self.points    = []         # cross section points (x,y)
+        self.pointIds  = {}         # rounded point -> index
+        self.segments  = []         # (point ids, element set names)
+
+    # index of a cross section point, equal points are merged
+    def pointId(self, point):
+        key = (int(round(point[0]/self.tol)), int(round(point[1]/self.tol)))
+        if key not in self.pointIds:
+            self.pointIds[key] = len(self.points)
+            self.points.append((float(point[0]), float(point[1])))
+        return self.pointIds[key]
+
+    # add a segment from point1 to point2 with n elements
+    #   sets: names of the element sets of the segment's elements
+    # the element normal is (dy, -dx, 0) for the direction (dx, dy)
+    def addSegment(self, point1, point2, n, sets = ()):
+        n   = max(1, int(n))
+        ids = []
+        for i in range(n + 1):
+            t = float(i) / n
+            ids.append(self.pointId((point1[0] + t*(point2[0] - point1[0]),
+                                     point1[1] + t*(point2[1] - point1[1]))))
+        self.segments.append((np.array(ids, dtype=np.int64), tuple(sets)))
+        return len(self.segments) - 1
+
+    # build the nodes and elements
+    #   nodes      : node coordinates, node label = row + 1
+    #   elements   : element connectivity (node labels), label = row + 1
+    #   elementSets: set name -> element labels
+    def build(self):
+        points = np.array(self.points, dtype=float).reshape(-1, 2)
+        m      = len(points)
+        nz     = self.divisions
+        z      = np.linspace(0., self.length, nz + 1)
+
+        self.nodes = np.column_stack((np.tile(points, (nz + 1, 1)),
+                                      np.repeat(z, m)))
+
+        offsets  = (np.arange(nz, dtype=np.int64)*m)[:, None]
+        elements = []
+        self.elementSets     = {}
+        self.segmentElements = []
+        first = 1
+        for ids, sets in self.segments:
+            a = ids[:-1][None, :] + offsets + 1
+            b = ids[1:][None, :]  + offsets + 1
+            conn = np.column_stack((a.ravel(), b.ravel(), (b + m).ravel(), (a + m).ravel()))
+            labels = np.arange(first, first + len(conn), dtype=np.int64)
+            first += len(conn)
+
+            elements.append(conn)
+            self.segmentElements.append(labels)
+            for name in sets:
+                self.elementSets.setdefault(name, []).append(labels)
+
+        if len(elements) > 0: self.elements = np.concatenate(elements)
+        else:                 self.elements = np.zeros((0, 4), dtype=np.int64)
+        for name in self.elementSets:
+            self.elementSets[name] = np.concatenate(self.elementSets[name])
+        return self
+
+    # node labels of cross section points at the z levels
+    #   pointIds: indices of cross section points
+    #   levels  : indices of the z levels (0 ... divisions), None: all
+    def nodeLabels(self, pointIds, levels = None):
+        if levels is None: levels = range(self.divisions + 1)
+        m   = len(self.points)
+        ids = np.asarray(pointIds, dtype=np.int64)
+        return np.concatenate([ids + k*m + 1 for k in levels] or
+                              [np.zeros(0, dtype=np.int64)])
+
+    # indices of the cross section points within tol of a point
+    def findPoints(self, x, y, tol = 1.e-3):
+        points = np.array(self.points, dtype=float).reshape(-1, 2)
+        return np.where((points[:,0] - x)**2 + (points[:,1] - y)**2 <= tol**2)[0]
+
+    # point ids of a segment
+    def segmentPoints(self, segment):
+        return self.segments[segment][0]
@@ -0,0 +1,181 @@
+#=============================================================================
+# timing instrumentation of the pipeline
+# records the start and end times of the pipeline stages and jobs with a
+# high resolution clock, together with counters (nodes, elements, findAt
+# calls, field values read, ...) counted during each stage; the records
+# are exported as Chrome trace JSON (chrome://tracing, Perfetto) and as a
+# summary table per stage
+#=============================================================================
+
+import functools
+import json
+import os
+import threading
+import time
+
+# high resolution wall clock
+clock = getattr(time, "perf_counter", time.time)
+
+_lock     = threading.Lock()
+_enabled  = True
+_origin   = clock()     # time 0 of the trace
+_events   = []          # complete events: (name, start, end, thread, args)
+_counters = {}          # counter name -> total value
+
+# open spans of the running thread, the counters are added to them; with
+# asyncio the spans of a task are its own (context variable), so spans
+# of other threads, profiles or tasks don't see each other's counts
+try:
+    import contextvars
+    _spans = contextvars.ContextVar("Trace.spans", default=())
+    def _openSpans():
+        return _spans.get()
+    def _setOpenSpans(spans):
+        _spans.set(spans)
+except ImportError:
+    _local = threading.local()
+    def _openSpans():
+        return getattr(_local, "spans", ())
+    def _setOpenSpans(spans):
+        _local.spans = spans
+
+# switch the recording on or off
+def enable(on = True):
+    global _enabled
+    _enabled = on
+
+# drop all records, e.g. at the start of a run
+def reset():
+    global _origin
+    _lock.acquire()
+    try:
+        _origin = clock()
+        del _events[:]
+        _counters.clear()
+    finally:
+        _lock.release()
+
+# increment a counter, e.g. count("findAt") or count("nodes", 858)
+def count(name, n = 1):
+    if not _enabled: return
+    _lock.acquire()
+    try:
+        _counters[name] = _counters.get(name, 0) + n
+    finally:
+        _lock.release()
+    for span in _openSpans():
+        span.counts[name] = span.counts.get(name, 0) + n
+
+# actual counter values, totals of all threads
+def counters():
+    _lock.acquire()
+    try:
+        return dict(_counters)
+    finally:
+        _lock.release()
+
+# record a stage with its start and end time (clock values)
+def record(name, start, end, **args):
+    if not _enabled: return
+    _lock.acquire()
+    try:
+        _events.append((name, start, end, threading.current_thread().name, args))
+    finally:
+        _lock.release()
+
+# time a block: with Trace.Span("job wait", job=name): ...
+# the counters incremented in the block by its thread (task) are added
+# to the record
+class Span:
+    def __init__(self, name, **args):
+        self.name   = name
+        self.args   = args
+        self.counts = {}
+
+    def __enter__(self):
+        self.counts = {}
+        _setOpenSpans(_openSpans() + (self,))
+        self.start  = clock()
+        return self
+
+    def __exit__(self, type, value, traceback):
+        end = clock()
+        _setOpenSpans(tuple([span for span in _openSpans() if span is not self]))
+        for name in self.counts:
+            if self.counts[name] != 0: self.args[name] = self.counts[name]
+        if type is not None: self.args["error"] = type.__name__
+        record(self.name, self.start, end, **self.args)
+        return False
+
+# decorator to time a method as a stage, the stage name is the method name
+# and the profile's name is added, if the object has one
+def traced(function):
+    @functools.wraps(function)
+    def wrapper(self, *args, **kwargs):
+        if not _enabled: return function(self, *args, **kwargs)
+        info = {}
+        if hasattr(self, "prjName"): info["profile"] = self.prjName
+        with Span(function.__name__, **info):
+            return function(self, *args, **kwargs)
+    return wrapper
+
+# write the records as Chrome trace JSON, times in microseconds
+def writeChrome(filename):
+    _lock.acquire()
+    try:
+        events = list(_events)
+        totals = dict(_counters)
+        origin = _origin
+    finally:
+        _lock.release()
+
+    pid     = os.getpid()
+    threads = {}
+    trace   = []
+    for name, start, end, thread, args in events:
+        tid = threads.setdefault(thread, len(threads) + 1)
+        trace.append({"name": name, "cat": "pipeline", "ph": "X", "pid": pid, "tid": tid,
+                      "ts"  : (start - origin)*1.e6, "dur": (end - start)*1.e6,
+                      "args": args})
+    for thread, tid in threads.items():
+        trace.append({"name": "thread_name", "ph": "M", "pid": pid, "tid": tid,
+                      "args": {"name": thread}})
+
+    f = open(filename, "w")
+    json.dump({"traceEvents": trace, "displayTimeUnit": "ms", "otherData": {"counters": totals}},
+              f, indent=1, sort_keys=True)
+    f.close()
+
+# summary per stage: [(name, {"calls", "total", "max", counters...})]
+def summary():
+    _lock.acquire()
+    try:
+        events = list(_events)
+    finally:
+        _lock.release()
+
+    stages = {}
+    order  = []
+    for name, start, end, thread, args in events:
+        if name not in stages:
+            stages[name] = {"calls": 0, "total": 0., "max": 0.}
+            order.append(name)
+        stage = stages[name]
+        stage["calls"] += 1
+        stage["total"] += end - start
+        stage["max"]    = max(stage["max"], end - start)
+        for key in args:
+            if isinstance(args[key], (int, float)) and not isinstance(args[key], bool):
+                stage[key] = stage.get(key, 0) + args[key]
+    return [(name, stages[name]) for name in order]
+
+# print the summary table, ordered by the first call of the stages
+#   logger: object with an appendLog method, e.g. a CombinedProfile
+def printSummary(logger):
+    logger.appendLog("> trace summary, wall times [s]:")
+    logger.appendLog("  ---------------stage -calls ----total ------max counters")
+    for name, stage in summary():
+        extra = ", ".join(["%s=%d" % (key, stage[key]) for key in sorted(stage)
+                           if key not in ("calls", "total", "max")])
+        logger.appendLog("  %20s %6d %9.3f %9.3f %s" %
+                         (name, stage["calls"], stage["total"], stage["max"], extra))
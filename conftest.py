@@ -0,0 +1,40 @@
+#=============================================================================
+# common fixtures of the tests, the tests run on the stand-in backend
+#=============================================================================
+
+import pytest
+
+import Backend
+Backend.select("AbaqusStandIn")
+
+from Base import Base
+
+# temporary working directory of a test, all objects of the test log
+# into it
+@pytest.fixture
+def workdir(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    Base.setDefaultLog(str(tmp_path / "profiles.log"))
+    yield tmp_path
+    Base.setDefaultLog("profiles.log")
+
+# results of a former linear job of a profile: the stand-in odb, an odb
+# file and the fingerprint of the input, so the profile is up to date;
+# the odbs left open by the test are closed at its end
+#   oldResults(prjName="CP2", dh2=70.) -> stand-in odb
+@pytest.fixture
+def oldResults(workdir):
+    from CombinedProfile import CombinedProfile
+    odbs = []
+
+    def create(**parameters):
+        profile = CombinedProfile()
+        profile.setValues(**parameters)
+        standIn = Backend.load()
+        odb     = standIn.createOdb(profile, standIn.createPart(profile))
+        open(odb.name, "w").write("stand-in")
+        open(odb.name[:-4] + ".fingerprint", "w").write(profile.fingerprint() + "\n")
+        odbs.append(odb)
+        return odb
+    yield create
+    for odb in odbs: odb.close()
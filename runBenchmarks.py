@@ -0,0 +1,27 @@
+'''
+Scaling benchmark of the post-processing on synthetic models, runs
+with a plain Python interpreter (no Abaqus), e.g. on the CI machines:
+    python runBenchmarks.py [work directory]
+the exit code is 1 if a time is much slower than the baseline
+'''
+
+import os
+import sys
+
+# set workdirectory, the current directory by default
+workDir = os.getcwd()
+if len(sys.argv) > 1: workDir = sys.argv[1]
+if not os.path.isdir(workDir): os.makedirs(workDir)
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+os.chdir(workDir)
+
+from ScalingBenchmark import ScalingBenchmark
+
+# CP3 model (InputData) with about 10^4, 10^5 and 10^6 nodes
+benchmark = ScalingBenchmark(sizes=(10000, 100000, 1000000), repeat=3)
+benchmark.run()
+
+# compare with the baseline, the first run records it
+regressions = benchmark.compare("scalingBaseline.csv", factor=1.5)
+benchmark.flushLog()
+sys.exit(len(regressions) > 0)
@@ -27,17 +27,18 @@ from Base import Base
 from CombinedProfile import CombinedProfile
 sys = CombinedProfile()
 
-# create system
-sys.createSystem()
+# create system, step for a linear static analysis, run the job and
+# analyse the results; model and job are skipped if the input is unchanged
+sys.run(sys.LINEAR)
 
-# create step for a linear static analysis
-sys.createStep(sys.LINEAR)
+# ULS proof: Mises stress envelope and the most critical elements
+#sys.setValues(limitState="ULS")
+#sys.run(sys.LINEAR)
 
-# create and run the job
-sys.createAndRunJob()
+# stability analysis on the same mesh and BCs
+sys.run(sys.BUCKLING)
 
-# open database
-sys.openDatabase(sys.LINEAR)
-
-# do analysis
-sys.analyzeResults()
\ No newline at end of file
+# where the wall time went: summary per stage and a trace for chrome://tracing
+import Trace
+Trace.printSummary(sys)
+Trace.writeChrome("profiles.trace.json")
@@ -0,0 +1,15 @@
+'''
+Cores scaling benchmark of the CombinedProfile jobs
+'''
+
+workDir = "D:\\sma\\99-others\\01-AOS\\Sampaul\\final\\Project-2\\" # set the working directory here
+
+# set workdirectory
+import os
+os.chdir(workDir)
+
+from CoresBenchmark import CoresBenchmark
+
+# run the CP3 model (InputData) with 1, 2 and 4 cpus
+benchmark = CoresBenchmark(cores=(1, 2, 4), parallel="THREADS")
+benchmark.run()
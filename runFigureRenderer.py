@@ -0,0 +1,18 @@
+'''
+Rendering worker for the queued figures of headless runs
+start it with: abaqus cae noGUI=runFigureRenderer.py
+'''
+
+workDir = "D:\\sma\\99-others\\01-AOS\\Sampaul\\final\\Project-2\\" # set the working directory here
+
+# set workdirectory
+import os
+os.chdir(workDir)
+
+from FigureQueue import FigureQueue
+from FigureRenderer import FigureRenderer
+
+# print the queued figures; wait up to 10 minutes for new requests of
+# running jobs, idleTime = 0 only prints the figures queued up to now
+renderer = FigureRenderer()
+renderer.run(FigureQueue("figures.queue"), pollTime = 5., idleTime = 600.)
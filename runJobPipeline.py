@@ -0,0 +1,29 @@
+'''
+Pipeline over several Combined profiles (asyncio, Python 3 kernels):
+while a job solves, the next model is built and the previous results
+are analysed
+'''
+
+workDir = "D:\\sma\\99-others\\01-AOS\\Sampaul\\final\\Project-2\\" # set the working directory here
+
+# set workdirectory
+import os
+os.chdir(workDir)
+
+from JobPipeline import JobPipeline
+
+# profile parameter sets, all other parameters are taken from InputData
+parameters = [
+    dict(prjName="CP1", dh2=60, dw2=60, dt2=7, ds2=7),
+    dict(prjName="CP2", dh2=70, dw2=70, dt2=8, ds2=8),
+    dict(prjName="CP3", dh2=80, dw2=80, dt2=9, ds2=9),
+]
+
+# one license: one job solves at a time, the increments are logged
+pipeline = JobPipeline(parameters, step="LINEAR", maxJobs=1, pollTime=1.)
+results  = pipeline.run()
+
+# where the wall time went: summary per stage and a trace for chrome://tracing
+import Trace
+Trace.printSummary(pipeline)
+Trace.writeChrome("profiles.trace.json")
@@ -0,0 +1,34 @@
+'''
+Sweep over several Combined profiles with a bounded job pool
+'''
+
+workDir = "D:\\sma\\99-others\\01-AOS\\Sampaul\\final\\Project-2\\" # set the working directory here
+
+# set workdirectory
+import os
+os.chdir(workDir)
+
+from ProfileSweep import ProfileSweep
+
+# profile parameter sets, all other parameters are taken from InputData
+parameters = [
+    dict(prjName="CP1", dh2=60, dw2=60, dt2=7, ds2=7),
+    dict(prjName="CP2", dh2=70, dw2=70, dt2=8, ds2=8),
+    dict(prjName="CP3", dh2=80, dw2=80, dt2=9, ds2=9),
+]
+
+# batch nodes: no viewport work in the sweep, the figures are printed by
+# runFigureRenderer.py, later or in parallel
+#for parameter in parameters: parameter["headless"] = True
+
+# or a grid of variants
+#parameters = ProfileSweep.grid("CP", dh2=(60, 70, 80), l=(3000, 3700))
+
+# run the linear jobs, 2 at the same time
+sweep   = ProfileSweep(parameters, maxJobs=2)
+results = sweep.run()
+
+# where the wall time went: summary per stage and a trace for chrome://tracing
+import Trace
+Trace.printSummary(sweep)
+Trace.writeChrome("profiles.trace.json")
@@ -0,0 +1,21 @@
+'''
+Warm worker for the Combined profile, the kernel stays loaded between
+the profiles; start it with: abaqus cae noGUI=runProfileWorker.py
+the profiles are sent with ProfileClient, e.g.
+    client = ProfileClient()
+    result = client.run(dict(prjName="CP2", dh2=70, dw2=70, dt2=8, ds2=8))
+'''
+
+workDir = "D:\\sma\\99-others\\01-AOS\\Sampaul\\final\\Project-2\\" # set the working directory here
+
+# set workdirectory
+import os
+os.chdir(workDir)
+
+from ProfileWorker import ProfileWorker
+
+# serve until a client sends a shutdown request; batch clients send
+# headless=True with the parameters, the figures are then queued for
+# runFigureRenderer.py
+worker = ProfileWorker(port = 47011)
+worker.serve()
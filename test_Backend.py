@@ -0,0 +1,36 @@
+#=============================================================================
+# tests of the lazily loaded backend
+# run: python -m pytest -q
+#=============================================================================
+
+import sys
+
+import pytest
+
+import Backend
+
+# the backend module is imported on the first use, a selection drops it
+def test_select():
+    standIn = Backend.load()
+    assert standIn.__name__ == "AbaqusStandIn" and Backend.load() is standIn
+    try:
+        Backend.select("NoSuchBackend")
+        with pytest.raises(ImportError):
+            Backend.load()
+    finally:
+        Backend.select("AbaqusStandIn")
+    assert Backend.load() is standIn
+
+# the post-processing modules import without the Abaqus modules
+def test_noAbaqusImports():
+    import CombinedProfile
+    import ProfileSweep
+    for name in ("abaqus", "abaqusConstants", "AbaqusBackend"):
+        assert name not in sys.modules
+
+# constants by name, unknown names are an error
+def test_constant():
+    assert Backend.constant("THREADS") == "THREADS"
+    with pytest.raises(Exception) as error:
+        Backend.constant("NO_CONSTANT")
+    assert "Unknown Abaqus constant" in str(error.value)
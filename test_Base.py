@@ -0,0 +1,33 @@
+#=============================================================================
+# tests of the log records of the base class
+# run: python -m pytest -q
+#=============================================================================
+
+import re
+
+from Base import Base
+from InputData import InputData
+
+# the records of the log file of an object
+def readLog(obj):
+    obj.flushLog()
+    return open(obj.logFile).read().splitlines()
+
+# by default a record is hh.mm.ss|text, the tag of a pipeline run is
+# inserted between the time and the text
+def test_logFormat(workdir):
+    data = InputData()
+    data.setValues(prjName="CP3")
+    data.appendLog("untagged")
+
+    former = Base.setTagged(True)
+    try:
+        data.appendLog("tagged")
+    finally:
+        Base.setTagged(former)
+    data.appendLog("untagged again")
+
+    records = readLog(data)[-3:]
+    assert re.match(r"^\d\d\.\d\d\.\d\d\|untagged$", records[0])
+    assert re.match(r"^\d\d\.\d\d\.\d\d\|CP3\|tagged$", records[1])
+    assert re.match(r"^\d\d\.\d\d\.\d\d\|untagged again$", records[2])
@@ -0,0 +1,58 @@
+#=============================================================================
+# tests of the beam theory estimate
+# run: python -m pytest -q
+#=============================================================================
+
+import numpy as np
+import pytest
+
+import BeamTheory
+from InputData import InputData
+
+# the cross section of the default profile
+def section(data, scale = 1.):
+    return BeamTheory.sectionProperties(*[scale*getattr(data, name) for name in
+                                          ("dh1", "dw1", "dt1", "ds1", "dh2", "dw2", "dt2", "ds2")])
+
+# area of the center lines and the scaling of the section properties
+def test_sectionProperties():
+    d    = InputData()
+    area = 2.*(2.*d.dw1*d.dt1 + (d.dh1 - d.dt1)*d.ds1 + d.dh2*d.dt2) + d.dw2*d.dt2 + 2.*d.dh2*d.dt1
+    prop = section(d)
+    assert prop["area"] == pytest.approx(area)
+    assert 0. < prop["yc"] < d.dh1
+
+    # all lengths doubled: areas times 4, second moments times 16
+    double = section(d, 2.)
+    for name, factor in (("area", 4.), ("yc", 2.), ("Ixx", 16.), ("Iyy", 16.), ("shearArea", 4.)):
+        assert double[name] == pytest.approx(factor*prop[name])
+
+# the load on the upper I flanges is carried by the supports, pinned
+# supports bend five times as much as clamped ones
+def test_estimate():
+    d        = InputData()
+    clamped  = BeamTheory.estimate(d)
+    pinned   = BeamTheory.estimate(d, "pinned")
+    assert clamped["sumRFy"] == pytest.approx(d.load*1.e3*d.dw1/(d.dw1 + d.dh2))
+    assert clamped["q"]*d.l == pytest.approx(clamped["sumRFy"])
+
+    G     = d.EMod/(2.*(1. + d.nue))
+    shear = clamped["q"]*d.l**2/(8.*G*clamped["shearArea"])
+    assert pinned["maxU2Disp"] - shear == pytest.approx(5.*(clamped["maxU2Disp"] - shear))
+
+    with pytest.raises(Exception):
+        BeamTheory.estimate(d, "free")
+
+# columns of candidate geometries give the values of the single profiles
+def test_estimateOfColumns():
+    d       = InputData()
+    columns = dict((name, getattr(d, name)) for name in BeamTheory.NAMES)
+    columns["dh2"]  = np.array([60., 70., 80.])
+    columns["load"] = np.array([40., 43., 50.])
+    result = BeamTheory.estimate(columns)
+
+    for row in range(3):
+        d.setValues(dh2=columns["dh2"][row], load=columns["load"][row])
+        single = BeamTheory.estimate(d)
+        for name in ("Ixx", "sumRFy", "maxU2Disp"):
+            assert result[name][row] == pytest.approx(single[name])
@@ -0,0 +1,225 @@
+#=============================================================================
+# tests of the Combined profile on the stand-in backend
+# run: python -m pytest -q
+#=============================================================================
+
+import os
+
+import numpy as np
+import pytest
+
+import Backend
+import BeamTheory
+import FieldData
+from CombinedProfile import CombinedProfile
+
+# a default profile working in a temporary directory
+@pytest.fixture
+def profile(workdir):
+    return CombinedProfile()
+
+# buckling results of a profile from a stand-in odb with the eigenvalues
+def analyseBuckling(profile, eigenvalues):
+    standIn = Backend.load()
+    profile.headless = True
+    profile.stepType = profile.BUCKLING
+    odb = standIn.createBucklingOdb(profile, standIn.createPart(profile), eigenvalues)
+    profile.openDatabase(profile.BUCKLING)
+    profile.analyzeResults()
+    odb.close()
+    return profile
+
+# linear results of a profile from a stand-in odb of its part
+def analyseLinear(profile):
+    standIn = Backend.load()
+    profile.headless = True
+    profile.useCache = False
+    profile.stepType = profile.LINEAR
+    profile.myPart   = standIn.createPart(profile)
+    odb = standIn.createOdb(profile, profile.myPart)
+    profile.getFiberNodes()
+    profile.openDatabase(profile.LINEAR)
+    profile.analyzeResults()
+    odb.close()
+    return profile
+
+# the critical load is the eigenvalue times the reference load p1 on the
+# loaded flange halves, i.e. the total load of the beam theory (19.1 kN
+# for the default profile, not the nominal load of 43 kN)
+def test_criticalLoadOfTheReferenceLoad(profile):
+    analyseBuckling(profile, [-1.5, 2.0, 5.0])
+
+    sumRFy = BeamTheory.estimate(profile)["sumRFy"]
+    assert profile.minBuckleEV == pytest.approx(2.0)
+    assert sumRFy == pytest.approx(profile.load*1.e3*profile.dw1/(profile.dw1 + profile.dh2))
+    assert profile.criticalLoad == pytest.approx(2.0*sumRFy)
+    assert profile.asDict()["criticalLoad"] == pytest.approx(2.0*sumRFy)
+
+# with load cases the buckling step applies the case with the largest
+# total load, the critical load refers to it
+def test_criticalLoadOfTheLoadCases(profile):
+    profile.setValues(loadCases=[{"name": "Small", "load": 10.},
+                                 {"name": "Outer", "outer": 0.05, "inner": 0.01}])
+    outer, inner = profile.bucklingPressures()
+    assert (outer, inner) == (0.05, 0.01)
+
+    analyseBuckling(profile, [4.0])
+    assert profile.criticalLoad == pytest.approx(4.0*(0.05 + 0.01)*profile.dw1*profile.l)
+
+# a run from the result cache opens the database for its figures
+def test_figuresOfCachedResults(profile):
+    standIn = Backend.load()
+    profile.stepType = profile.LINEAR
+    profile.myPart   = standIn.createPart(profile)
+    odb = standIn.createOdb(profile, profile.myPart)
+    profile.getFiberNodes()
+
+    for cached in (False, True):
+        printed = len(standIn.session.printed)
+        profile.openDatabase(profile.LINEAR)
+        assert (profile.myOdb is None) == cached
+        profile.analyzeResults()
+        assert profile.myOdb is odb
+        assert len(standIn.session.printed) > printed
+    odb.close()
+
+# the old results of a job are used while its input is unchanged and the
+# job isn't running
+def test_isUpToDate(profile, oldResults):
+    oldResults(prjName="CP2", dh2=70.)
+    profile.setValues(prjName="CP2", dh2=70.)
+    profile.stepType = profile.LINEAR
+    assert profile.isUpToDate()
+
+    open("CP2-Linear.lck", "w").close()
+    assert not profile.isUpToDate()
+    os.remove("CP2-Linear.lck")
+
+    profile.setValues(load=50.)
+    assert not profile.isUpToDate()
+    profile.stepType = profile.BUCKLING
+    profile.setValues(load=43.)
+    assert not profile.isUpToDate()
+
+# the half and quarter models give the reactions of the full model, the
+# symmetric model has no resulting x force
+def test_symmetricModels(workdir):
+    results = {}
+    for symmetry in (0, 1, 2):
+        profile = CombinedProfile()
+        profile.setValues(symmetry=symmetry)
+        results[symmetry] = analyseLinear(profile)
+
+    full = results[0]
+    assert full.sumRFo[1] == pytest.approx(BeamTheory.estimate(full)["sumRFy"])
+    for symmetry in (1, 2):
+        assert results[symmetry].sumRFo[0] == 0.
+        assert results[symmetry].sumRFo[1] == pytest.approx(full.sumRFo[1])
+        assert results[symmetry].maxU2Disp == pytest.approx(full.maxU2Disp, rel=0.05)
+
+# the number of domains is a multiple of the cpus, the modes are Abaqus
+# constants
+def test_jobOptions(profile):
+    profile.setValues(numCpus=4, parallel="THREADS")
+    options = profile.jobOptions()
+    assert options["numCpus"] == 4 and options["numDomains"] == 4
+    assert options["multiprocessingMode"] == Backend.constant("THREADS")
+    assert options["memoryUnits"] == Backend.constant("PERCENTAGE")
+
+    assert profile.jobOptions(numDomains=6)["numDomains"] == 4
+    assert profile.jobOptions(numCpus=2, numDomains=7)["numDomains"] == 6
+    assert profile.jobOptions(numCpus=8, numDomains=2)["numDomains"] == 8
+    with pytest.raises(Exception):
+        profile.jobOptions(parallel="OPENMP")
+
+# built model of a profile, only its name is needed
+class Model:
+    def __init__(self, name):
+        self.name = name
+
+# the parameter groups changed since the build of the model, per step;
+# an unchanged model is kept
+def test_changedGroups(profile):
+    groups = set(["geometry", "material", "seeds", "load", "step"])
+    assert profile.changedGroups() == groups
+
+    profile.myModel = Model(profile.prjName)
+    profile.recordBuild(groups)
+    profile.recordBuild(groups, "@Linear")
+    assert profile.changedGroups() == set()
+    profile.createSystem()
+    assert profile.myModel.name == profile.prjName
+
+    profile.setValues(EMod=200000., load=50.)
+    assert profile.changedGroups() == set(["material", "load"])
+    profile.recordBuild(("load",), "@Linear")
+    assert profile.changedGroups("@Linear") == set(["material"])
+    assert profile.changedGroups("@Buckling") == groups
+
+    profile.setValues(prjName="CP9")
+    assert profile.changedGroups() == groups
+
+# each load case of the job is analysed, the results of the profile are
+# those of the governing case
+def test_loadCases(profile):
+    profile.setValues(loadCases=[{"name": "Small", "load": 20.}, {"name": "Large", "load": 60.},
+                                 {"name": "Outer", "outer": profile.pressure(30.)}])
+    results = analyseLinear(profile).loadCaseResults
+
+    assert [result["name"] for result in results] == ["Small", "Large", "Outer"]
+    share = profile.dw1/(profile.dw1 + profile.dh2)
+    assert results[0]["sumRFo"][1] == pytest.approx(20.e3*share)
+    assert results[1]["sumRFo"][1] == pytest.approx(60.e3*share)
+    assert results[2]["sumRFo"][1] == pytest.approx(15.e3*share)
+    assert results[1]["maxU2Disp"] == pytest.approx(3.*results[0]["maxU2Disp"])
+
+    assert profile.maxU2Disp == results[1]["maxU2Disp"]
+    assert profile.sumRFo == results[1]["sumRFo"]
+
+# the trimmed output has RF at the supports only and no stresses, the
+# results equal those of the full output
+def test_trimmedOutput(workdir):
+    results = []
+    for fullOutput in (True, False):
+        profile = CombinedProfile()
+        profile.setValues(fullOutput=fullOutput)
+        results.append(analyseLinear(profile))
+    assert results[1].sumRFo == pytest.approx(results[0].sumRFo)
+    assert results[1].maxU2Disp == pytest.approx(results[0].maxU2Disp)
+
+    standIn = Backend.load()
+    part    = standIn.createPart(profile)
+    odb     = standIn.createOdb(profile, part)
+    fields  = odb.steps["Linear"].frames[-1].fieldOutputs
+    assert sum([len(block.nodeLabels) for block in fields["RF"].bulkDataBlocks]) == \
+        len(part.nodeSets["SUPPORTS"])
+    assert "S" not in fields
+    odb.close()
+
+# the Mises envelope holds the maximum of each element over its points,
+# section points and frames, the critical elements are the largest ones
+def test_stressEnvelope(profile):
+    labels   = np.array([3, 1, 3, 2, 1, 3])
+    mises    = np.array([50., 20., 80., 60., 70., 10.])
+    points   = np.array([1, 1, 2, 1, 2, 1])
+    sections = np.array([1, 5, 5, 1, 1, 5])
+    frames   = np.array([0, 0, 1, 1, 1, 2])
+    profile.evalStress(labels, points, sections, mises, frames, k=2)
+
+    assert profile.misesEnvelope.keys() == [1, 2, 3]
+    assert profile.misesEnvelope.column("Mises").tolist() == [70., 60., 80.]
+    assert profile.elementX == 3 and profile.maxStress == 80.
+    assert profile.criticalElements == [
+        {"element": 3, "mises": 80., "integrationPoint": 2, "sectionPoint": 5, "frame": 1},
+        {"element": 1, "mises": 70., "integrationPoint": 2, "sectionPoint": 1, "frame": 1}]
+
+# the ULS proof of a stand-in job reads the stresses of all frames
+def test_limitStateULS(profile):
+    profile.setValues(limitState="ULS", numCritical=5)
+    analyseLinear(profile)
+
+    critical = [element["mises"] for element in profile.criticalElements]
+    assert len(critical) == 5 and critical == sorted(critical, reverse=True)
+    assert profile.maxStress == critical[0]
+    assert profile.maxStress <= FieldData.misesStress(np.array([[100., 30., 10.]]))[0]
+    assert len(profile.misesEnvelope) == len(profile.myPart.elements)
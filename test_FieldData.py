@@ -0,0 +1,54 @@
+#=============================================================================
+# tests of the bulk access to the field outputs
+# run: python -m pytest -q
+#=============================================================================
+
+import numpy as np
+import pytest
+
+import Backend
+import FieldData
+
+# the blocks of a nodal field are joined in their order, the data of a
+# block may be flat
+def test_nodalData():
+    standIn = Backend.load()
+    labels  = np.arange(1, 251, dtype=np.int64)
+    u       = np.arange(750, dtype=float).reshape(250, 3)
+    blocks  = standIn.nodalBlocks(labels, u, 100)
+    blocks[1].data = blocks[1].data.ravel()
+
+    readLabels, data = FieldData.nodalData(standIn.FieldOutput("U", blocks))
+    assert [len(block.nodeLabels) for block in blocks] == [100, 100, 50]
+    assert np.array_equal(readLabels, labels)
+    assert np.array_equal(data, u)
+
+    readLabels, data = FieldData.nodalData(standIn.FieldOutput("RF", []))
+    assert readLabels.shape == (0,) and data.shape == (0, 3)
+
+# element fields: the section point of each block, integration point 0
+# for blocks without, the Mises stress of the block or computed
+def test_elementData():
+    standIn = Backend.load()
+    s       = np.array([[100., 30., 10.], [-50., 0., 0.]])
+    blocks  = [standIn.FieldBulkData(s, elementLabels=np.array([1, 2]),
+                                     integrationPoints=np.array([1, 1]),
+                                     sectionPoint=standIn.SectionPoint(5)),
+               standIn.FieldBulkData(s, elementLabels=np.array([3, 4]),
+                                     mises=np.array([1., 2.]))]
+
+    labels, points, sections, mises, data = FieldData.elementData(standIn.FieldOutput("S", blocks))
+    assert labels.tolist() == [1, 2, 3, 4]
+    assert points.tolist() == [1, 1, 0, 0]
+    assert sections.tolist() == [5, 5, 0, 0]
+    assert mises[2:].tolist() == [1., 2.]
+    assert mises[:2] == pytest.approx([np.sqrt(100.**2 - 100.*30. + 30.**2 + 3.*10.**2), 50.])
+    assert np.array_equal(data, np.vstack((s, s)))
+
+# the Mises stress of shell and solid components agree for a plane state
+def test_misesStress():
+    shell = np.array([[120., -40., 25.], [0., 0., 0.]])
+    solid = np.column_stack((shell[:,:2], np.zeros(2), shell[:,2], np.zeros((2, 2))))
+    assert FieldData.misesStress(shell) == pytest.approx(FieldData.misesStress(solid))
+    assert FieldData.misesStress(np.array([[0., 0., 0., 10., 0., 0.]])) == \
+        pytest.approx([np.sqrt(3.)*10.])
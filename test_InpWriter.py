@@ -0,0 +1,136 @@
+#=============================================================================
+# tests of the input file writer, no Abaqus needed
+# run: python -m pytest -q
+#=============================================================================
+
+import numpy as np
+import pytest
+
+from InputData import InputData
+from InpWriter import InpWriter
+
+# keyword blocks of an input file: [(keyword line, data lines)]
+def readBlocks(filename):
+    blocks = []
+    for line in open(filename):
+        line = line.strip()
+        if line.startswith("**"): continue
+        if line.startswith("*"): blocks.append((line, []))
+        elif len(blocks) > 0:    blocks[-1][1].append(line)
+    return blocks
+
+# labels of the data lines of a set or surface
+def readLabels(lines):
+    return [int(item) for line in lines for item in line.split(",") if item.strip()]
+
+# the keyword lines starting with a keyword
+def keywords(blocks, keyword):
+    return [line for line, data in blocks if line.startswith(keyword)]
+
+# the data of the block with a keyword line
+def blockData(blocks, keyword):
+    for line, data in blocks:
+        if line == keyword: return data
+    raise KeyError(keyword)
+
+# area of the (rectangular) elements with the labels
+def elementArea(mesh, labels):
+    corners = mesh.nodes[mesh.elements[np.asarray(labels) - 1] - 1]
+    edge1   = corners[:,1] - corners[:,0]
+    edge2   = corners[:,3] - corners[:,0]
+    return np.linalg.norm(np.cross(edge1, edge2), axis=1).sum()
+
+# full model with one static step: mesh, sets, surfaces and sections
+def test_fullModel(workdir):
+    data   = InputData()
+    writer = InpWriter(data)
+    blocks = readBlocks(writer.write())
+    mesh   = writer.mesh
+
+    nodes    = blockData(blocks, "*Node")
+    elements = blockData(blocks, "*Element, type=S4R")
+    assert len(nodes) == len(mesh.nodes)
+    assert len(elements) == len(mesh.elements)
+
+    # element sets: the sections and the loaded flange halves
+    elsets = keywords(blocks, "*Elset")
+    for name in ("I-SECTION-FLANGE", "I-SECTION-WEB", "T-SECTION"):
+        assert "*Elset, elset=%s" % name in elsets
+    assert "*Elset, elset=T-SECTION-SYM" not in elsets
+
+    # node sets, the labels exist
+    nsets = keywords(blocks, "*Nset")
+    assert nsets == ["*Nset, nset=FIBER", "*Nset, nset=RIGID", "*Nset, nset=SUPPORTS"]
+    supports = readLabels(blockData(blocks, "*Nset, nset=SUPPORTS"))
+    assert len(supports) > 0 and max(supports) <= len(mesh.nodes)
+
+    # the surfaces refer to the SPOS and SNEG sets of their region, the
+    # elements of a region cover the flange halves of width dw1
+    for region in ("OUTER", "INNER"):
+        names   = ["LOAD-%s-%s" % (region, side) for side in ("SPOS", "SNEG")
+                   if "LOAD-%s-%s" % (region, side) in mesh.elementSets]
+        surface = blockData(blocks, "*Surface, type=ELEMENT, name=LOAD-%s" % region)
+        assert len(names) > 0
+        assert surface == ["%s, %s" % (name, name[-4:]) for name in names]
+        labels = np.concatenate([readLabels(blockData(blocks, "*Elset, elset=" + name))
+                                 for name in names])
+        assert elementArea(mesh, labels) == pytest.approx(data.dw1*data.l)
+
+    # one shell section per section set with its thickness
+    sections = dict((line, data) for line, data in blocks if line.startswith("*Shell Section"))
+    assert sorted(sections) == ["*Shell Section, elset=I-SECTION-FLANGE, material=Steel",
+                                "*Shell Section, elset=I-SECTION-WEB, material=Steel",
+                                "*Shell Section, elset=T-SECTION, material=Steel"]
+    assert sections["*Shell Section, elset=T-SECTION, material=Steel"] == ["%.8g, 5" % data.dt2]
+
+    # static step with the pressure p1 and the trimmed output
+    assert "*Step, name=Linear, nlgeom=NO" in keywords(blocks, "*Step")
+    assert keywords(blocks, "*Load Case") == []
+    dsload = blockData(blocks, "*Dsload")
+    assert dsload == ["LOAD-OUTER, P, %.8g" % data.p1, "LOAD-INNER, P, %.8g" % data.p1]
+    assert blockData(blocks, "*Node Output") == ["U"]
+    assert blockData(blocks, "*Node Output, nset=SUPPORTS") == ["RF"]
+    assert keywords(blocks, "*Element Output") == []
+
+# half model with load cases: symmetry set, perturbation step, a load case
+# per case and the stress output of the ULS proof
+def test_symmetricModelWithLoadCases(workdir):
+    data = InputData()
+    data.setValues(symmetry=data.HALF, limitState="ULS",
+                   loadCases=[{"name": "LC1", "load": 60.},
+                              {"name": "LC2", "outer": 0.05}])
+    writer = InpWriter(data)
+    blocks = readBlocks(writer.write())
+
+    assert "*Elset, elset=T-SECTION-SYM" in keywords(blocks, "*Elset")
+    assert "*Shell Section, elset=T-SECTION-SYM, material=Steel" in keywords(blocks, "*Shell Section")
+    assert "*Nset, nset=XSYMM" in keywords(blocks, "*Nset")
+    assert "*Nset, nset=ZSYMM" not in keywords(blocks, "*Nset")
+
+    # the nodes of the symmetry set lie on the plane x = 0
+    xsymm = np.array(readLabels(blockData(blocks, "*Nset, nset=XSYMM")))
+    assert np.allclose(writer.mesh.nodes[xsymm - 1, 0], 0.)
+
+    assert keywords(blocks, "*Step") == ["*Step, name=Linear, perturbation"]
+    assert keywords(blocks, "*Load Case") == ["*Load Case, name=LC1", "*Load Case, name=LC2"]
+    assert len(keywords(blocks, "*End Load Case")) == 2
+    assert len(keywords(blocks, "*Boundary")) == 2
+
+    # the cases have their pressures, LC2 loads the outer halves only
+    loads = [lines for line, lines in blocks if line == "*Dsload"]
+    p = data.pressure(60.)
+    assert loads[0] == ["LOAD-OUTER, P, %.8g" % p, "LOAD-INNER, P, %.8g" % p]
+    assert loads[1] == ["LOAD-OUTER, P, 0.05", "LOAD-INNER, P, 0"]
+    assert blockData(blocks, "*Element Output, directions=YES") == ["S"]
+
+# quarter model: both symmetry sets, supports at one end only
+def test_quarterModel(workdir):
+    data = InputData()
+    data.setValues(symmetry=data.QUARTER)
+    writer = InpWriter(data)
+    blocks = readBlocks(writer.write())
+
+    nsets = keywords(blocks, "*Nset")
+    assert "*Nset, nset=XSYMM" in nsets and "*Nset, nset=ZSYMM" in nsets
+    supports = np.array(readLabels(blockData(blocks, "*Nset, nset=SUPPORTS")))
+    assert np.allclose(writer.mesh.nodes[supports - 1, 2], 0.)
@@ -0,0 +1,67 @@
+#=============================================================================
+# tests of the input data: profile files and the column-wise checks
+# run: python -m pytest -q
+#=============================================================================
+
+import json
+
+import numpy as np
+import pytest
+
+from InputData import InputData
+
+# profile file with a valid row, an invalid one (web thicker than the
+# flange) and one with a blank thickness
+CSV = """prjName;dh1;dt1;ds1;dh2;load
+CP1;120;6.3;4.4;60;40
+CP2;120;6.3;8.0;70;45
+CP3;120;;4.4;80;50
+"""
+
+# the numeric columns are read as floats, blank cells as NaN
+def test_readColumns(workdir):
+    open("profiles.csv", "w").write(CSV)
+    columns = InputData.readColumns("profiles.csv")
+    assert list(columns["prjName"]) == ["CP1", "CP2", "CP3"]
+    assert columns["dh2"].dtype == float
+    assert np.isnan(columns["dt1"][2])
+
+# the column-wise check finds the invalid and the incomplete rows
+def test_checkBatch(workdir):
+    open("profiles.csv", "w").write(CSV)
+    mask, reasons = InputData().checkBatch(InputData.readColumns("profiles.csv"))
+    assert mask.tolist() == [True, False, False]
+    assert reasons[0] == ""
+    assert reasons[1].startswith("Web length must be greater than I section thickness")
+    assert reasons[2] == "missing value: dt1"
+
+# the batch helper variables equal those of the single profiles
+def test_prepareBatch(workdir):
+    data    = InputData()
+    columns = {"dh2": [60., 70., 80.], "dw2": [60., 70., 80.], "symmetry": [0, 1, 2]}
+    v, mask, reasons = data.prepareBatch(columns)
+    assert mask.all()
+    for row in range(3):
+        data.setValues(dh2=columns["dh2"][row], dw2=columns["dw2"][row],
+                       symmetry=columns["symmetry"][row])
+        for name in ("x1_I", "y1_T", "lm", "lengthSeed", "cFSeedModel"):
+            assert v[name][row] == pytest.approx(getattr(data, name))
+
+# the rows of a JSON file are converted to the parameter types, a row is
+# loaded by its prjName
+def test_loadJson(workdir):
+    rows = [{"prjName": "A", "dh2": "60", "iFSeed": "2"}, {"prjName": "B", "dh2": 75}]
+    json.dump(rows, open("profiles.json", "w"))
+    data = InputData()
+    data.Load("profiles.json", "B")
+    assert data.prjName == "B" and data.dh2 == 75.
+    assert list(InputData.readProfiles("profiles.json"))[0] == {"prjName": "A", "dh2": 60.,
+                                                                "iFSeed": 2}
+
+# a failed check raises its error, a valid input is accepted silently
+def test_check(workdir, capsys):
+    data = InputData()
+    data.setValues(dh2=70.)
+    assert capsys.readouterr().out == ""
+    with pytest.raises(Exception):
+        data.setValues(dt1=-1.)
@@ -0,0 +1,106 @@
+#=============================================================================
+# tests of the asyncio job pipeline on the stand-in backend
+# run: python -m pytest -q
+#=============================================================================
+
+import asyncio
+
+from JobPipeline import JobHandle, JobPipeline
+
+# increment lines of a .sta file
+STA = """ SUMMARY OF JOB INFORMATION:
+ STEP  INC ATT SEVERE EQUIL TOTAL  TOTAL      STEP       INC OF
+              DISCON ITERS ITERS  TIME/    TIME/LPF    TIME/LPF
+     1     1   1     0     2     2  0.250      0.250      0.2500
+     1     2   1U    0     4     4  0.250      0.250      0.1250
+"""
+
+# job of a profile, finished after some polls
+class Job:
+    def __init__(self, status, polls = 3):
+        self.prjName = "CP1"
+        self.jobName = "CP1-Linear"
+        self.status  = status
+        self.polls   = polls
+
+    def jobFinished(self):
+        self.polls -= 1
+        return self.polls <= 0
+
+    def finishJob(self):
+        return self.status
+
+# the handle streams the increments of the .sta file and returns the
+# status of the finished job
+def test_jobHandle(workdir):
+    open("CP1-Linear.sta", "w").write(STA)
+
+    async def follow():
+        handle  = JobHandle(Job("COMPLETED"), pollTime=0.001)
+        records = [record async for record in handle.progress()]
+        return records, await handle
+
+    records, status = asyncio.run(follow())
+    assert status == "COMPLETED"
+    assert [(record["step"], record["increment"], record["attempt"]) for record in records] == \
+        [(1, 1, "1"), (1, 2, "1U")]
+    assert records[0]["stepTime"] == 0.25 and records[0]["remaining"] is not None
+
+# the old results are analysed, the profiles that can't be built or
+# have invalid input are recorded with their errors
+def test_errorsAreRecorded(oldResults):
+    oldResults(prjName="CP1")
+    pipeline = JobPipeline([{"prjName": "CP2"}, {"prjName": "CP1"}, {"prjName": "CP3", "ds1": -1.}],
+                           pollTime=0.)
+    results  = pipeline.run()
+
+    assert [profile.prjName for profile in results] == ["CP1"]
+    assert [profile.prjName for profile in pipeline.failed] == ["CP2", "CP3"]
+    assert "modelling" in pipeline.failed[0].error
+
+    pipeline.flushLog()
+    assert "> pipeline results: 1 completed, 2 failed" in open(pipeline.logFile).read()
+
+# profile whose job ends with a status, the model build does nothing,
+# the analysis sets the values of the summary table
+class Profile(Job):
+    def __init__(self, prjName, status):
+        Job.__init__(self, status)
+        self.prjName  = prjName
+        self.jobName  = prjName + "-Linear"
+        self.stepType = 0
+        self.analysed = False
+
+    def isUpToDate(self):
+        return False
+
+    def submitJob(self, **options):
+        pass
+
+    def openDatabase(self, stepType):
+        pass
+
+    def analyzeResults(self):
+        self.analysed  = True
+        self.sumRFo    = [0., 1.e3, 0.]
+        self.maxU2Disp = None
+
+    def closeDatabase(self):
+        pass
+
+# pipeline over the profiles of the parameter sets {"prjName", "status"}
+class Pipeline(JobPipeline):
+    def prepare(self, parameter):
+        return Profile(parameter["prjName"], parameter["status"])
+
+# completed jobs are analysed, jobs that are not completed fail their
+# profile, the pipeline goes on
+def test_jobStatus(workdir):
+    pipeline = Pipeline([{"prjName": "CP1", "status": "ABORTED"},
+                         {"prjName": "CP2", "status": "COMPLETED"},
+                         {"prjName": "CP3", "status": "TERMINATED"}], maxJobs=2, pollTime=0.)
+    results  = pipeline.run()
+
+    assert [profile.prjName for profile in results] == ["CP2"] and results[0].analysed
+    assert [(profile.prjName, profile.error) for profile in pipeline.failed] == \
+        [("CP1", "job status ABORTED"), ("CP3", "job status TERMINATED")]
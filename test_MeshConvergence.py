@@ -0,0 +1,62 @@
+#=============================================================================
+# tests of the mesh convergence study, without the solver
+# run: python -m pytest -q
+#=============================================================================
+
+import json
+
+import pytest
+
+import MeshConvergence
+from MeshConvergence import MeshConvergence as Study
+
+# values f(h) = f0 + C*h**p are extrapolated to f0 with the order p
+def test_extrapolate():
+    h = [1., 0.5, 0.25]
+    for f0, c, p in ((2.5, -0.4, 2.), (1., 3., 1.), (-7., 0.01, 1.5)):
+        value, order = MeshConvergence.extrapolate(h, [f0 + c*x**p for x in h])
+        assert value == pytest.approx(f0)
+        assert order == pytest.approx(p, rel=1.e-6)
+
+    # oscillating and constant values: the finest value, no order
+    assert MeshConvergence.extrapolate(h, [1., 2., 1.5]) == (1.5, None)
+    assert MeshConvergence.extrapolate(h, [1., 1., 1.]) == (1., None)
+
+# results of the levels of a study, the displacements converge with
+# order 2 to 1.0 and 0.8 mm
+def study(tol, workdir):
+    result = Study(levels=(1, 2, 4, 8), tol=tol, seedFile=str(workdir / "meshSeeds.json"))
+    result.family  = "CP2"
+    result.results = []
+    for level in result.levels:
+        h     = 1./level
+        seeds = dict((name, 10*level) for name in MeshConvergence.SEEDS)
+        seeds.update(level=level, maxElement=1000*level**2,
+                     maxU2Disp=1. - 0.2*h**2, maxU2FiberDisp=0.8 - 0.1*h**2)
+        result.results.append(seeds)
+    return result
+
+# the coarsest level within the tolerance is selected and recorded
+# beside the seeds of other families
+def test_select(workdir):
+    json.dump({"CP1": {"iFSeed": 5}}, open("meshSeeds.json", "w"))
+
+    convergence = study(0.02, workdir)
+    convergence.select()
+    assert convergence.converged["level"] == 4
+    assert convergence.extrapolated["maxU2Disp"] == pytest.approx(1.)
+
+    seeds = json.load(open("meshSeeds.json"))
+    assert sorted(seeds) == ["CP1", "CP2"]
+    assert seeds["CP2"]["iFSeed"] == 40 and seeds["CP2"]["maxElement"] == 16000
+    assert seeds["CP2"]["tol"] == 0.02
+
+# no level within a tight tolerance: nothing is recorded
+def test_notConverged(workdir):
+    convergence = study(1.e-4, workdir)
+    convergence.select()
+    assert convergence.converged is None
+    assert not (workdir / "meshSeeds.json").exists()
+
+    with pytest.raises(Exception):
+        Study(levels=(1, 2))
@@ -0,0 +1,76 @@
+#=============================================================================
+# tests of the spatial node index
+# run: python -m pytest -q
+#=============================================================================
+
+import numpy as np
+import pytest
+
+import Backend
+from InputData import InputData
+from NodeIndex import NodeIndex
+
+# random nodes of a box with shuffled labels
+def randomNodes(n = 2000, seed = 1):
+    random      = np.random.RandomState(seed)
+    labels      = random.permutation(n) + 1
+    coordinates = random.uniform((-50., 0., 0.), (50., 120., 600.), (n, 3))
+    return labels, coordinates
+
+# the nodes near a line equal those of a search over all nodes, sorted by
+# their label
+def test_nearLine():
+    labels, coordinates = randomNodes()
+    index = NodeIndex(labels, coordinates)
+    for x, y, radius, zmin, zmax in ((0., 60., 5., None, None), (-50., 0., 8., 100., 300.),
+                                     (200., 60., 5., None, None)):
+        found = index.nearLine(x, y, radius, zmin, zmax)
+        c     = coordinates
+        mask  = (c[:,0] - x)**2 + (c[:,1] - y)**2 <= radius**2
+        if zmin is not None: mask &= (c[:,2] >= zmin) & (c[:,2] <= zmax)
+        assert np.array_equal(index.labels[found], np.sort(labels[mask]))
+
+# the nodes near a point, with any cell size
+def test_nearPoint():
+    labels, coordinates = randomNodes()
+    point = coordinates[17]
+    for cellSize in (None, 1., 1000.):
+        found = NodeIndex(labels, coordinates, cellSize).nearPoint(point, 20.)
+        mask  = ((coordinates - point)**2).sum(axis=1) <= 20.**2
+        assert np.array_equal(labels[found], np.sort(labels[mask]))
+    assert len(NodeIndex(np.zeros(0), np.zeros((0,3))).nearPoint(point, 20.)) == 0
+
+# the index of a part has all its nodes, the fiber line of the profile
+# is found on it
+def test_fromNodes(workdir):
+    data  = InputData()
+    part  = Backend.load().createPart(data)
+    index = NodeIndex.fromNodes(part.nodes)
+    assert len(index) == len(part.nodes)
+    assert np.array_equal(index.coordinates, part.mesh.nodes)
+
+    fiber = index.nearLine(-data.x1_I, 0., 1.)
+    assert len(fiber) > 0
+    assert np.allclose(index.coordinates[fiber,:2], (-data.x1_I, 0.))
+
+# the index of an odb file is read once, at most MAXODBS are kept
+def test_fromOdb(workdir):
+    standIn = Backend.load()
+    data    = InputData()
+    part    = standIn.createPart(data)
+    names   = ["CP%d.odb" % i for i in range(NodeIndex.MAXODBS + 1)]
+    odbs    = []
+    for name in names:
+        open(name, "w").write(name)
+        odbs.append(standIn.createOdb(data, part, name))
+
+    first = NodeIndex.fromOdb(odbs[0])
+    assert len(first) == len(part.nodes)
+    assert NodeIndex.fromOdb(odbs[0]) is first
+    for odb in odbs[1:]: NodeIndex.fromOdb(odb)
+    assert NodeIndex.fromOdb(odbs[0]) is not first
+
+    # an odb without a file isn't kept
+    odb = standIn.createOdb(data, part, "CP-nofile.odb")
+    assert NodeIndex.fromOdb(odb) is not NodeIndex.fromOdb(odb)
+    for odb in odbs + [odb]: odb.close()
@@ -0,0 +1,36 @@
+#=============================================================================
+# tests of the label-sorted node store
+# run: python -m pytest -q
+#=============================================================================
+
+import numpy as np
+import pytest
+
+from NodeStore import NodeStore
+
+# a store of unsorted labels is sorted and behaves like a dict
+def test_dictAccess():
+    store = NodeStore([30, 10, 20], [[3., 3., 3.], [1., 1., 1.], [2., 2., 2.]],
+                      ("U1", "U2", "U3"))
+    assert len(store) == 3
+    assert store.keys() == [10, 20, 30] and list(store) == [10, 20, 30]
+    assert store[20] == (2., 2., 2.)
+    assert list(store.items())[0] == (10, (1., 1., 1.))
+    assert 30 in store and 40 not in store
+    assert store.get(40) is None and store.get(40, ()) == ()
+    with pytest.raises(KeyError):
+        store[5]
+
+# rows of the labels, missing ones are skipped; columns are views
+def test_rowsAndColumns():
+    store = NodeStore(np.arange(1, 6), np.arange(15.).reshape(5, 3), ("U1", "U2", "U3"))
+    assert store.rows([5, 7, 1, 0]).tolist() == [4, 0]
+    assert store.row(3) == 2 and store.row(9) == -1
+    assert store.column("U2").tolist() == [1., 4., 7., 10., 13.]
+    assert np.shares_memory(store.column(2), store.data)
+
+    selected = store.select([4, 2, 8])
+    assert selected.keys() == [2, 4] and selected.columns == store.columns
+    assert selected[4] == (9., 10., 11.)
+    assert len(NodeStore().rows([1, 2])) == 0
+    assert store.nbytes() == 5*8 + 15*8
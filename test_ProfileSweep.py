@@ -0,0 +1,44 @@
+#=============================================================================
+# tests of the sweep driver on the stand-in backend
+# run: python -m pytest -q
+#=============================================================================
+
+import Backend
+from Base import Base
+from ProfileSweep import ProfileSweep
+
+# all combinations of the values, the names are numbered
+def test_grid():
+    parameters = ProfileSweep.grid("S", dh2=(60, 70), dt2=(7, 8, 9))
+    assert len(parameters) == 6
+    assert parameters[0] == {"prjName": "S-001", "dh2": 60, "dt2": 7}
+    assert parameters[-1] == {"prjName": "S-006", "dh2": 70, "dt2": 9}
+    assert ProfileSweep.grid(dh2=(60,), prjName=("X",)) == [{"prjName": "X", "dh2": 60}]
+
+# the old results of a profile are analysed, the errors of the others are
+# recorded and the sweep goes on; the stand-in can't build models
+def test_errorsAreRecorded(oldResults):
+    odb     = oldResults(prjName="CP1", dh2=70.)
+    sweep   = ProfileSweep([{"prjName": "CP1", "dh2": 70.},
+                            {"prjName": "CP2"},
+                            {"prjName": "CP3", "dt1": -1.}], maxJobs=2, pollTime=0.)
+    results = sweep.run()
+
+    assert [profile.prjName for profile in results] == ["CP1"]
+    assert results[0].sumRFo[1] > 0.
+    assert [profile.prjName for profile in sweep.failed] == ["CP2", "CP3"]
+    assert "modelling" in sweep.failed[0].error and "non-negative" in sweep.failed[1].error
+    assert odb.name not in Backend.load().session.odbs
+
+    # the summary table, the records of the jobs are tagged during the run
+    sweep.flushLog()
+    log = open(sweep.logFile).read()
+    assert "> sweep results: 1 completed, 2 failed" in log
+    assert "|CP1-Linear|" in log
+    assert "             CP3 failed: " in log
+    assert not Base.setTagged(False)
+
+# missing values are printed as '-'
+def test_column():
+    assert ProfileSweep.column(None) == "%12s" % "-"
+    assert ProfileSweep.column(1.23456) == "       1.235"
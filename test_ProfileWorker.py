@@ -0,0 +1,70 @@
+#=============================================================================
+# tests of the profile worker and its client over a local socket
+# run: python -m pytest -q
+#=============================================================================
+
+import threading
+
+import pytest
+
+import Backend
+from ProfileClient import ProfileClient
+from ProfileWorker import ProfileWorker
+
+# worker analysing the linear step of a synthetic model of the stand-in
+# backend instead of building and solving the model
+class SimulatedWorker(ProfileWorker):
+    def solve(self, profile, stepType):
+        if stepType != profile.LINEAR:
+            raise Exception("error: the stand-in backend simulates the linear step only")
+
+        standIn = Backend.load()
+        profile.stepType = stepType
+        profile.useCache = False        # the synthetic odb has no file
+        profile.myPart   = standIn.createPart(profile)
+        odb = standIn.createOdb(profile, profile.myPart)
+        profile.getFiberNodes()
+        profile.openDatabase(stepType)
+        profile.analyzeResults()
+        odb.close()
+
+# worker serving on a free port in a thread, the client talks to it and
+# shuts it down at the end
+@pytest.fixture
+def client(workdir):
+    worker = SimulatedWorker(port = 0)
+    host, port = worker.listen()
+    thread = threading.Thread(target=worker.serve)
+    thread.start()
+
+    client = ProfileClient(host, port, timeout = 30.)
+    yield client
+    response = client.shutdown()
+    thread.join(30.)
+    assert response["status"] == "ok" and response["command"] == "shutdown"
+    assert not thread.is_alive()
+
+# ping and two runs of a warm profile
+def test_roundTrip(client):
+    assert client.ping()
+
+    result = client.run({"prjName": "CP2", "load": 60., "headless": True})
+    assert result["prjName"] == "CP2"
+    assert result["LINEAR"]["sumRFo"][1] == pytest.approx(60.e3*64./(64. + 80.))
+
+    # the load of the former request doesn't leak into this one
+    result = client.run({"prjName": "CP2", "headless": True})
+    assert result["LINEAR"]["sumRFo"][1] == pytest.approx(43.e3*64./(64. + 80.))
+
+# failed requests are answered with the error, the worker goes on
+def test_errors(client):
+    with pytest.raises(Exception) as error:
+        client.run({"prjName": "CP2", "dt1": -1.})
+    assert "non-negative" in str(error.value)
+
+    response = client.request("unknown")
+    assert response["status"] == "error" and "Unknown command" in response["error"]
+
+    with pytest.raises(Exception):
+        client.run({"prjName": "CP2", "headless": True}, ("BUCKLING",))
+    assert client.ping()
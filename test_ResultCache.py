@@ -0,0 +1,63 @@
+#=============================================================================
+# tests of the columnar result cache
+# run: python -m pytest -q
+#=============================================================================
+
+import os
+
+import numpy as np
+import pytest
+
+from ResultCache import ResultCache
+
+# columns of a small linear result
+def columns():
+    return {"U.labels": np.arange(1, 6, dtype=np.int64),
+            "U.data"  : np.linspace(0., 1., 15).reshape(5, 3),
+            "S.mises" : np.zeros(0)}
+
+# the columns are read back with their types and shapes, the meta data
+# with the header
+def test_roundTrip(workdir):
+    ResultCache.write("CP1.rcache", columns(), {"job": "CP1-Linear"})
+    cache = ResultCache("CP1.rcache")
+    assert cache.keys() == ["S.mises", "U.data", "U.labels"]
+    assert cache.meta == {"job": "CP1-Linear"}
+    for name, array in columns().items():
+        assert cache[name].dtype == array.dtype
+        assert np.array_equal(cache[name], array)
+    assert cache.get("RF.data") is None
+    assert not os.path.exists("CP1.rcache.tmp")
+
+# a changed byte of a column is found by its checksum, unless the check
+# is switched off
+def test_checksum(workdir):
+    ResultCache.write("CP1.rcache", columns())
+    offset = ResultCache("CP1.rcache").readHeader()["columns"]["U.data"]["offset"]
+    f = open("CP1.rcache", "r+b")
+    f.seek(offset + 3)
+    f.write(b"\xff")
+    f.close()
+
+    with pytest.raises(Exception) as error:
+        ResultCache("CP1.rcache")["U.data"]
+    assert "checksum" in str(error.value)
+    assert np.array_equal(ResultCache("CP1.rcache")["U.labels"], columns()["U.labels"])
+    assert ResultCache("CP1.rcache", verify=False)["U.data"].shape == (5, 3)
+
+# the cache belongs to the odb it was written from, a rewritten odb
+# invalidates it, a missing odb (archived job) doesn't
+def test_isValid(workdir):
+    open("CP1.odb", "wb").write(b"odb")
+    ResultCache.write("CP1.rcache", columns(), odbName="CP1.odb")
+    assert ResultCache("CP1.rcache").isValid("CP1.odb")
+
+    open("CP1.odb", "wb").write(b"new odb")
+    assert not ResultCache("CP1.rcache").isValid("CP1.odb")
+
+    os.remove("CP1.odb")
+    assert ResultCache("CP1.rcache").isValid("CP1.odb")
+
+    open("CP2.rcache", "wb").write(b"no cache")
+    assert not ResultCache("CP2.rcache").isValid()
+    assert not ResultCache("CP3.rcache").isValid()
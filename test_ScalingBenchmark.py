@@ -0,0 +1,30 @@
+#=============================================================================
+# tests of the scaling benchmark on small stand-in models
+# run: python -m pytest -q
+#=============================================================================
+
+import ScalingBenchmark
+from ScalingBenchmark import ScalingBenchmark as Benchmark
+
+# all cases run on all sizes, the table is written to the CSV file
+def test_run(workdir):
+    benchmark = Benchmark(sizes=(1000, 4000), repeat=1)
+    results   = benchmark.run()
+
+    assert [result["case"] for result in results] == 2*list(ScalingBenchmark.CASES)
+    assert results[0]["nodes"] < results[-1]["nodes"]
+    assert all([result["seconds"] >= 0. for result in results])
+    lines = open("scalingBenchmark.csv").read().splitlines()
+    assert lines[0] == "case;nodes;elements;seconds" and len(lines) == 9
+
+# the first comparison writes the baseline, a slower case is a regression
+def test_compare(workdir):
+    benchmark = Benchmark()
+    benchmark.results = [{"case": "getFiberNodes", "nodes": 1000, "elements": 900, "seconds": 0.1},
+                         {"case": "getMaxDisp",    "nodes": 1000, "elements": 900, "seconds": 0.001}]
+    assert benchmark.compare("baseline.csv") == []
+
+    benchmark.results[0]["seconds"] = 0.2
+    benchmark.results[1]["seconds"] = 0.005
+    assert benchmark.compare("baseline.csv") == [("getFiberNodes", 1000, 0.1, 0.2)]
+    assert benchmark.compare("baseline.csv", factor=2.5) == []
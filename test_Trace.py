@@ -0,0 +1,92 @@
+#=============================================================================
+# tests of the timing instrumentation
+# run: python -m pytest -q
+#=============================================================================
+
+import json
+import threading
+
+import pytest
+
+import Trace
+
+# empty trace records for each test
+@pytest.fixture(autouse=True)
+def trace():
+    Trace.enable()
+    Trace.reset()
+    yield
+    Trace.enable()
+    Trace.reset()
+
+# the complete events of the Chrome trace: [(name, args)]
+def events():
+    Trace.writeChrome("trace.json")
+    return [(event["name"], event["args"]) for event in json.load(open("trace.json"))["traceEvents"]
+            if event["ph"] == "X"]
+
+# object with a traced method, like a profile
+class Stage:
+    prjName = "CP1"
+
+    @Trace.traced
+    def read(self, n):
+        Trace.count("nodes", n)
+        return n
+
+# the counts of a block go to all its open spans and to the totals, a
+# failed block records its error
+def test_spans(workdir):
+    with Trace.Span("outer", job="CP1-Linear"):
+        Trace.count("findAt")
+        with Trace.Span("inner"):
+            Trace.count("findAt", 2)
+    with pytest.raises(ValueError):
+        with Trace.Span("failed"):
+            raise ValueError("no odb")
+
+    records = dict(events())
+    assert records["inner"] == {"findAt": 2}
+    assert records["outer"] == {"job": "CP1-Linear", "findAt": 3}
+    assert records["failed"] == {"error": "ValueError"}
+    assert Trace.counters() == {"findAt": 3}
+
+# the spans of a thread see the counts of their thread only
+def test_threads(workdir):
+    def work(n):
+        with Trace.Span("work", n=n):
+            for i in range(n): Trace.count("values")
+
+    threads = [threading.Thread(target=work, args=(n,)) for n in (100, 200, 300)]
+    for thread in threads: thread.start()
+    for thread in threads: thread.join()
+
+    for name, args in events():
+        assert args["values"] == args["n"]
+    assert Trace.counters()["values"] == 600
+
+# the summary sums up the calls and counters of a stage, the Chrome trace
+# has one complete event per call and the thread names
+def test_summaryAndChrome(workdir):
+    stage = Stage()
+    assert stage.read(10) == 10
+    stage.read(5)
+
+    name, read = Trace.summary()[0]
+    assert name == "read"
+    assert read["calls"] == 2 and read["nodes"] == 15
+    assert read["max"] <= read["total"]
+
+    assert events() == [("read", {"profile": "CP1", "nodes": 10}),
+                        ("read", {"profile": "CP1", "nodes": 5})]
+    trace = json.load(open("trace.json"))
+    assert trace["otherData"]["counters"] == {"nodes": 15}
+    assert [event["name"] for event in trace["traceEvents"] if event["ph"] == "M"] == \
+        ["thread_name"]
+
+# nothing is recorded while the trace is switched off
+def test_disabled():
+    Trace.enable(False)
+    Stage().read(10)
+    Trace.record("job", 0., 1.)
+    assert Trace.summary() == [] and Trace.counters() == {}